@@ -0,0 +1,197 @@
+"""
+Пакетная раскраска множества маленьких графов за один вызов (требуется NumPy).
+
+Графы упакованы в плоские массивы: вершины графа g занимают позиции
+vertex_offsets[g]..vertex_offsets[g + 1] общего массива цветов, а его рёбра —
+строки edge_offsets[g]..edge_offsets[g + 1] общего массива edges (пары
+локальных номеров вершин). Объекты Graph и списки смежности не создаются.
+
+Жадная раскраска в естественном порядке выполняется шагами по локальному номеру
+вершины: на шаге s вершина s каждого графа получает наименьший цвет, не занятый
+её соседями с меньшими номерами. Все графы обрабатываются одновременно, поэтому
+число шагов равно размеру наибольшего графа, а не суммарному числу вершин.
+Результат совпадает с Graph.color() (жадный алгоритм, порядок "natural").
+"""
+import os
+from multiprocessing import Pool
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def pack_graphs(graphs: Iterable[Tuple[int, Sequence[Tuple[int, int]]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Упаковка графов в плоские массивы.
+
+    Args:
+        graphs (Iterable): Пары (количество вершин, рёбра) для каждого графа.
+
+    Returns:
+        tuple: vertex_offsets (int64, длина G + 1), edge_offsets (int64, длина G + 1) и edges (int32, форма (E, 2)).
+    """
+    vertex_counts = []
+    edge_counts = []
+    flat: List[int] = []
+    for vertices, edges in graphs:
+        vertex_counts.append(vertices)
+        before = len(flat)
+        for u, v in edges:
+            flat.append(u)
+            flat.append(v)
+        edge_counts.append((len(flat) - before) // 2)
+    vertex_offsets = np.zeros(len(vertex_counts) + 1, dtype=np.int64)
+    np.cumsum(vertex_counts, out=vertex_offsets[1:])
+    edge_offsets = np.zeros(len(edge_counts) + 1, dtype=np.int64)
+    np.cumsum(edge_counts, out=edge_offsets[1:])
+    return vertex_offsets, edge_offsets, np.array(flat, dtype=np.int32).reshape(-1, 2)
+
+
+def unpack_colors(colors: np.ndarray, vertex_offsets: np.ndarray) -> List[List[int]]:
+    """
+    Разбиение упакованных цветов на списки по графам.
+    """
+    values = colors.tolist()
+    bounds = vertex_offsets.tolist()
+    return [values[bounds[g]:bounds[g + 1]] for g in range(len(bounds) - 1)]
+
+
+def color_packed(
+    vertex_offsets: Sequence[int],
+    edge_offsets: Sequence[int],
+    edges,
+    workers: Optional[int] = 1,
+    chunks_per_worker: int = 4,
+) -> np.ndarray:
+    """
+    Жадная раскраска всех упакованных графов.
+
+    Направление рёбер не учитывается: концы ребра всегда получают разные цвета,
+    как в greedy_coloring_directed. Петли пропускаются.
+
+    Args:
+        vertex_offsets (Sequence[int]): Смещения вершин графов (длина G + 1, начинается с 0).
+        edge_offsets (Sequence[int]): Смещения рёбер графов в edges (длина G + 1, начинается с 0).
+        edges: Рёбра всех графов с локальными номерами вершин, форма (E, 2) или плоский массив длины 2E.
+        workers (int, optional): Количество процессов. По умолчанию 1 (без пула); None — по числу ядер.
+        chunks_per_worker (int, optional): На сколько частей делятся графы каждого процесса.
+
+    Returns:
+        np.ndarray: Цвета всех вершин (int32) в порядке vertex_offsets.
+
+    Raises:
+        ValueError: Если смещения несогласованы или номер вершины выходит за пределы своего графа.
+
+    Example:
+        >>> vertex_offsets, edge_offsets, edges = pack_graphs([(3, [(0, 1), (1, 2)]), (2, [(1, 0)])])
+        >>> color_packed(vertex_offsets, edge_offsets, edges).tolist()
+        [0, 1, 0, 0, 1]
+    """
+    vertex_offsets = np.asarray(vertex_offsets, dtype=np.int64)
+    edge_offsets = np.asarray(edge_offsets, dtype=np.int64)
+    edges = np.asarray(edges).reshape(-1, 2)
+    if len(edges) and not np.issubdtype(edges.dtype, np.integer):
+        raise ValueError("Ожидается целочисленный массив рёбер.")
+    graphs = len(vertex_offsets) - 1
+    if (
+        graphs < 0
+        or len(edge_offsets) != graphs + 1
+        or vertex_offsets[0] != 0
+        or edge_offsets[0] != 0
+        or edge_offsets[-1] != len(edges)
+        or (np.diff(vertex_offsets) < 0).any()
+        or (np.diff(edge_offsets) < 0).any()
+    ):
+        raise ValueError("Смещения должны начинаться с 0, не убывать и иметь длину G + 1.")
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or graphs < 2:
+        return _color_range(vertex_offsets, edge_offsets, edges)
+
+    # Части — подряд идущие графы примерно с равным числом рёбер и вершин
+    work = vertex_offsets + edge_offsets
+    parts = min(graphs, workers * chunks_per_worker)
+    bounds = np.unique(np.searchsorted(work, np.linspace(0, work[-1], parts + 1), side="left"))
+    bounds[0], bounds[-1] = 0, graphs
+    tasks = []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        v_first, e_first = vertex_offsets[first], edge_offsets[first]
+        tasks.append((
+            vertex_offsets[first:last + 1] - v_first,
+            edge_offsets[first:last + 1] - e_first,
+            edges[e_first:edge_offsets[last]],
+        ))
+    with Pool(workers) as pool:
+        return np.concatenate(pool.starmap(_color_range, tasks))
+
+
+def _color_range(vertex_offsets: np.ndarray, edge_offsets: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Раскраска подряд идущих графов (смещения начинаются с 0).
+
+    Для каждой вершины хранится бит её цвета (1 << цвет). На каждом шаге биты
+    соседей объединяются в 64-битную маску графа, и наименьший свободный цвет —
+    младший нулевой бит маски. Вершины, у которых заняты все цвета 0..63,
+    раскрашиваются отдельно по множеству цветов соседей; их бит равен 0.
+    """
+    counts = np.diff(vertex_offsets)
+    colors = np.zeros(int(vertex_offsets[-1]), dtype=np.int32)
+    if not len(edges):
+        return colors
+
+    owner = np.repeat(np.arange(len(counts)), np.diff(edge_offsets))
+    # Ребро учитывается на шаге его конца с большим локальным номером
+    steps = np.maximum(edges[:, 0], edges[:, 1])
+    lower = np.minimum(edges[:, 0], edges[:, 1])
+    if lower.min() < 0 or (steps >= counts[owner]).any():
+        raise ValueError("Индексы вершин должны быть в пределах [0, количество вершин графа - 1].")
+
+    # Графы нумеруются по убыванию размера: на шаге step активны графы 0..active[step]-1
+    by_size = np.argsort(-counts, kind="stable")
+    rank = np.empty_like(by_size)
+    rank[by_size] = np.arange(len(by_size))
+    largest = int(counts[by_size[0]])
+    active = len(counts) - np.searchsorted(counts[by_size][::-1], np.arange(largest), side="right")
+    starts = vertex_offsets[by_size]
+
+    # Номера шагов малы, поэтому устойчивая сортировка выполняется поразрядно
+    order = np.argsort(steps.astype(np.int16 if largest < 1 << 15 else np.int64), kind="stable")
+    earlier = (vertex_offsets[owner] + lower)[order]
+    owner = rank[owner][order]
+    step_bounds = np.searchsorted(steps[order], np.arange(largest + 1))
+
+    one = np.uint64(1)
+    # Ещё не раскрашенные вершины имеют нулевой бит, поэтому петли ничего не запрещают
+    bits = np.zeros(len(colors), dtype=np.uint64)
+    bits[starts[:active[0]]] = one
+    masks = np.zeros(len(counts), dtype=np.uint64)
+    for step in range(1, largest):
+        first, last = step_bounds[step], step_bounds[step + 1]
+        graphs = active[step]
+        masks[:graphs] = 0
+        np.bitwise_or.at(masks, owner[first:last], bits[earlier[first:last]])
+        taken = masks[:graphs]
+        vertices = starts[:graphs] + step
+        bits[vertices] = ~taken & (taken + one)
+        full = np.flatnonzero(taken == ~np.uint64(0))
+        if len(full):
+            _color_full(colors, bits, vertices[full], full, owner[first:last], earlier[first:last])
+
+    # Бит цвета — степень двойки, поэтому log2 точен
+    small = bits != 0
+    colors[small] = np.log2(bits[small].astype(np.float64))
+    return colors
+
+
+def _color_full(
+    colors: np.ndarray, bits: np.ndarray, vertices: np.ndarray, graphs: np.ndarray, owner: np.ndarray, earlier: np.ndarray
+) -> None:
+    """
+    Наименьший свободный цвет (не меньше 64) для вершин, у соседей которых есть все цвета 0..63.
+    """
+    for vertex, graph in zip(vertices.tolist(), graphs.tolist()):
+        neighbors = earlier[owner == graph]
+        used = set(colors[neighbors[bits[neighbors] == 0]].tolist())
+        color = 64
+        while color in used:
+            color += 1
+        colors[vertex] = color
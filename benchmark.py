@@ -0,0 +1,407 @@
+"""
+Бенчмарки алгоритмов раскраски графов.
+
+Графы строятся детерминированными генераторами (Эрдёш–Реньи, степенной закон,
+решётка, полный граф, DAG, а для точного метода — трудные графы Мыцельского
+и ферзей) с заданным числом рёбер. Отдельно измеряются загрузка
+рёбер и каждый метод раскраски: с прогревом, несколькими повторами и пиком памяти
+(tracemalloc, в отдельном прогоне, чтобы не искажать время). Результаты выводятся
+в JSON и могут сравниваться с сохранённым базовым прогоном.
+
+Пример:
+    python3 benchmark.py --sizes 1000 10000 100000 --output results.json
+    python3 benchmark.py --baseline results.json --threshold 0.2
+    python3 benchmark.py --generators mycielski queen --sizes 100 300 --methods dsatur exact
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from main import Graph
+
+# Ограничение по времени точного метода на один запуск, секунды
+EXACT_TIME_LIMIT = 10.0
+
+# Генератор: (число рёбер, seed) -> (число вершин, рёбра, ориентированность)
+GraphSpec = Tuple[int, List[Tuple[int, int]], bool]
+
+
+def erdos_renyi(edges: int, seed: int) -> GraphSpec:
+    """
+    Случайный граф G(n, m) со средней степенью 8.
+    """
+    rng = random.Random(seed)
+    vertices = max(edges // 4, 2)
+    pairs = []
+    while len(pairs) < edges:
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if u != v:
+            pairs.append((u, v))
+    return vertices, pairs, False
+
+
+def power_law(edges: int, seed: int) -> GraphSpec:
+    """
+    Граф Чанга–Лу со степенным распределением степеней (показатель 2.5).
+    """
+    rng = random.Random(seed)
+    vertices = max(edges // 4, 2)
+    weights = [(index + 1) ** (-1 / 1.5) for index in range(vertices)]
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    ends = rng.choices(range(vertices), cum_weights=cumulative, k=2 * edges)
+    pairs = [(ends[2 * i], ends[2 * i + 1]) for i in range(edges) if ends[2 * i] != ends[2 * i + 1]]
+    return vertices, pairs, False
+
+
+def grid(edges: int, seed: int) -> GraphSpec:
+    """
+    Квадратная решётка примерно с заданным числом рёбер.
+    """
+    side = max(int(math.sqrt(edges / 2)), 2)
+    pairs = []
+    for row in range(side):
+        for column in range(side):
+            u = row * side + column
+            if column + 1 < side:
+                pairs.append((u, u + 1))
+            if row + 1 < side:
+                pairs.append((u, u + side))
+    return side * side, pairs, False
+
+
+def complete(edges: int, seed: int) -> GraphSpec:
+    """
+    Полный граф примерно с заданным числом рёбер.
+    """
+    vertices = max(int((1 + math.sqrt(1 + 8 * edges)) / 2), 2)
+    pairs = [(u, v) for u in range(vertices) for v in range(u + 1, vertices)]
+    return vertices, pairs, False
+
+
+def dag(edges: int, seed: int) -> GraphSpec:
+    """
+    Случайный ориентированный ациклический граф: рёбра идут от меньшей вершины к большей.
+    """
+    rng = random.Random(seed)
+    vertices = max(edges // 4, 2)
+    pairs = []
+    while len(pairs) < edges:
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if u != v:
+            pairs.append((min(u, v), max(u, v)))
+    return vertices, pairs, True
+
+
+def mycielski(edges: int, seed: int) -> GraphSpec:
+    """
+    Граф Мыцельского M_k с наибольшим k, при котором рёбер не больше заданного.
+
+    M_k не содержит треугольников, но его хроматическое число равно k, поэтому
+    нижняя граница по клике (2) далека от ответа — трудный случай для точных методов.
+    """
+    vertices, pairs = 2, [(0, 1)]
+    while True:
+        # Вершины u_i = v_i + n и w = 2n: u_i смежна с соседями v_i, w смежна со всеми u_i
+        larger = pairs + [(u + vertices, v) for u, v in pairs] + [(u, v + vertices) for u, v in pairs]
+        larger += [(u + vertices, 2 * vertices) for u in range(vertices)]
+        if len(larger) > max(edges, 1):
+            return vertices, pairs, False
+        vertices, pairs = 2 * vertices + 1, larger
+
+
+def queen(edges: int, seed: int) -> GraphSpec:
+    """
+    Граф ферзей n x n с наибольшим n, при котором рёбер не больше заданного.
+
+    Клетки смежны, если ферзи на них бьют друг друга; хроматическое число равно n
+    для n, не кратных 2 и 3, и больше n для остальных.
+    """
+    side = 2
+    while len(_queen_pairs(side + 1)) <= edges:
+        side += 1
+    return side * side, _queen_pairs(side), False
+
+
+def _queen_pairs(side: int) -> List[Tuple[int, int]]:
+    cells = [(row, column) for row in range(side) for column in range(side)]
+    return [
+        (u, v)
+        for u, (r1, c1) in enumerate(cells)
+        for v, (r2, c2) in enumerate(cells)
+        if u < v and (r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2))
+    ]
+
+
+GENERATORS: Dict[str, Callable[[int, int], GraphSpec]] = {
+    "erdos_renyi": erdos_renyi,
+    "power_law": power_law,
+    "grid": grid,
+    "complete": complete,
+    "dag": dag,
+    "mycielski": mycielski,
+    "queen": queen,
+}
+# Генераторы по умолчанию; трудные графы для точного метода выбираются явно
+DEFAULT_GENERATORS = ["erdos_renyi", "power_law", "grid", "complete", "dag"]
+
+
+def _with_stats(graph: Graph) -> List[int]:
+    """
+    Жадная раскраска с включённой статистикой (накладные расходы ColoringStats).
+    """
+    from stats import ColoringStats
+
+    graph.stats = ColoringStats()
+    try:
+        return graph.color("greedy")
+    finally:
+        graph.stats = None
+
+
+def _with_cache(graph: Graph) -> List[int]:
+    """
+    Промах и попадание в кеш раскрасок: повторная раскраска неизменённого графа.
+    """
+    from cache import ColoringCache
+
+    graph.cache = ColoringCache()
+    try:
+        graph.color("dsatur")
+        return graph.color("dsatur")
+    finally:
+        graph.cache = None
+
+
+def _set_graph(graph: Graph) -> List[int]:
+    """
+    Копирование в SetGraph и жадная раскраска.
+    """
+    from set_graph import SetGraph
+
+    return SetGraph.from_graph(graph).color("greedy")
+
+
+def _stream(graph: Graph) -> List[int]:
+    """
+    Потоковая раскраска по рёбрам графа, прочитанным одним блоком.
+    """
+    import numpy as np
+    from streaming import stream_coloring
+
+    flat = np.column_stack(graph.edge_arrays()).ravel().tolist()
+    return stream_coloring(lambda: [flat], graph.vertices, seed=0)[0]
+
+
+def _packed(graph: Graph) -> List[int]:
+    """
+    Раскраска графа через упакованное представление batch.color_packed.
+    """
+    import numpy as np
+    from batch import color_packed
+
+    edges = np.column_stack(graph.edge_arrays())
+    return color_packed([0, graph.vertices], [0, len(edges)], edges).tolist()
+
+
+METHODS: Dict[str, Callable[[Graph], List[int]]] = {
+    "greedy": lambda graph: graph.color("greedy"),
+    "smallest_last": lambda graph: graph.color("greedy", order="smallest_last"),
+    "dsatur": lambda graph: graph.color("dsatur"),
+    "jones_plassmann": lambda graph: graph.color("jones_plassmann", seed=0),
+    "speculative": lambda graph: graph.color("speculative"),
+    "partitioned": lambda graph: graph.partitioned_coloring(parts=4)[0],
+    "components": lambda graph: graph.component_coloring(),
+    "exact": lambda graph: graph.exact_coloring(time_limit=EXACT_TIME_LIMIT)[0],
+    "reduce": lambda graph: graph.reduce_colors(graph.color("dsatur"), time_limit=None, max_iterations=1000, seed=0),
+    "frozen": lambda graph: graph.freeze().color("greedy"),
+    "set_graph": _set_graph,
+    "stats": _with_stats,
+    "cached": _with_cache,
+    "stream": _stream,
+    "packed": _packed,
+}
+
+
+def load_graph(vertices: int, pairs: List[Tuple[int, int]], directed: bool) -> Graph:
+    """
+    Построение графа из списка рёбер через пакетную загрузку.
+    """
+    graph = Graph(vertices)
+    graph.add_edges(pairs, directed=directed)
+    return graph
+
+
+def measure(action: Callable[[], object], warmup: int, repeats: int) -> Tuple[List[float], int, object]:
+    """
+    Замер времени и пика памяти действия.
+
+    Args:
+        action (callable): Измеряемое действие.
+        warmup (int): Число прогревочных запусков без замера.
+        repeats (int): Число замеряемых запусков.
+
+    Returns:
+        tuple: Времена запусков в секундах, пик памяти в байтах и результат последнего запуска.
+    """
+    for _ in range(warmup):
+        action()
+    times = []
+    result = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = action()
+        times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        action()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return times, peak, result
+
+
+def run_benchmarks(
+    generators: List[str],
+    sizes: List[int],
+    methods: List[str],
+    warmup: int = 1,
+    repeats: int = 3,
+    seed: int = 0,
+) -> dict:
+    """
+    Прогон всех комбинаций генераторов, размеров и методов.
+
+    Returns:
+        dict: Отчёт с метаданными и списком результатов.
+    """
+    results = []
+    for name in generators:
+        for size in sizes:
+            vertices, pairs, directed = GENERATORS[name](size, seed)
+            times, peak, graph = measure(lambda: load_graph(vertices, pairs, directed), warmup, repeats)
+            record = {"generator": name, "edges": len(pairs), "vertices": vertices, "directed": directed}
+            results.append(dict(record, stage="load", **_summary(times, peak)))
+            for method in methods:
+                times, peak, coloring = measure(lambda: METHODS[method](graph), warmup, repeats)
+                report = graph.validate_coloring(coloring)
+                if not report["proper"]:
+                    raise RuntimeError(
+                        f"Метод {method} вернул некорректную раскраску для {name}/{size}: "
+                        f"{len(report['conflicts'])} конфликтов, {report['uncolored']} нераскрашенных вершин."
+                    )
+                results.append(
+                    dict(
+                        record,
+                        stage=method,
+                        colors=report["colors"],
+                        class_sizes=report["histogram"],
+                        **_summary(times, peak),
+                    )
+                )
+                print(f"{name:12} {len(pairs):>9} {method:16} {results[-1]['median']:.4f} s", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "warmup": warmup,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def _summary(times: List[float], peak: int) -> dict:
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "peak_bytes": peak,
+    }
+
+
+def compare_with_baseline(report: dict, baseline: dict, threshold: float = 0.2) -> List[str]:
+    """
+    Поиск регрессий относительно базового отчёта.
+
+    Замер считается регрессией, если медиана времени или пик памяти выросли
+    больше чем в 1 + threshold раз.
+
+    Args:
+        report (dict): Текущий отчёт run_benchmarks.
+        baseline (dict): Сохранённый отчёт.
+        threshold (float, optional): Допустимый относительный рост. По умолчанию 0.2.
+
+    Returns:
+        list: Описания найденных регрессий.
+    """
+    previous = {(item["generator"], item["edges"], item["stage"]): item for item in baseline["results"]}
+    regressions = []
+    for item in report["results"]:
+        old = previous.get((item["generator"], item["edges"], item["stage"]))
+        if old is None:
+            continue
+        for metric in ("median", "peak_bytes"):
+            if old[metric] and item[metric] > old[metric] * (1 + threshold):
+                regressions.append(
+                    f"{item['generator']}/{item['edges']}/{item['stage']}: {metric} "
+                    f"{old[metric]:.6g} -> {item[metric]:.6g} (+{item[metric] / old[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмов раскраски графов.")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=DEFAULT_GENERATORS)
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1000, 10000, 100000], help="число рёбер (от 10^3 до 10^7)"
+    )
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=["greedy", "smallest_last", "dsatur"])
+    parser.add_argument("--warmup", type=int, default=1, help="число прогревочных запусков")
+    parser.add_argument("--repeats", type=int, default=3, help="число замеряемых запусков")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генераторов графов")
+    parser.add_argument("--output", help="файл для отчёта JSON (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="отчёт JSON для поиска регрессий")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост относительно базового отчёта")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_benchmarks(args.generators, args.sizes, args.methods, args.warmup, args.repeats, args.seed)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare_with_baseline(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"Регрессия: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Кеш результатов раскраски по отпечатку графа: в памяти с вытеснением давно
+не использованных записей и, по желанию, в каталоге на диске.
+"""
+import hashlib
+import os
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+
+class ColoringCache:
+    """
+    Кеш результатов раскраски по отпечатку графа.
+
+    Включается присваиванием graph.cache = ColoringCache(); один объект можно
+    разделять между графами, и граф с той же структурой, построенный заново или
+    с другим порядком рёбер, получит сохранённую раскраску. Ключ — отпечаток графа
+    (Graph.fingerprint), метод и параметры раскраски, поэтому после изменения рёбер
+    граф просто перестаёт совпадать со старыми записями.
+
+    В памяти хранится не больше max_entries раскрасок (вытесняется давно не
+    использованная). Если задан directory, раскраски также записываются в файлы
+    (int32 little-endian, как формат binary пакетного режима) и переживают перезапуск.
+    """
+
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None) -> None:
+        """
+        Инициализация кеша.
+
+        Args:
+            max_entries (int, optional): Наибольшее число раскрасок в памяти. По умолчанию 128.
+            directory (str, optional): Каталог дискового уровня кеша. По умолчанию кеш только в памяти.
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+
+    @staticmethod
+    def key(fingerprint: str, method: str, options: tuple) -> str:
+        """
+        Ключ записи для отпечатка графа, метода и параметров раскраски.
+        """
+        return hashlib.blake2b(repr((fingerprint, method, options)).encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Sequence[int]]:
+        """
+        Поиск раскраски в памяти, затем на диске.
+
+        Returns:
+            Sequence[int] или None: Сохранённая раскраска или None при промахе.
+        """
+        coloring = self._entries.get(key)
+        if coloring is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as file:
+                    coloring = array("i", file.read())
+            except FileNotFoundError:
+                pass
+            else:
+                if sys.byteorder != "little":
+                    coloring.byteswap()
+                self._remember(key, coloring)
+
+        if coloring is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return coloring
+
+    def put(self, key: str, coloring: Sequence[int]) -> None:
+        """
+        Сохранение раскраски в памяти и, если задан каталог, на диске.
+        """
+        values = array("i", coloring)
+        self._remember(key, values)
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            data = array("i", values)
+            if sys.byteorder != "little":
+                data.byteswap()
+            # Запись во временный файл и переименование, чтобы параллельные процессы не прочитали половину файла
+            temporary = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(data.tobytes())
+            os.replace(temporary, self._path(key))
+
+    def clear(self) -> None:
+        """
+        Очистка уровня в памяти; файлы на диске не удаляются.
+        """
+        self._entries.clear()
+
+    def _remember(self, key: str, coloring: array) -> None:
+        self._entries[key] = coloring
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
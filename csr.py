@@ -0,0 +1,195 @@
+"""
+Неизменяемый граф в формате CSR (Compressed Sparse Row) и загрузка двоичного файла графа.
+
+Граф получается из Graph.freeze() или отображается в память из файла Graph.save
+через CSRGraph.load. Списки соседей хранятся в двух массивах (смещения int64 и
+соседи int32), поэтому граф занимает в несколько раз меньше памяти, чем списки
+смежности, а все методы раскраски Graph работают с ним без изменений.
+"""
+import mmap
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Iterator, Optional, Sequence
+
+from main import _FLAG_DIRECTED, _FLAG_IN_EDGES, _GRAPH_FILE_HEADER, GRAPH_FILE_MAGIC, GRAPH_FILE_VERSION, Graph
+
+
+class _CSRRows(Mapping):
+    """
+    Представление строк CSR в виде словаря «вершина -> соседи».
+
+    Позволяет методам Graph работать с CSRGraph без изменений.
+    """
+
+    def __init__(self, vertices: int, offsets: Optional[Sequence[int]], targets: Optional[Sequence[int]]) -> None:
+        self._vertices = vertices
+        self._offsets = offsets
+        self._targets = memoryview(targets) if targets is not None else None
+
+    def __getitem__(self, u: int) -> Sequence[int]:
+        if not 0 <= u < self._vertices:
+            raise KeyError(u)
+        if self._offsets is None:
+            return ()
+        return self._targets[self._offsets[u]:self._offsets[u + 1]]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._vertices))
+
+    def __len__(self) -> int:
+        return self._vertices
+
+    def __repr__(self) -> str:
+        return repr({u: list(self[u]) for u in self})
+
+
+class CSRGraph(Graph):
+    """
+    Неизменяемый граф в формате CSR (Compressed Sparse Row).
+
+    Соседи вершины u хранятся в targets[offsets[u]:offsets[u + 1]].
+    Для ориентированного графа дополнительно хранится обратное представление
+    (входящие рёбра), как in_smezh_list у Graph.
+    """
+
+    def __init__(
+        self,
+        vertices: int,
+        directed: bool,
+        edges: int,
+        out_offsets: Sequence[int],
+        out_targets: Sequence[int],
+        in_offsets: Optional[Sequence[int]] = None,
+        in_targets: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Инициализация графа из готовых массивов CSR.
+
+        Args:
+            vertices (int): Количество вершин в графе.
+            directed (bool): Является ли граф ориентированным.
+            edges (int): Количество рёбер.
+            out_offsets (Sequence[int]): Смещения исходящих списков (длина vertices + 1).
+            out_targets (Sequence[int]): Соседи по исходящим рёбрам (int32).
+            in_offsets (Sequence[int], optional): Смещения входящих списков.
+            in_targets (Sequence[int], optional): Источники входящих рёбер (int32).
+        """
+        self.vertices = vertices
+        self.directed = directed
+        self.edges = edges
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.in_offsets = in_offsets
+        self.in_targets = in_targets
+        self.smezh_list = _CSRRows(vertices, out_offsets, out_targets)
+        self.in_smezh_list = _CSRRows(vertices, in_offsets, in_targets)
+        self.stats = None
+        self.cache = None
+        self._fingerprint: Optional[str] = None
+        self._edge_arrays: Optional[tuple] = None
+
+    def add_edge(self, u: int, v: int, directed: bool = False) -> None:
+        raise TypeError("Замороженный граф нельзя изменять.")
+
+    def remove_edge(self, u: int, v: int, directed: bool = False) -> None:
+        raise TypeError("Замороженный граф нельзя изменять.")
+
+    def freeze(self) -> "CSRGraph":
+        return self
+
+    @classmethod
+    def load(cls, path: str) -> "CSRGraph":
+        """
+        Загрузка графа, сохранённого Graph.save, без копирования данных.
+
+        Файл отображается в память через mmap, и массивы CSR ссылаются прямо на
+        отображённые страницы. Процессы, загрузившие один и тот же файл, разделяют
+        одну копию в страничном кеше.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            CSRGraph: Граф только для чтения.
+
+        Raises:
+            ValueError: Если файл не является графом в поддерживаемом формате.
+        """
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < _GRAPH_FILE_HEADER.size:
+            raise ValueError(f"Файл {path} не является графом в двоичном формате.")
+        magic, version, flags, vertices, edges, out_length, in_length = _GRAPH_FILE_HEADER.unpack_from(mapping)
+        if magic != GRAPH_FILE_MAGIC or version != GRAPH_FILE_VERSION:
+            raise ValueError(f"Файл {path} не является графом в двоичном формате версии {GRAPH_FILE_VERSION}.")
+
+        layout = [("q", vertices + 1), ("i", out_length)]
+        if flags & _FLAG_IN_EDGES:
+            layout += [("q", vertices + 1), ("i", in_length)]
+        expected = _GRAPH_FILE_HEADER.size + sum(-(-length * array(code).itemsize // 8) * 8 for code, length in layout)
+        if len(mapping) < expected:
+            raise ValueError(f"Файл {path} повреждён: ожидалось не меньше {expected} байт.")
+
+        view = memoryview(mapping)
+        arrays = []
+        position = _GRAPH_FILE_HEADER.size
+        for code, length in layout:
+            size = length * array(code).itemsize
+            values = view[position:position + size].cast(code)
+            if sys.byteorder != "little":
+                # На big-endian платформе без копирования не обойтись
+                values = array(code, values)
+                values.byteswap()
+            arrays.append(values)
+            position += -(-size // 8) * 8
+
+        graph = cls(vertices, bool(flags & _FLAG_DIRECTED), edges, *arrays)
+        # Отображение должно жить, пока на него ссылаются массивы
+        graph._mapping = mapping
+        return graph
+
+    def memory_usage(self) -> int:
+        """
+        Объём памяти, занимаемой массивами CSR.
+
+        Returns:
+            int: Размер буферов смещений и соседей в байтах.
+        """
+        buffers = (self.out_offsets, self.out_targets, self.in_offsets, self.in_targets)
+        return sum(memoryview(buffer).nbytes for buffer in buffers if buffer is not None)
+
+    def edge_arrays(self) -> tuple:
+        """
+        Все записи исходящих списков в виде двух массивов NumPy; targets не копируется.
+
+        Returns:
+            tuple: Массивы sources и targets (int32) одинаковой длины.
+        """
+        if self._edge_arrays is None:
+            import numpy as np
+
+            offsets = np.frombuffer(self.out_offsets, dtype=np.int64)
+            targets = np.frombuffer(self.out_targets, dtype=np.int32)
+            sources = np.repeat(np.arange(self.vertices, dtype=np.int32), np.diff(offsets))
+            self._edge_arrays = (sources, targets)
+        return self._edge_arrays
+
+
+def _to_csr(vertices: int, adjacency: Mapping) -> tuple:
+    """
+    Упаковка списков смежности в пару массивов CSR.
+
+    Args:
+        vertices (int): Количество вершин.
+        adjacency (Mapping): Списки соседей для каждой вершины.
+
+    Returns:
+        tuple: Массив смещений (int64) и массив соседей (int32).
+    """
+    offsets = array("q", [0])
+    targets = array("i")
+    for u in range(vertices):
+        targets.extend(adjacency[u])
+        offsets.append(len(targets))
+    return offsets, targets
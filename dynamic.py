@@ -0,0 +1,107 @@
+"""
+Динамическая раскраска графа, который меняется по одному ребру.
+
+Раскраска поддерживается корректной при добавлении и удалении рёбер: после
+изменения перекрашиваются только концы ребра, а compact() уменьшает число
+цветов, накопившихся за изменения.
+"""
+from itertools import chain
+from typing import List, Optional
+
+from main import Graph
+
+
+class DynamicColoring:
+    """
+    Раскраска, которая поддерживается корректной при добавлении и удалении рёбер.
+
+    После каждого изменения перекрашиваются только концы изменённого ребра,
+    поэтому стоимость обновления пропорциональна их степени, а не размеру графа.
+    Рёбра нужно изменять через этот объект, а не напрямую через граф.
+    """
+
+    def __init__(self, graph: Graph, coloring: Optional[List[int]] = None, compact_every: Optional[int] = None) -> None:
+        """
+        Инициализация динамической раскраски.
+
+        Args:
+            graph (Graph): Изменяемый граф.
+            coloring (list, optional): Начальная корректная раскраска. По умолчанию graph.color().
+            compact_every (int, optional): Через сколько изменений вызывать compact(). По умолчанию никогда.
+        """
+        self.graph = graph
+        self.coloring = list(coloring) if coloring is not None else graph.color()
+        self.compact_every = compact_every
+        self._updates = 0
+
+    def add_edge(self, u: int, v: int, directed: bool = False) -> None:
+        """
+        Добавление ребра с исправлением раскраски.
+
+        Если концы ребра окрашены одинаково, перекрашивается конец с меньшей степенью.
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+            directed (bool, optional): Если True, добавляется ориентированное ребро. По умолчанию False.
+        """
+        self.graph.add_edge(u, v, directed)
+        if u != v and self.coloring[u] == self.coloring[v]:
+            self._recolor(u if self._degree(u) < self._degree(v) else v)
+        self._after_update()
+
+    def remove_edge(self, u: int, v: int, directed: bool = False) -> None:
+        """
+        Удаление ребра; освободившиеся концы получают наименьший свободный цвет.
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+            directed (bool, optional): Если True, удаляется ориентированное ребро u -> v. По умолчанию False.
+        """
+        self.graph.remove_edge(u, v, directed)
+        self._recolor(u)
+        self._recolor(v)
+        self._after_update()
+
+    def compact(self) -> int:
+        """
+        Уменьшение числа цветов: вершины старших цветов переходят на наименьший свободный цвет.
+
+        Цвет вершины никогда не растёт, поэтому раскраска остаётся корректной. Время O(V + E).
+
+        Returns:
+            int: Количество цветов после уплотнения.
+        """
+        buckets = [[] for _ in range(self.num_colors())]
+        for u, color in enumerate(self.coloring):
+            buckets[color].append(u)
+        for bucket in reversed(buckets):
+            for u in bucket:
+                self._recolor(u)
+        return self.num_colors()
+
+    def num_colors(self) -> int:
+        """
+        Количество использованных цветов.
+        """
+        return max(self.coloring, default=-1) + 1
+
+    def _degree(self, u: int) -> int:
+        return len(self.graph.smezh_list[u]) + len(self.graph.in_smezh_list[u])
+
+    def _recolor(self, u: int) -> None:
+        """
+        Перекраска вершины в наименьший цвет, не занятый соседями, за O(deg(u)).
+        """
+        neighbors = chain(self.graph.smezh_list[u], self.graph.in_smezh_list[u])
+        used = {self.coloring[neighbor] for neighbor in neighbors if neighbor != u}
+        color = 0
+        while color in used:
+            color += 1
+        self.coloring[u] = color
+
+    def _after_update(self) -> None:
+        self._updates += 1
+        if self.compact_every and self._updates % self.compact_every == 0:
+            self.compact()
@@ -0,0 +1,166 @@
+"""
+Точная раскраска графа методом ветвей и границ на основе DSatur.
+
+Списки смежности и множества цветов соседей хранятся как битовые маски в int.
+На каждом шаге ветвится вершина с наибольшей насыщенностью, а ей по очереди
+пробуются все допустимые цвета. Верхняя граница — лучшая найденная раскраска
+(начальная даёт эвристический DSatur), нижняя — жадно найденная клика.
+
+Вершины клики заранее получают цвета 0..q-1. Новый цвет всегда берётся
+наименьшим неиспользованным, поэтому раскраски, отличающиеся только
+перестановкой цветов, не перебираются повторно.
+"""
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+# Как часто (в узлах дерева поиска) проверяется ограничение по времени
+TIME_CHECK_INTERVAL = 1024
+
+
+class _Timeout(Exception):
+    pass
+
+
+def greedy_clique(adjacency: Sequence[int], order: Sequence[int]) -> List[int]:
+    """
+    Жадный поиск клики: из каждой стартовой вершины клика расширяется вершиной
+    наибольшей степени среди общих соседей.
+
+    Args:
+        adjacency (Sequence[int]): Битовые маски соседей каждой вершины.
+        order (Sequence[int]): Стартовые вершины (например, по убыванию степени).
+
+    Returns:
+        list: Вершины наибольшей найденной клики.
+    """
+    degrees = [bin(mask).count("1") for mask in adjacency]
+    best: List[int] = []
+    for start in order:
+        if degrees[start] < len(best):
+            continue
+        clique = [start]
+        candidates = adjacency[start]
+        while candidates:
+            vertex = max(_bits(candidates), key=degrees.__getitem__)
+            clique.append(vertex)
+            candidates &= adjacency[vertex]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def exact_coloring(
+    adjacency: Sequence[int], initial: Sequence[int], time_limit: Optional[float] = None
+) -> Tuple[List[int], int]:
+    """
+    Раскраска минимальным числом цветов.
+
+    Args:
+        adjacency (Sequence[int]): Битовые маски соседей каждой вершины (симметричные, без петель).
+        initial (Sequence[int]): Корректная раскраска — начальная верхняя граница.
+        time_limit (float, optional): Ограничение по времени в секундах. По умолчанию без ограничения.
+
+    Returns:
+        tuple: Лучшая найденная раскраска и нижняя граница хроматического числа.
+            Если число цветов раскраски равно нижней границе, раскраска оптимальна.
+    """
+    vertices = len(adjacency)
+    degrees = [bin(mask).count("1") for mask in adjacency]
+    by_degree = sorted(range(vertices), key=lambda u: -degrees[u])
+    clique = greedy_clique(adjacency, by_degree[:64])
+
+    best = list(initial)
+    best_colors = max(best, default=-1) + 1
+    lower = len(clique) if vertices else 0
+    if best_colors <= lower:
+        return best, lower
+
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    coloring = [-1] * vertices
+    # forbidden[v] — битовая маска цветов соседей вершины v
+    forbidden = [0] * vertices
+    uncolored = (1 << vertices) - 1
+    nodes = 0
+
+    def assign(u: int, color: int) -> List[Tuple[int, int]]:
+        nonlocal uncolored
+        coloring[u] = color
+        uncolored &= ~(1 << u)
+        changed = []
+        bit = 1 << color
+        for neighbor in _bits(adjacency[u] & uncolored):
+            if not forbidden[neighbor] & bit:
+                changed.append((neighbor, forbidden[neighbor]))
+                forbidden[neighbor] |= bit
+        return changed
+
+    def unassign(u: int, changed: List[Tuple[int, int]]) -> None:
+        nonlocal uncolored
+        coloring[u] = -1
+        uncolored |= 1 << u
+        for neighbor, mask in changed:
+            forbidden[neighbor] = mask
+
+    def search(used: int) -> bool:
+        """
+        Перебор раскрасок оставшихся вершин; True — найдена раскраска из lower цветов.
+        """
+        nonlocal best, best_colors, nodes
+        nodes += 1
+        if deadline is not None and nodes % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            raise _Timeout
+        if used >= best_colors:
+            # Граница улучшилась после выбора цветов выше по дереву
+            return False
+        if not uncolored:
+            best, best_colors = list(coloring), used
+            return best_colors <= lower
+
+        # Вершина с наибольшей насыщенностью, при равенстве — с наибольшей степенью
+        vertex, key = -1, (-1, -1)
+        for u in _bits(uncolored):
+            candidate = (bin(forbidden[u]).count("1"), degrees[u])
+            if candidate > key:
+                vertex, key = u, candidate
+        if key[0] >= best_colors - 1:
+            # Все цвета, меньшие best_colors - 1, заняты: лучшей раскраски в этой ветви нет
+            return False
+
+        mask = forbidden[vertex]
+        # Цвета 0..used-1 уже используются, used — наименьший новый; раскраска должна остаться лучше best
+        for color in range(used + 1):
+            if color >= best_colors - 1:
+                break
+            if mask >> color & 1:
+                continue
+            changed = assign(vertex, color)
+            found = search(max(used, color + 1))
+            unassign(vertex, changed)
+            if found:
+                return True
+        return False
+
+    for color, u in enumerate(clique):
+        assign(u, color)
+    # Глубина рекурсии не превышает числа вершин
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, vertices + 100))
+    try:
+        search(len(clique))
+    except _Timeout:
+        return best, lower
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    # Перебор завершён: лучшая раскраска оптимальна
+    return best, best_colors
+
+
+def _bits(mask: int):
+    """
+    Номера установленных битов маски.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,155 @@
+"""
+Генератор нагрузки для сервиса раскраски (service.py).
+
+Клиенты держат по одному keep-alive соединению и отправляют POST /color, пока не
+будет отправлено заданное число запросов. Доля --duplicates запросов повторяет
+один из немногих «горячих» графов, чтобы проверить объединение одинаковых
+запросов. В конце выводится JSON: пропускная способность, коды ответов,
+процентили задержки на стороне клиента и статистика сервиса (GET /stats).
+
+С флагом --spawn сервис запускается в отдельном процессе на свободном порту
+и останавливается после прогона, поэтому внешний сервис не нужен.
+
+Пример:
+    python3 load_generator.py --spawn --requests 2000 --concurrency 32 --duplicates 0.5
+    python3 load_generator.py --port 8765 --vertices 500 --edges 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List, Optional
+
+from service import open_connection, percentiles, send_request
+
+# Сколько разных графов повторяются в доле --duplicates
+HOT_GRAPHS = 4
+# Сколько ждать запуска сервиса с --spawn, секунды
+SPAWN_TIMEOUT = 30.0
+
+
+def make_bodies(requests: int, vertices: int, edges: int, duplicates: float, seed: int) -> List[bytes]:
+    """
+    Тела запросов: случайные графы G(n, m), доля duplicates из них — повторы горячих графов.
+    """
+    rng = random.Random(seed)
+
+    def body() -> bytes:
+        pairs = [[rng.randrange(vertices), rng.randrange(vertices)] for _ in range(edges)]
+        return json.dumps({"vertices": vertices, "edges": pairs}).encode()
+
+    hot = [body() for _ in range(HOT_GRAPHS)]
+    return [rng.choice(hot) if rng.random() < duplicates else body() for _ in range(requests)]
+
+
+async def run_load(
+    bodies: List[bytes], concurrency: int, host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None
+) -> dict:
+    """
+    Отправка всех запросов concurrency клиентами.
+
+    Returns:
+        dict: Число запросов, время, запросов в секунду, коды ответов и процентили задержки.
+    """
+    pending = iter(bodies)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def client() -> None:
+        reader, writer = await open_connection(host, port, unix)
+        try:
+            for body in pending:
+                start = time.perf_counter()
+                status, _ = await send_request(reader, writer, "POST", "/color", body)
+                latencies.append(time.perf_counter() - start)
+                statuses[status] += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await open_connection(host, port, unix)
+    try:
+        _, stats = await send_request(reader, writer, "GET", "/stats")
+    finally:
+        writer.close()
+    return {
+        "requests": len(bodies),
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(len(bodies) / seconds, 1),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "latency_ms": percentiles(latencies),
+        "service": json.loads(stats),
+    }
+
+
+def spawn_service(workers: Optional[int], queue_size: Optional[int]) -> tuple:
+    """
+    Запуск service.py в отдельном процессе на свободном порту.
+
+    Returns:
+        tuple: Процесс и порт.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py"), "--port", str(port)]
+    if workers:
+        command += ["--workers", str(workers)]
+    if queue_size:
+        command += ["--queue-size", str(queue_size)]
+    process = subprocess.Popen(command)
+
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Не удалось запустить сервис раскраски.") from None
+            time.sleep(0.05)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для сервиса раскраски.")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес сервиса (по умолчанию 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="порт сервиса (по умолчанию 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="Unix-сокет сервиса вместо TCP")
+    parser.add_argument("--spawn", action="store_true", help="запустить сервис в отдельном процессе на время прогона")
+    parser.add_argument("--workers", type=int, help="процессы пула сервиса (с --spawn)")
+    parser.add_argument("--queue-size", type=int, help="длина очереди сервиса (с --spawn)")
+    parser.add_argument("--requests", type=int, default=1000, help="число запросов (по умолчанию 1000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="число одновременных клиентов (по умолчанию 16)")
+    parser.add_argument("--vertices", type=int, default=100, help="вершин в графе (по умолчанию 100)")
+    parser.add_argument("--edges", type=int, default=400, help="рёбер в графе (по умолчанию 400)")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="доля повторяющихся запросов (по умолчанию 0)")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора (по умолчанию 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    bodies = make_bodies(args.requests, args.vertices, args.edges, args.duplicates, args.seed)
+    process, port = spawn_service(args.workers, args.queue_size) if args.spawn else (None, args.port)
+    try:
+        report = asyncio.run(run_load(bodies, args.concurrency, args.host, port, None if args.spawn else args.unix))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
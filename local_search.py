@@ -0,0 +1,288 @@
+"""
+Уменьшение числа цветов готовой раскраски локальным поиском.
+
+Итеративный жадный алгоритм (Калберсон) переставляет цветовые классы и заново
+раскрашивает вершины первым подходящим цветом класс за классом; число цветов при
+этом никогда не растёт. Когда он перестаёт помогать, Tabucol (Герц–де Верра,
+Галинье–Хао) ищет раскраску в k - 1 цвет, перекрашивая конфликтующие вершины
+с запретом на возврат недавних ходов. Для каждой вершины хранится число соседей
+каждого цвета, поэтому ход пересчитывается за O(deg).
+
+Поиск ограничен временем и/или числом итераций и всегда возвращает лучшую
+корректную раскраску, найденную к моменту остановки.
+"""
+import random
+import time
+from array import array
+from typing import List, Optional, Sequence
+
+# Сколько проходов итеративного жадного алгоритма без улучшения допускается перед запуском Tabucol
+GREEDY_PATIENCE = 5
+# Наибольшее число ходов одного запуска Tabucol; затем поиск возвращается к итеративному жадному
+TABU_MOVES = 20000
+# Наибольший размер таблиц Tabucol (вершины * цвета): 12 байт на ячейку, около 50 МБ;
+# для больших графов Tabucol пропускается и остаётся итеративный жадный алгоритм
+TABU_MAX_CELLS = 1 << 22
+
+
+class Budget:
+    """
+    Ограничение по времени и числу итераций.
+    """
+
+    def __init__(self, time_limit: Optional[float], max_iterations: Optional[int]) -> None:
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.remaining = max_iterations
+
+    def spend(self) -> bool:
+        """
+        Списание одной итерации.
+
+        Returns:
+            bool: True, если бюджет ещё не исчерпан.
+        """
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+        return self.deadline is None or time.perf_counter() < self.deadline
+
+
+def compact_colors(coloring: Sequence[int]) -> List[int]:
+    """
+    Перенумерация цветов в 0..k-1 без пропусков.
+    """
+    mapping = {}
+    return [mapping.setdefault(color, len(mapping)) for color in coloring]
+
+
+def greedy_by_classes(neighbors: Sequence[Sequence[int]], coloring: Sequence[int], rng: random.Random) -> List[int]:
+    """
+    Один проход итеративного жадного алгоритма.
+
+    Вершины раскрашиваются первым подходящим цветом, цветовой класс за классом.
+    Вершины одного класса не смежны, поэтому каждый класс целиком получает цвета
+    не больше прежнего номера класса в новом порядке, и число цветов не растёт.
+    Порядок классов выбирается случайно: обратный, по убыванию размера,
+    по возрастанию размера или случайный.
+
+    Args:
+        neighbors (Sequence[Sequence[int]]): Списки соседей без петель.
+        coloring (Sequence[int]): Корректная раскраска с цветами 0..k-1.
+        rng (random.Random): Генератор для выбора порядка.
+
+    Returns:
+        list: Новая корректная раскраска с не большим числом цветов.
+    """
+    classes: List[List[int]] = [[] for _ in range(max(coloring, default=-1) + 1)]
+    for u, color in enumerate(coloring):
+        classes[color].append(u)
+
+    strategy = rng.randrange(4)
+    if strategy == 0:
+        classes.reverse()
+    elif strategy == 1:
+        classes.sort(key=len, reverse=True)
+    elif strategy == 2:
+        classes.sort(key=len)
+    else:
+        rng.shuffle(classes)
+
+    result = [-1] * len(coloring)
+    # stamp[color] == u означает, что цвет color занят соседом вершины u
+    stamp = [-1] * (len(classes) + 1)
+    for members in classes:
+        for u in members:
+            for neighbor in neighbors[u]:
+                color = result[neighbor]
+                if color != -1:
+                    stamp[color] = u
+            color = 0
+            while stamp[color] == u:
+                color += 1
+            result[u] = color
+    return result
+
+
+def tabucol(
+    neighbors: Sequence[Sequence[int]],
+    colors: int,
+    coloring: List[int],
+    rng: random.Random,
+    budget: Budget,
+    max_moves: int = TABU_MOVES,
+) -> Optional[List[int]]:
+    """
+    Поиск раскраски в colors цветов без конфликтов.
+
+    На каждом ходу одна конфликтующая вершина получает цвет, сильнее всего
+    уменьшающий число конфликтов; возврат вершины к прежнему цвету запрещён
+    на 0.6 * (число конфликтующих вершин) + random(0..9) ходов, если только он
+    не даёт лучший результат за весь поиск.
+
+    Таблица gamma[v * colors + c] хранит число соседей v цвета c, поэтому
+    изменение числа конфликтов при перекраске известно сразу, а после хода
+    обновляются только записи соседей перекрашенной вершины. Если таблицы
+    больше TABU_MAX_CELLS ячеек, поиск не запускается.
+
+    Args:
+        neighbors (Sequence[Sequence[int]]): Списки соседей без петель и повторов.
+        colors (int): Целевое число цветов.
+        coloring (list): Начальная раскраска с цветами 0..colors-1 (может содержать конфликты).
+        rng (random.Random): Генератор для выбора среди равноценных ходов и длины запрета.
+        budget (Budget): Общий бюджет; каждый ход тратит одну итерацию.
+        max_moves (int, optional): Наибольшее число ходов этого запуска.
+
+    Returns:
+        list или None: Раскраска без конфликтов или None, если она не найдена.
+    """
+    vertices = len(coloring)
+    if vertices * colors > TABU_MAX_CELLS:
+        return None
+    coloring = list(coloring)
+    gamma = array("i", bytes(4 * vertices * colors))
+    for u in range(vertices):
+        base = u * colors
+        for neighbor in neighbors[u]:
+            gamma[base + coloring[neighbor]] += 1
+
+    conflicting = {u for u in range(vertices) if gamma[u * colors + coloring[u]]}
+    conflicts = sum(gamma[u * colors + coloring[u]] for u in conflicting) // 2
+    best_conflicts = conflicts
+    # tabu[v * colors + c] — номер хода, до которого вершине v запрещено возвращаться к цвету c
+    tabu = array("q", bytes(8 * vertices * colors))
+
+    for move in range(max_moves):
+        if not conflicts:
+            return coloring
+        if not budget.spend():
+            return None
+
+        best_delta = None
+        candidates = []
+        for u in conflicting:
+            base = u * colors
+            current = gamma[base + coloring[u]]
+            for color in range(colors):
+                if color == coloring[u]:
+                    continue
+                delta = gamma[base + color] - current
+                if tabu[base + color] > move and conflicts + delta >= best_conflicts:
+                    continue
+                if best_delta is None or delta < best_delta:
+                    best_delta = delta
+                    candidates = [(u, color)]
+                elif delta == best_delta:
+                    candidates.append((u, color))
+        if not candidates:
+            # Все ходы запрещены: перекрашивается случайная конфликтующая вершина
+            u = rng.choice(tuple(conflicting))
+            color = rng.choice([color for color in range(colors) if color != coloring[u]])
+            best_delta = gamma[u * colors + color] - gamma[u * colors + coloring[u]]
+        else:
+            u, color = rng.choice(candidates)
+
+        old = coloring[u]
+        coloring[u] = color
+        conflicts += best_delta
+        best_conflicts = min(best_conflicts, conflicts)
+        tabu[u * colors + old] = move + int(0.6 * len(conflicting)) + rng.randrange(10)
+
+        for neighbor in neighbors[u]:
+            base = neighbor * colors
+            gamma[base + old] -= 1
+            gamma[base + color] += 1
+            own = coloring[neighbor]
+            if own == old and not gamma[base + old]:
+                conflicting.discard(neighbor)
+            elif own == color:
+                conflicting.add(neighbor)
+        if gamma[u * colors + color]:
+            conflicting.add(u)
+        else:
+            conflicting.discard(u)
+
+    return coloring if not conflicts else None
+
+
+def drop_color(neighbors: Sequence[Sequence[int]], coloring: Sequence[int], rng: random.Random) -> List[int]:
+    """
+    Начальная раскраска в k - 1 цвет для Tabucol.
+
+    Наименьший цветовой класс расформировывается: каждая его вершина получает
+    цвет из 0..k-2, которым окрашено меньше всего её соседей.
+    """
+    colors = max(coloring) + 1
+    sizes = [0] * colors
+    for color in coloring:
+        sizes[color] += 1
+    smallest = min(range(colors), key=sizes.__getitem__)
+    # Наименьший класс меняется местами с последним, чтобы остались цвета 0..k-2
+    last = colors - 1
+    result = [last if color == smallest else smallest if color == last else color for color in coloring]
+
+    for u in [u for u in range(len(result)) if result[u] == last]:
+        counts = [0] * last
+        for neighbor in neighbors[u]:
+            if result[neighbor] < last:
+                counts[result[neighbor]] += 1
+        fewest = min(counts)
+        result[u] = rng.choice([color for color in range(last) if counts[color] == fewest])
+    return result
+
+
+def reduce_colors(
+    neighbors: Sequence[Sequence[int]],
+    coloring: Sequence[int],
+    time_limit: Optional[float] = 1.0,
+    max_iterations: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[int]:
+    """
+    Уменьшение числа цветов корректной раскраски в пределах бюджета.
+
+    Проходы итеративного жадного алгоритма повторяются, пока они уменьшают число
+    цветов; после GREEDY_PATIENCE проходов без улучшения Tabucol пытается
+    обойтись на один цвет меньше, если его таблицы не больше TABU_MAX_CELLS.
+    Итерацией считается проход жадного алгоритма или ход Tabucol.
+
+    Args:
+        neighbors (Sequence[Sequence[int]]): Списки соседей без петель и повторов.
+        coloring (Sequence[int]): Начальная корректная раскраска.
+        time_limit (float, optional): Ограничение по времени в секундах. По умолчанию 1 секунда.
+        max_iterations (int, optional): Ограничение по числу итераций.
+        seed (int, optional): Зерно генератора.
+
+    Returns:
+        list: Лучшая найденная корректная раскраска (цвета 0..k-1).
+
+    Raises:
+        ValueError: Если не задано ни одно ограничение.
+    """
+    if time_limit is None and max_iterations is None:
+        raise ValueError("Нужно задать time_limit или max_iterations.")
+    rng = random.Random(seed)
+    budget = Budget(time_limit, max_iterations)
+
+    best = compact_colors(coloring)
+    colors = max(best, default=-1) + 1
+    # Граф с рёбрами нельзя раскрасить меньше чем в 2 цвета
+    lower = 2 if any(neighbors) else min(colors, 1)
+    current = best
+    stall = 0
+    while colors > lower and budget.spend():
+        if stall < GREEDY_PATIENCE or len(current) * (colors - 1) > TABU_MAX_CELLS:
+            current = greedy_by_classes(neighbors, current, rng)
+            if max(current) + 1 < colors:
+                best, colors, stall = current, max(current) + 1, 0
+            else:
+                stall += 1
+            continue
+
+        found = tabucol(neighbors, colors - 1, drop_color(neighbors, current, rng), rng, budget)
+        if found is not None:
+            # Tabucol может не использовать какой-то из colors - 1 цветов
+            best = current = compact_colors(found)
+            colors = max(best) + 1
+        stall = 0
+    return best
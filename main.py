@@ -1,6 +1,34 @@
-import matplotlib.pyplot as plt
-import networkx as nx
-from typing import List
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from itertools import chain
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cache import ColoringCache
+from stats import ColoringStats
+
+# Стратегии упорядочивания вершин для жадной раскраски
+ORDERS = ("natural", "largest_first", "smallest_last", "random")
+# Заголовок двоичного файла графа: сигнатура, версия, флаги, число вершин, число рёбер,
+# длины массивов исходящих и входящих соседей. Все числа в порядке little-endian.
+GRAPH_FILE_MAGIC = b"DMGRAPH\0"
+GRAPH_FILE_VERSION = 1
+_GRAPH_FILE_HEADER = struct.Struct("<8sIIqqqq")
+_FLAG_DIRECTED = 1
+_FLAG_IN_EDGES = 2
+# Алгоритмы раскраски, доступные через Graph.color
+ALGORITHMS = ("greedy", "dsatur", "jones_plassmann", "speculative", "partitioned")
+# Форматы вывода раскраски в пакетном режиме
+OUTPUT_FORMATS = ("text", "json", "binary")
+# Раскладки вершин для визуализации (модуль visualization.py)
+LAYOUTS = ("auto", "spring", "spectral", "random")
 
 
 class Graph:
@@ -15,8 +43,19 @@ class Graph:
         self.vertices = vertices
         # Список смежности
         self.smezh_list = {v: [] for v in range(vertices)}
+        # Обратный список смежности: источники входящих ориентированных рёбер
+        self.in_smezh_list = {v: [] for v in range(vertices)}
+        # Количество добавленных рёбер
+        self.edges = 0
         # Тип графа
         self.directed = False
+        # Сбор статистики раскраски (ColoringStats); None — статистика отключена
+        self.stats: Optional[ColoringStats] = None
+        # Кеш результатов раскраски (ColoringCache); None — кеш отключён
+        self.cache: Optional[ColoringCache] = None
+        # Запомненные отпечаток и массивы рёбер; сбрасываются при изменении рёбер через методы графа
+        self._fingerprint: Optional[str] = None
+        self._edge_arrays: Optional[tuple] = None
 
     def add_edge(self, u: int, v: int, directed: bool = False) -> None:
         """
@@ -31,12 +70,444 @@ class Graph:
         if not directed:
             self.smezh_list[v].append(u)
         else:
+            self.in_smezh_list[v].append(u)
+            self.directed = True
+        self.edges += 1
+        self._invalidate()
+
+    def remove_edge(self, u: int, v: int, directed: bool = False) -> None:
+        """
+        Удаление одного ребра из графа.
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+            directed (bool, optional): Если True, удаляется ориентированное ребро u -> v. По умолчанию False.
+
+        Raises:
+            ValueError: Если такого ребра нет в графе.
+        """
+        # Обе записи ребра проверяются до изменения, чтобы списки смежности не разошлись
+        reverse = self.in_smezh_list[v] if directed else self.smezh_list[v]
+        if v not in self.smezh_list[u] or u not in reverse:
+            raise ValueError(f"Ребро ({u}, {v}) отсутствует в графе.")
+        self.smezh_list[u].remove(v)
+        if not directed:
+            self.smezh_list[v].remove(u)
+        else:
+            self.in_smezh_list[v].remove(u)
+        self.edges -= 1
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """
+        Сброс данных, вычисленных по рёбрам графа, после его изменения.
+        """
+        self._fingerprint = None
+        self._edge_arrays = None
+
+    def _grow(self, vertices: int) -> None:
+        """
+        Добавление изолированных вершин, чтобы их стало не меньше vertices.
+        """
+        for v in range(self.vertices, vertices):
+            self.smezh_list[v] = []
+            self.in_smezh_list[v] = []
+        self.vertices = max(self.vertices, vertices)
+        self._invalidate()
+
+    def edge_arrays(self) -> tuple:
+        """
+        Все записи списков смежности в виде двух массивов NumPy.
+
+        Запись i означает, что targets[i] входит в smezh_list[sources[i]]; для
+        неориентированного графа каждое ребро встречается дважды. Массивы
+        запоминаются до следующего изменения рёбер, поэтому повторные проверки
+        раскрасок не извлекают их заново.
+
+        Returns:
+            tuple: Массивы sources и targets (int32) одинаковой длины.
+        """
+        if self._edge_arrays is None:
+            import numpy as np
+
+            lists = [self.smezh_list[u] for u in range(self.vertices)]
+            lengths = np.fromiter(map(len, lists), dtype=np.int64, count=self.vertices)
+            targets = np.array(array("i", chain.from_iterable(lists)))
+            sources = np.repeat(np.arange(self.vertices, dtype=np.int32), lengths)
+            self._edge_arrays = (sources, targets)
+        return self._edge_arrays
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """
+        Проверка наличия ребра u -> v (для неориентированного графа — ребра u - v).
+
+        Для списков смежности проверка занимает O(deg(u)), для SetGraph — O(1).
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+
+        Returns:
+            bool: True, если v есть среди соседей u.
+        """
+        return v in self.smezh_list[u]
+
+    def degree(self, u: int, directed: bool = False) -> int:
+        """
+        Степень вершины.
+
+        Args:
+            u (int): Вершина.
+            directed (bool, optional): Учитывать входящие рёбра. По умолчанию False.
+
+        Returns:
+            int: Число записей в списках соседей вершины (повторные рёбра считаются каждое).
+        """
+        degree = len(self.smezh_list[u])
+        if directed:
+            degree += len(self.in_smezh_list[u])
+        return degree
+
+    def add_edges(self, edges: Iterable[Tuple[int, int]], directed: bool = False) -> None:
+        """
+        Пакетное добавление рёбер в граф.
+
+        Правила те же, что у add_edge: неориентированное ребро попадает в оба списка
+        смежности, ориентированное — в smezh_list и in_smezh_list. Порядок соседей
+        совпадает с последовательными вызовами add_edge.
+
+        Args:
+            edges (Iterable[Tuple[int, int]]): Пары (u, v) или целочисленный массив NumPy формы (E, 2).
+            directed (bool, optional): Если True, рёбра ориентированные. По умолчанию False.
+
+        Raises:
+            ValueError: Если индекс вершины вне диапазона [0, vertices - 1] или массив имеет неверную форму.
+
+        Example:
+            >>> g = Graph(3)
+            >>> g.add_edges([(0, 1), (1, 2)])
+            >>> g.smezh_list
+            {0: [1], 1: [0, 2], 2: [1]}
+        """
+        self._invalidate()
+        if not hasattr(edges, "shape"):
+            flat = list(chain.from_iterable(edges))
+            if len(flat) % 2:
+                raise ValueError("Каждое ребро должно задаваться парой вершин (u, v).")
+            try:
+                import numpy as np
+            except ImportError:
+                self._add_edges_list(flat, directed)
+                return
+            edges = np.array(flat, dtype=np.int64).reshape(-1, 2)
+        self._add_edges_array(edges, directed)
+
+    def _add_edges_list(self, flat: List[int], directed: bool) -> None:
+        """
+        Пакетное добавление рёбер без NumPy.
+
+        Args:
+            flat (list): Вершины рёбер подряд: u0, v0, u1, v1, ...
+            directed (bool): Являются ли рёбра ориентированными.
+        """
+        if not flat:
+            return
+        if min(flat) < 0 or max(flat) >= self.vertices:
+            raise ValueError("Индексы вершин должны быть в пределах [0, количество вершин - 1].")
+
+        smezh_list = self.smezh_list
+        pairs = iter(flat)
+        if directed:
+            in_smezh_list = self.in_smezh_list
+            for u, v in zip(pairs, pairs):
+                smezh_list[u].append(v)
+                in_smezh_list[v].append(u)
+            self.directed = True
+        else:
+            for u, v in zip(pairs, pairs):
+                smezh_list[u].append(v)
+                smezh_list[v].append(u)
+        self.edges += len(flat) // 2
+
+    def _add_edges_array(self, edges, directed: bool) -> None:
+        """
+        Пакетное добавление рёбер из массива NumPy формы (E, 2).
+
+        Проверка границ и группировка по вершинам выполняются векторно,
+        после чего каждый список смежности расширяется одним вызовом extend.
+        """
+        edges = _check_edge_array(edges, self.vertices)
+        if len(edges) == 0:
+            return
+
+        if directed:
+            _extend_grouped(self.smezh_list, edges[:, 0], edges[:, 1])
+            _extend_grouped(self.in_smezh_list, edges[:, 1], edges[:, 0])
             self.directed = True
+        else:
+            # Пары (u -> v), (v -> u) чередуются, как при вызовах add_edge
+            _extend_grouped(self.smezh_list, edges.ravel(), edges[:, ::-1].ravel())
+        self.edges += len(edges)
+
+    def freeze(self) -> "CSRGraph":
+        """
+        Преобразование графа в компактное неизменяемое представление CSR.
+
+        Returns:
+            CSRGraph: Граф, хранящий списки смежности в массивах int32.
+
+        Example:
+            >>> g = Graph(3)
+            >>> g.add_edge(0, 1)
+            >>> g.add_edge(1, 2)
+            >>> g.freeze().greedy_coloring()
+            [0, 1, 0]
+        """
+        from csr import CSRGraph, _to_csr
+
+        out_offsets, out_targets = _to_csr(self.vertices, self.smezh_list)
+        if self.directed:
+            in_offsets, in_targets = _to_csr(self.vertices, self.in_smezh_list)
+        else:
+            in_offsets, in_targets = None, None
+        return CSRGraph(self.vertices, self.directed, self.edges, out_offsets, out_targets, in_offsets, in_targets)
+
+    def save(self, path: str) -> None:
+        """
+        Сохранение графа в двоичном формате для быстрой загрузки через CSRGraph.load.
+
+        Файл содержит заголовок и массивы CSR: смещения (int64) и соседей (int32)
+        исходящих рёбер, а для ориентированного графа — и входящих. Каждый массив
+        выровнен на 8 байт.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        frozen = self.freeze()
+        has_in = frozen.in_offsets is not None
+        flags = (_FLAG_DIRECTED if self.directed else 0) | (_FLAG_IN_EDGES if has_in else 0)
+        arrays = [frozen.out_offsets, frozen.out_targets]
+        if has_in:
+            arrays += [frozen.in_offsets, frozen.in_targets]
+
+        with open(path, "wb") as file:
+            file.write(
+                _GRAPH_FILE_HEADER.pack(
+                    GRAPH_FILE_MAGIC,
+                    GRAPH_FILE_VERSION,
+                    flags,
+                    self.vertices,
+                    self.edges,
+                    len(frozen.out_targets),
+                    len(frozen.in_targets) if has_in else 0,
+                )
+            )
+            for values in arrays:
+                data = memoryview(values)
+                if sys.byteorder != "little":
+                    swapped = array(data.format, data)
+                    swapped.byteswap()
+                    data = memoryview(swapped)
+                file.write(data)
+                file.write(bytes(-data.nbytes % 8))
+
+    def _neighbor_csr(self) -> tuple:
+        """
+        Все соседи каждой вершины в формате CSR.
+
+        Для неориентированного графа это исходящие списки, для ориентированного —
+        объединение исходящих и входящих рёбер.
+
+        Returns:
+            tuple: Массив смещений (int64) и массив соседей (int32).
+        """
+        if not self.directed:
+            frozen = self.freeze()
+            return frozen.out_offsets, frozen.out_targets
+        offsets = array("q", [0])
+        targets = array("i")
+        for u in range(self.vertices):
+            targets.extend(self.smezh_list[u])
+            targets.extend(self.in_smezh_list[u])
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def memory_usage(self) -> int:
+        """
+        Оценка памяти, занимаемой списками смежности.
+
+        Returns:
+            int: Размер в байтах (словари, списки и объекты целых чисел).
+        """
+        total = 0
+        seen = set()
+        for adjacency in (self.smezh_list, self.in_smezh_list):
+            total += sys.getsizeof(adjacency)
+            for neighbors in adjacency.values():
+                total += sys.getsizeof(neighbors)
+                for vertex in neighbors:
+                    if id(vertex) not in seen:
+                        seen.add(id(vertex))
+                        total += sys.getsizeof(vertex)
+        return total
+
+    def bytes_per_edge(self) -> float:
+        """
+        Средний объём памяти на одно ребро.
+
+        Returns:
+            float: Отношение memory_usage() к количеству рёбер.
+        """
+        return self.memory_usage() / max(self.edges, 1)
+
+    def fingerprint(self) -> str:
+        """
+        Отпечаток структуры графа, не зависящий от порядка добавления рёбер.
+
+        Хешируются число вершин, ориентированность и отсортированные списки соседей,
+        поэтому графы с одинаковыми множествами рёбер получают одинаковый отпечаток.
+        Результат запоминается до следующего изменения рёбер (add_edge, add_edges,
+        remove_edge); после изменения smezh_list напрямую нужно вызвать graph._invalidate().
+
+        Returns:
+            str: Шестнадцатеричная строка BLAKE2b (32 символа).
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+        lengths = array("q")
+        targets = array("i")
+        for u in range(self.vertices):
+            neighbors = self.smezh_list[u]
+            lengths.append(len(neighbors))
+            targets.extend(sorted(neighbors))
+        if sys.byteorder != "little":
+            lengths.byteswap()
+            targets.byteswap()
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack("<q?", self.vertices, self.directed))
+        digest.update(lengths)
+        digest.update(targets)
+        self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def vertex_order(self, order: str = "natural", seed: Optional[int] = None, directed: bool = False) -> List[int]:
+        """
+        Порядок обхода вершин для жадной раскраски.
+
+        Args:
+            order (str, optional): Стратегия: "natural" (0..V-1), "largest_first" (Уэлш–Пауэлл,
+                по убыванию степени), "smallest_last" (вырожденный порядок) или "random".
+            seed (int, optional): Зерно генератора для стратегии "random".
+            directed (bool, optional): Учитывать входящие рёбра при подсчёте степени. По умолчанию False.
+
+        Returns:
+            list: Вершины в порядке раскраски.
+
+        Raises:
+            ValueError: Если стратегия неизвестна.
+        """
+        if order == "natural":
+            return list(range(self.vertices))
+        if order == "largest_first":
+            degrees = self._degrees(directed)
+            return sorted(range(self.vertices), key=lambda u: -degrees[u])
+        if order == "smallest_last":
+            return self._smallest_last_order(directed)[0]
+        if order == "random":
+            vertices = list(range(self.vertices))
+            random.Random(seed).shuffle(vertices)
+            return vertices
+        raise ValueError(f"Неизвестная стратегия упорядочивания: {order}. Допустимые значения: {', '.join(ORDERS)}.")
+
+    def degeneracy(self, directed: bool = False) -> int:
+        """
+        Вырожденность графа: наибольшая степень вершины в момент её удаления
+        при последовательном удалении вершин наименьшей степени.
+
+        Жадная раскраска в порядке "smallest_last" использует не больше degeneracy() + 1 цветов.
+
+        Args:
+            directed (bool, optional): Учитывать входящие рёбра. По умолчанию False.
+
+        Returns:
+            int: Вырожденность графа.
+
+        Example:
+            >>> g = Graph(4)
+            >>> g.add_edges([(0, 1), (1, 2), (2, 0), (2, 3)])
+            >>> g.degeneracy()
+            2
+        """
+        return self._smallest_last_order(directed)[1]
+
+    def _degrees(self, directed: bool) -> List[int]:
+        """
+        Степени вершин (с учётом входящих рёбер, если directed=True).
+        """
+        degrees = [len(self.smezh_list[u]) for u in range(self.vertices)]
+        if directed:
+            for u in range(self.vertices):
+                degrees[u] += len(self.in_smezh_list[u])
+        return degrees
 
-    def greedy_coloring(self) -> List[int]:
+    def _smallest_last_order(self, directed: bool) -> Tuple[List[int], int]:
+        """
+        Порядок "smallest last" (Матула–Бек) на очереди-корзинах за O(V + E).
+
+        Для графа с ориентированными рёбрами степени и соседи всегда берутся по обоим
+        направлениям (симметричная окрестность строится один раз): иначе удаление вершины
+        уменьшало бы степень соседа, в которую её ребро не входило.
+
+        Returns:
+            tuple: Порядок вершин и вырожденность графа.
+        """
+        if self.directed:
+            offsets, targets = self._neighbor_csr()
+            degrees = [offsets[u + 1] - offsets[u] for u in range(self.vertices)]
+            adjacency = [targets[offsets[u]:offsets[u + 1]] for u in range(self.vertices)]
+        else:
+            degrees = self._degrees(directed)
+            adjacency = self.smezh_list
+        buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+        for u in range(self.vertices):
+            buckets[degrees[u]].append(u)
+
+        removed = [False] * self.vertices
+        removal_order = []
+        degeneracy = 0
+        current = 0
+        for _ in range(self.vertices):
+            # В корзинах могут остаться устаревшие записи: пропускаем их
+            while True:
+                while not buckets[current]:
+                    current += 1
+                u = buckets[current].pop()
+                if not removed[u] and degrees[u] == current:
+                    break
+            degeneracy = max(degeneracy, current)
+            removed[u] = True
+            removal_order.append(u)
+
+            for neighbor in adjacency[u]:
+                if not removed[neighbor]:
+                    degrees[neighbor] -= 1
+                    buckets[degrees[neighbor]].append(neighbor)
+                    if degrees[neighbor] < current:
+                        current = degrees[neighbor]
+
+        removal_order.reverse()
+        return removal_order, degeneracy
+
+    def greedy_coloring(self, order: str = "natural", seed: Optional[int] = None) -> List[int]:
         """
         Раскраска графа жадным алгоритмом.
 
+        Args:
+            order (str, optional): Стратегия упорядочивания вершин (см. vertex_order). По умолчанию "natural".
+            seed (int, optional): Зерно генератора для стратегии "random".
+
         Returns:
             list: Список цветов для каждой вершины.
 
@@ -50,35 +521,18 @@ class Graph:
             >>> g.greedy_coloring()
             [0, 1, 0, 1, 2]
         """
-        result = [-1] * self.vertices  # Цвета вершин, -1 означает нераскрашенную вершину
-        result[0] = 0  # Первая вершина раскрашена в цвет 0
-
-        # Массив для отслеживания доступности цветов
-        available_colors = [False] * self.vertices
-
-        for u in range(1, self.vertices):
-            # Цвета соседей помечены как занятые
-            for neighbor in self.smezh_list[u]:
-                if result[neighbor] != -1:
-                    available_colors[result[neighbor]] = True
-
-            # Нахождение первого доступного цвета
-            for color in range(self.vertices):
-                if not available_colors[color]:
-                    result[u] = color
-                    break
-
-            # Сброс доступности цветов
-            for neighbor in self.smezh_list[u]:
-                if result[neighbor] != -1:
-                    available_colors[result[neighbor]] = False
-
-        return result
+        return self._cached(
+            "greedy", (order, seed if order == "random" else None), lambda: self._first_fit(order, seed, directed=False)
+        )
 
-    def greedy_coloring_directed(self) -> List[int]:
+    def greedy_coloring_directed(self, order: str = "natural", seed: Optional[int] = None) -> List[int]:
         """
         Раскраска ориентированного графа жадным алгоритмом.
 
+        Args:
+            order (str, optional): Стратегия упорядочивания вершин (см. vertex_order). По умолчанию "natural".
+            seed (int, optional): Зерно генератора для стратегии "random".
+
         Returns:
             list: Список цветов для каждой вершины.
 
@@ -92,44 +546,567 @@ class Graph:
             [0, 1, 2, 3, 4]
         """
         if not self.directed:
-            return self.greedy_coloring()
+            return self.greedy_coloring(order, seed)
 
-        result = [-1] * self.vertices  # Цвета вершин, -1 означает нераскрашенную вершину
-        result[0] = 0  # Первая вершина раскрашена в цвет 0
+        return self._cached(
+            "greedy_directed",
+            (order, seed if order == "random" else None),
+            lambda: self._first_fit(order, seed, directed=True),
+        )
 
-        # Массив для отслеживания доступности цветов
-        available = [False] * self.vertices
+    def _cached(self, method: str, options: tuple, compute: Callable[[], List[int]]) -> List[int]:
+        """
+        Раскраска через кеш self.cache, если он включён.
 
-        for u in range(1, self.vertices):
-            # Цвета соседей (входящих и исходящих рёбер) помечены как занятые
-            for neighbor in self.smezh_list[u]:
-                if result[neighbor] != -1:
-                    available[result[neighbor]] = True
-            for vertex, neighbors in self.smezh_list.items():
-                if u in neighbors and result[vertex] != -1:
-                    available[result[vertex]] = True
+        Args:
+            method (str): Название метода раскраски.
+            options (tuple): Параметры, от которых зависит результат.
+            compute (callable): Вычисляет раскраску при промахе кеша.
+
+        Returns:
+            list: Список цветов для каждой вершины (копия, которую можно изменять).
+        """
+        if self.cache is None:
+            return compute()
+        key = self.cache.key(self.fingerprint(), method, options)
+        coloring = self.cache.get(key)
+        if coloring is None:
+            coloring = compute()
+            self.cache.put(key, coloring)
+        return list(coloring)
+
+    def _first_fit(self, order: str, seed: Optional[int], directed: bool) -> List[int]:
+        """
+        Жадная раскраска вершин в заданном порядке наименьшим свободным цветом.
+
+        Занятые цвета помечаются в массиве меток номером текущей вершины, поэтому
+        сбрасывать пометки после выбора цвета не нужно. Помечено не больше deg(u)
+        цветов, так что поиск свободного цвета занимает O(deg(u)), а не O(V).
+
+        Args:
+            order (str): Стратегия упорядочивания вершин (см. vertex_order).
+            seed (int, optional): Зерно генератора для стратегии "random".
+            directed (bool): Учитывать входящие рёбра как соседей.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.start("greedy_directed" if directed else "greedy")
+        vertices = self.vertex_order(order, seed, directed)
+        if stats is not None:
+            stats.phase("ordering")
+
+        result = [-1] * self.vertices  # Цвета вершин, -1 означает нераскрашенную вершину
+        # stamp[color] == u означает, что цвет color занят соседом вершины u
+        stamp = [-1] * (self.vertices + 1)
+        smezh_list = self.smezh_list
+        in_smezh_list = self.in_smezh_list
+        counting = stats is not None
+        probes = 0
+
+        for u in vertices:
+            # Цвета соседей (для ориентированного графа — и по входящим рёбрам) помечены как занятые
+            for neighbor in chain(smezh_list[u], in_smezh_list[u]) if directed else smezh_list[u]:
+                color = result[neighbor]
+                if color != -1:
+                    stamp[color] = u
 
             # Нахождение первого доступного цвета
-            for color in range(self.vertices):
-                if not available[color]:
-                    result[u] = color
-                    break
+            color = 0
+            while stamp[color] == u:
+                color += 1
+            result[u] = color
+            if counting:
+                probes += color + 1
 
-            # Сброс доступности цветов
-            for neighbor in self.smezh_list[u]:
-                if result[neighbor] != -1:
-                    available[result[neighbor]] = False
-            for vertex, neighbors in self.smezh_list.items():
-                if u in neighbors and result[vertex] != -1:
-                    available[result[vertex]] = False
+        if stats is not None:
+            stats.phase("coloring")
+            # Каждая вершина обходит всех соседей один раз
+            stats.neighbors_visited = sum(len(smezh_list[u]) for u in range(self.vertices))
+            if directed:
+                stats.in_neighbors_visited = sum(len(in_smezh_list[u]) for u in range(self.vertices))
+            stats.color_probes = probes
+            stats.finish()
+        return result
+
+    def dsatur_coloring(self) -> List[int]:
+        """
+        Раскраска графа алгоритмом DSatur.
+
+        На каждом шаге раскрашивается вершина с наибольшим числом различных цветов
+        у соседей (насыщенностью), при равенстве — с наибольшей степенью.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+
+        Example:
+            >>> g = Graph(5)
+            >>> g.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)])
+            >>> g.dsatur_coloring()
+            [0, 1, 0, 1, 2]
+        """
+        return self._cached("dsatur", (), lambda: self._dsatur(directed=False))
+
+    def dsatur_coloring_directed(self) -> List[int]:
+        """
+        Раскраска ориентированного графа алгоритмом DSatur.
+
+        Соседями вершины считаются концы как исходящих, так и входящих рёбер.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+        """
+        if not self.directed:
+            return self.dsatur_coloring()
+        return self._cached("dsatur_directed", (), lambda: self._dsatur(directed=True))
+
+    def _dsatur(self, directed: bool) -> List[int]:
+        """
+        DSatur с кучей приоритетов и ленивым удалением устаревших записей.
+
+        Для каждой вершины хранится множество цветов соседей; при изменении
+        насыщенности в кучу добавляется новая запись. Всего записей не больше V + E,
+        поэтому время работы O((V + E) log V).
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.start("dsatur_directed" if directed else "dsatur")
+
+        result = [-1] * self.vertices  # Цвета вершин, -1 означает нераскрашенную вершину
+        degrees = self._degrees(directed)
+        # Множества цветов соседей для каждой вершины
+        neighbor_colors = [set() for _ in range(self.vertices)]
+
+        heap = [(0, -degrees[u], u) for u in range(self.vertices)]
+        heapq.heapify(heap)
+        counting = stats is not None
+        probes = pushes = stale = 0
+        if counting:
+            stats.phase("heap_init")
+        while heap:
+            saturation, degree, u = heapq.heappop(heap)
+            if result[u] != -1 or -saturation != len(neighbor_colors[u]):
+                if counting:
+                    stale += 1
+                continue
+
+            # Наименьший цвет, которого нет у соседей
+            used = neighbor_colors[u]
+            color = 0
+            while color in used:
+                color += 1
+            result[u] = color
+            if counting:
+                probes += color + 1
+
+            neighbors = chain(self.smezh_list[u], self.in_smezh_list[u]) if directed else self.smezh_list[u]
+            for neighbor in neighbors:
+                if result[neighbor] == -1 and color not in neighbor_colors[neighbor]:
+                    neighbor_colors[neighbor].add(color)
+                    heapq.heappush(heap, (-len(neighbor_colors[neighbor]), -degrees[neighbor], neighbor))
+                    if counting:
+                        pushes += 1
+
+        if stats is not None:
+            stats.phase("coloring")
+            stats.heap_pushes = self.vertices + pushes
+            stats.stale_pops = stale
+            stats.neighbors_visited = sum(len(self.smezh_list[u]) for u in range(self.vertices))
+            if directed:
+                stats.in_neighbors_visited = sum(len(self.in_smezh_list[u]) for u in range(self.vertices))
+            stats.color_probes = probes
+            stats.finish()
+        return result
+
+    def parallel_coloring(self, workers: Optional[int] = None, seed: Optional[int] = None) -> List[int]:
+        """
+        Параллельная раскраска алгоритмом Джонса–Плассмана.
+
+        Вершинам назначаются случайные приоритеты; в каждом раунде одновременно
+        раскрашиваются вершины, приоритет которых выше, чем у всех нераскрашенных
+        соседей. Рабочие процессы читают граф из разделяемой памяти.
+        Для ориентированного графа учитываются и входящие рёбра.
+
+        Args:
+            workers (int, optional): Число процессов. По умолчанию — число ядер; 1 — без пула.
+            seed (int, optional): Зерно генератора приоритетов. При одинаковом seed результат
+                не зависит от числа процессов.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+
+        Raises:
+            RuntimeError: Если полученная раскраска некорректна.
+        """
+        from parallel import jones_plassmann_coloring
+
+        offsets, targets = self._neighbor_csr()
+        coloring = jones_plassmann_coloring(self.vertices, offsets, targets, workers=workers, seed=seed)
+        if not self.is_proper_coloring(coloring):
+            raise RuntimeError("Параллельная раскраска содержит конфликтующие рёбра.")
+        return coloring
+
+    def partitioned_coloring(
+        self, parts: Optional[int] = None, method: str = "bfs", seed: Optional[int] = None, max_rounds: int = 100
+    ) -> Tuple[List[int], dict]:
+        """
+        Раскраска по частям в отдельных процессах с согласованием границ (модуль partition.py).
+
+        Вершины делятся на parts частей (обходом в ширину или хешем), каждая часть
+        раскрашивается своим процессом, а конфликты на разрезанных рёбрах исправляются
+        раундами обмена цветами граничных вершин по каналам между процессами.
+        Для ориентированного графа учитываются и входящие рёбра.
+
+        Args:
+            parts (int, optional): Количество частей и процессов. По умолчанию — число ядер.
+            method (str, optional): Разбиение "bfs" или "hash". По умолчанию "bfs".
+            seed (int, optional): Соль хеша для разбиения "hash".
+            max_rounds (int, optional): Наибольшее число раундов обмена. По умолчанию 100.
+
+        Returns:
+            tuple: Раскраска и отчёт (parts, cut_edges, rounds, recolored, fixed, partition_seconds, seconds).
+
+        Raises:
+            RuntimeError: Если полученная раскраска некорректна.
+
+        Example:
+            >>> g = Graph(4)
+            >>> g.add_edges([(0, 1), (1, 2), (2, 3)])
+            >>> coloring, report = g.partitioned_coloring(parts=2)
+            >>> coloring, report["cut_edges"]
+            ([0, 1, 0, 1], 1)
+        """
+        from partition import partitioned_coloring
+
+        if parts is None:
+            parts = os.cpu_count() or 1
+        offsets, targets = self._neighbor_csr()
+        coloring, report = partitioned_coloring(self.vertices, offsets, targets, parts, method, seed, max_rounds)
+        if not self.is_proper_coloring(coloring):
+            raise RuntimeError("Раскраска по частям содержит конфликтующие рёбра.")
+        return coloring, report
+
+    def speculative_coloring(self, block_size: int = 65536) -> List[int]:
+        """
+        Пакетная спекулятивная раскраска на NumPy (Гебремедхин–Манне).
+
+        Блоки по block_size вершин раскрашиваются векторно, затем конфликтующие
+        вершины перекрашиваются, пока конфликтов не останется. Требует NumPy.
+        Для ориентированного графа учитываются и входящие рёбра.
+
+        Args:
+            block_size (int, optional): Сколько вершин раскрашивается одновременно. По умолчанию 65536.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+
+        Example:
+            >>> g = Graph(4)
+            >>> g.add_edges([(0, 1), (1, 2), (2, 3)])
+            >>> g.speculative_coloring(block_size=1)
+            [0, 1, 0, 1]
+        """
+        from vectorized import speculative_coloring
+
+        offsets, targets = self._neighbor_csr()
+        return speculative_coloring(self.vertices, offsets, targets, block_size)
+
+    def connected_components(self) -> List[int]:
+        """
+        Поиск компонент связности итеративным обходом в ширину за O(V + E).
+
+        Для ориентированного графа ищутся компоненты слабой связности.
+
+        Returns:
+            list: Номер компоненты для каждой вершины (компоненты нумеруются по наименьшей вершине).
+
+        Example:
+            >>> g = Graph(5)
+            >>> g.add_edges([(0, 1), (2, 3)])
+            >>> g.connected_components()
+            [0, 0, 1, 1, 2]
+        """
+        labels = [-1] * self.vertices
+        count = 0
+        for start in range(self.vertices):
+            if labels[start] != -1:
+                continue
+            labels[start] = count
+            queue = [start]
+            # Список растёт во время обхода и служит очередью
+            for u in queue:
+                for neighbor in chain(self.smezh_list[u], self.in_smezh_list[u]):
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = count
+                        queue.append(neighbor)
+            count += 1
+        return labels
+
+    def component_coloring(
+        self,
+        algorithm: str = "greedy",
+        order: str = "natural",
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 10000,
+    ) -> List[int]:
+        """
+        Раскраска каждой компоненты связности по отдельности.
+
+        Компоненты не меньше batch_size вершин раскрашиваются отдельными задачами
+        на пуле процессов, все меньшие компоненты — одним подграфом в текущем процессе,
+        потому что передача мелкой задачи в пул дороже её раскраски. Подграфы
+        передаются срезами массивов CSR с локальной нумерацией вершин.
+        Для жадного алгоритма в порядке "natural" результат совпадает с greedy_coloring.
+
+        Args:
+            algorithm (str, optional): Алгоритм раскраски компонент (см. color). По умолчанию "greedy".
+            order (str, optional): Стратегия упорядочивания для жадного алгоритма.
+            seed (int, optional): Зерно генератора для порядка "random" и приоритетов "jones_plassmann".
+            workers (int, optional): Число процессов. По умолчанию — число ядер; 1 — без пула.
+            batch_size (int, optional): Наименьший размер компоненты, раскрашиваемой на пуле. По умолчанию 10000.
+
+        Returns:
+            list: Список цветов для каждой вершины.
+
+        Raises:
+            ValueError: Для алгоритма "partitioned": он запускает свои процессы, а процессы пула не могут их создавать.
+        """
+        from parallel import color_graph, color_subgraph, color_subgraphs
+
+        if algorithm == "partitioned":
+            raise ValueError("Раскраска по частям сама запускает процессы; используйте partitioned_coloring.")
+        labels = self.connected_components()
+        sizes = [0] * (max(labels, default=-1) + 1)
+        for label in labels:
+            sizes[label] += 1
+        large = {label: [] for label, size in enumerate(sizes) if size >= batch_size}
+        if not large:
+            # Все компоненты мелкие: раскраска графа целиком равна раскраске каждой компоненты
+            return color_graph(self, algorithm, order, seed)
+        small = []
+        for u, label in enumerate(labels):
+            (large[label] if label in large else small).append(u)
+
+        frozen = self.freeze()
+        # Локальный номер каждой вершины в её подграфе
+        local = array("i", bytes(4 * self.vertices))
+        batches = list(large.values())
+        for batch in batches + [small]:
+            for index, u in enumerate(batch):
+                local[u] = index
+
+        result = [-1] * self.vertices
+        tasks = [_subgraph_task(frozen, batch, local, algorithm, order, seed) for batch in batches]
+        colorings = color_subgraphs(tasks, workers)
+        if small:
+            batches.append(small)
+            colorings.append(color_subgraph(_subgraph_task(frozen, small, local, algorithm, order, seed)))
+        for batch, coloring in zip(batches, colorings):
+            for u, color in zip(batch, coloring):
+                result[u] = color
         return result
 
-    def visualize(self, coloring: List[int], name_graph: str) -> None:
+    def exact_coloring(self, time_limit: Optional[float] = None) -> Tuple[List[int], int]:
+        """
+        Раскраска минимальным числом цветов методом ветвей и границ (модуль exact.py).
+
+        Подходит для графов до нескольких сотен вершин. Начальная верхняя граница —
+        раскраска DSatur, нижняя — жадно найденная клика. Для ориентированного графа
+        соседями считаются концы исходящих и входящих рёбер.
+
+        Args:
+            time_limit (float, optional): Ограничение по времени в секундах. По умолчанию без ограничения.
+
+        Returns:
+            tuple: Лучшая найденная раскраска и нижняя граница хроматического числа.
+                Если max(раскраска) + 1 равно нижней границе, раскраска оптимальна.
+
+        Example:
+            >>> g = Graph(5)
+            >>> g.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)])
+            >>> g.exact_coloring()
+            ([0, 1, 0, 1, 2], 3)
+        """
+        import exact
+
+        adjacency = []
+        for u in range(self.vertices):
+            mask = 0
+            neighbors = chain(self.smezh_list[u], self.in_smezh_list[u]) if self.directed else self.smezh_list[u]
+            for v in neighbors:
+                mask |= 1 << v
+            adjacency.append(mask & ~(1 << u))
+        initial = self.dsatur_coloring_directed() if self.directed else self.dsatur_coloring()
+        return exact.exact_coloring(adjacency, initial, time_limit)
+
+    def reduce_colors(
+        self,
+        coloring: Optional[Sequence[int]] = None,
+        time_limit: Optional[float] = 1.0,
+        max_iterations: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Уменьшение числа цветов раскраски локальным поиском (модуль local_search.py).
+
+        Итеративный жадный алгоритм и Tabucol работают, пока не кончится бюджет,
+        и возвращают лучшую корректную раскраску. Для ориентированного графа
+        соседями считаются концы исходящих и входящих рёбер.
+
+        Args:
+            coloring (Sequence[int], optional): Начальная корректная раскраска. По умолчанию self.color().
+            time_limit (float, optional): Ограничение по времени в секундах. По умолчанию 1 секунда.
+            max_iterations (int, optional): Ограничение по числу итераций (проходов и ходов).
+            seed (int, optional): Зерно генератора.
+
+        Returns:
+            list: Раскраска с не большим числом цветов (цвета 0..k-1).
+
+        Raises:
+            ValueError: Если начальная раскраска некорректна или не задан бюджет.
+
+        Example:
+            >>> g = Graph(6)
+            >>> g.add_edges([(0, 3), (0, 5), (1, 2), (1, 4), (2, 5), (3, 4)])
+            >>> max(g.reduce_colors([0, 0, 1, 1, 2, 2], max_iterations=100)) + 1
+            2
+        """
+        import local_search
+
+        if coloring is None:
+            coloring = self.color()
+        neighbors = []
+        for u in range(self.vertices):
+            adjacent = set(self.smezh_list[u])
+            if self.directed:
+                adjacent.update(self.in_smezh_list[u])
+            adjacent.discard(u)
+            neighbors.append(list(adjacent))
+        if len(coloring) != self.vertices or any(
+            coloring[u] < 0 or any(coloring[v] == coloring[u] for v in neighbors[u]) for u in range(self.vertices)
+        ):
+            raise ValueError("Начальная раскраска некорректна.")
+        return local_search.reduce_colors(neighbors, coloring, time_limit, max_iterations, seed)
+
+    def validate_coloring(self, coloring: Sequence[int]) -> dict:
+        """
+        Векторная проверка раскраски и её статистика (модуль vectorized.py, требуется NumPy).
+
+        Цвета концов всех рёбер сравниваются одной операцией над массивами edge_arrays().
+        Петли не считаются конфликтами; неориентированное ребро попадает в список
+        конфликтов один раз, ориентированное — в своём направлении.
+
+        Args:
+            coloring (Sequence[int]): Цвета вершин (-1 — вершина не раскрашена).
+
+        Returns:
+            dict: proper — раскраска корректна и все вершины раскрашены; colors — max(цвет) + 1;
+                histogram — число вершин каждого цвета; uncolored — число нераскрашенных вершин;
+                conflicts — рёбра [u, v] с одинаковыми цветами концов.
+
+        Raises:
+            ValueError: Если длина раскраски не равна числу вершин.
+
+        Example:
+            >>> g = Graph(3)
+            >>> g.add_edges([(0, 1), (1, 2)])
+            >>> g.validate_coloring([0, 0, 1])
+            {'proper': False, 'colors': 2, 'histogram': [2, 1], 'uncolored': 0, 'conflicts': [[0, 1]]}
+        """
+        import vectorized
+
+        if len(coloring) != self.vertices:
+            raise ValueError(f"Раскраска содержит {len(coloring)} цветов, а в графе {self.vertices} вершин.")
+        sources, targets = self.edge_arrays()
+        return vectorized.coloring_report(sources, targets, coloring, self.directed)
+
+    def is_proper_coloring(self, coloring: Sequence[int]) -> bool:
+        """
+        Проверка, что концы каждого ребра (кроме петель) имеют разные цвета.
+
+        Если установлен NumPy, проверка выполняется векторно (validate_coloring),
+        иначе — обходом списков смежности.
+
+        Args:
+            coloring (Sequence[int]): Цвета вершин.
+
+        Returns:
+            bool: True, если раскраска корректна и все вершины раскрашены.
+        """
+        if len(coloring) != self.vertices:
+            return False
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            return self.validate_coloring(coloring)["proper"]
+        for u in range(self.vertices):
+            color = coloring[u]
+            if color < 0:
+                return False
+            for neighbor in self.smezh_list[u]:
+                if neighbor != u and coloring[neighbor] == color:
+                    return False
+        return True
+
+    def color(self, algorithm: str = "greedy", order: str = "natural", seed: Optional[int] = None) -> List[int]:
+        """
+        Раскраска графа выбранным алгоритмом с учётом ориентированности.
+
+        Args:
+            algorithm (str, optional): "greedy", "dsatur", "jones_plassmann", "speculative" или "partitioned".
+                По умолчанию "greedy".
+            order (str, optional): Стратегия упорядочивания для жадного алгоритма.
+            seed (int, optional): Зерно генератора для порядка "random" и приоритетов "jones_plassmann".
+
+        Returns:
+            list: Список цветов для каждой вершины.
+
+        Raises:
+            ValueError: Если алгоритм неизвестен.
+        """
+        if algorithm == "greedy":
+            return self.greedy_coloring_directed(order, seed) if self.directed else self.greedy_coloring(order, seed)
+        if algorithm == "dsatur":
+            return self.dsatur_coloring_directed() if self.directed else self.dsatur_coloring()
+        if algorithm == "jones_plassmann":
+            return self.parallel_coloring(seed=seed)
+        if algorithm == "speculative":
+            return self.speculative_coloring()
+        if algorithm == "partitioned":
+            return self.partitioned_coloring()[0]
+        raise ValueError(f"Неизвестный алгоритм раскраски: {algorithm}. Допустимые значения: {', '.join(ALGORITHMS)}.")
+
+    def visualize(
+        self,
+        coloring: List[int],
+        name_graph: str,
+        path: Optional[str] = None,
+        layout: str = "auto",
+        sample: Optional[int] = None,
+        aggregate: bool = False,
+        seed: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
         """
         Визуализация графа с использованием раскраски.
 
+        Большие графы можно рисовать по выборке вершин или в виде графа цветовых
+        классов; раскладка кешируется по отпечатку графа (модуль visualization.py).
+
         Args:
             coloring (list): Список цветов вершин.
+            name_graph (str): Заголовок окна или рисунка.
+            path (str, optional): Сохранить рисунок в файл PNG/SVG вместо показа окна.
+            layout (str, optional): Раскладка из LAYOUTS. По умолчанию auto.
+            sample (int, optional): Рисовать не больше sample вершин.
+            aggregate (bool, optional): Рисовать одну вершину на цветовой класс с числом вершин.
+            seed (int, optional): Зерно выборки и раскладки.
+            cache_dir (str, optional): Каталог для хранения раскладок между запусками.
 
         Example:
             >>> g = Graph(5)
@@ -139,28 +1116,80 @@ class Graph:
             >>> g.add_edge(3, 4)
             >>> g.add_edge(4, 0)
             >>> coloring = g.greedy_coloring()
-            >>> g.visualize(coloring)
+            >>> g.visualize(coloring, "Цикл", path="cycle.png")
         """
-        G = nx.DiGraph() if self.directed else nx.Graph()
+        # matplotlib, networkx и NumPy нужны только для визуализации, поэтому модуль импортируется здесь
+        import visualization
+
+        visualization.render(self, coloring, name_graph, path, layout, sample, aggregate, seed, cache_dir)
+
+
+def _subgraph_task(
+    frozen: "CSRGraph", vertices: List[int], local: Sequence[int], algorithm: str, order: str, seed: Optional[int]
+) -> tuple:
+    """
+    Срезы CSR подграфа на вершинах vertices с локальной нумерацией для раскраски в другом процессе.
 
-        # Добавляем вершины
-        for vertex in self.smezh_list:
-            G.add_node(vertex)
+    Вершины должны быть упорядочены по возрастанию и замкнуты относительно соседства;
+    local[u] — номер вершины u в её подграфе.
+    """
+    whole = len(vertices) == frozen.vertices
+
+    def cut(offsets: Sequence[int], targets: Sequence[int]) -> tuple:
+        if whole:
+            # Подграф совпадает с графом: нумерация уже локальная
+            return offsets, targets
+        sub_offsets = array("q", [0])
+        sub_targets = array("i")
+        for u in vertices:
+            sub_targets.extend(targets[offsets[u]:offsets[u + 1]])
+            sub_offsets.append(len(sub_targets))
+        return sub_offsets, array("i", map(local.__getitem__, sub_targets))
 
-        # Добавляем ребра
-        for u in self.smezh_list:
-            for v in self.smezh_list[u]:
-                if not G.has_edge(u, v):
-                    G.add_edge(u, v)
+    out_offsets, out_targets = cut(frozen.out_offsets, frozen.out_targets)
+    in_offsets, in_targets = cut(frozen.in_offsets, frozen.in_targets) if frozen.in_offsets is not None else (None, None)
+    edges = len(out_targets) if frozen.directed else len(out_targets) // 2
+    return len(vertices), frozen.directed, edges, out_offsets, out_targets, in_offsets, in_targets, algorithm, order, seed
 
-        # Определяем цвета вершин
-        color_map = [coloring[node] for node in G.nodes]
 
-        # Рисуем граф
-        pos = nx.spring_layout(G)
-        nx.draw(G, pos, with_labels=True, node_color=color_map, cmap=plt.cm.rainbow, node_size=500, font_color="white")
-        plt.gcf().canvas.manager.set_window_title(name_graph)
-        plt.show()
+def _check_edge_array(edges, vertices: int):
+    """
+    Проверка массива рёбер: целочисленный, формы (E, 2), индексы в [0, vertices - 1].
+
+    Returns:
+        numpy.ndarray: Массив рёбер.
+
+    Raises:
+        ValueError: Если массив имеет неверный тип или форму или индекс вне диапазона.
+    """
+    import numpy as np
+
+    edges = np.asarray(edges)
+    if edges.ndim != 2 or edges.shape[1] != 2 or not np.issubdtype(edges.dtype, np.integer):
+        raise ValueError("Ожидается целочисленный массив рёбер формы (E, 2).")
+    if len(edges) and (edges.min() < 0 or edges.max() >= vertices):
+        raise ValueError("Индексы вершин должны быть в пределах [0, количество вершин - 1].")
+    return edges
+
+
+def _extend_grouped(adjacency: dict, keys, values) -> None:
+    """
+    Дописывание значений в списки смежности, сгруппированных по ключам.
+
+    Args:
+        adjacency (dict): Списки смежности, которые нужно расширить.
+        keys: Массив NumPy вершин, к спискам которых добавляются соседи.
+        values: Массив NumPy соседей той же длины.
+    """
+    import numpy as np
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    values = values[order].tolist()
+    starts = np.flatnonzero(np.diff(keys)) + 1
+    bounds = [0] + starts.tolist() + [len(values)]
+    for key, start, end in zip(keys[bounds[:-1]].tolist(), bounds[:-1], bounds[1:]):
+        adjacency[key].extend(values[start:end])
 
 
 def create_graph_from_user_input() -> Graph:
@@ -210,22 +1239,302 @@ def create_graph_from_user_input() -> Graph:
     return g
 
 
+def read_edge_chunks(stream: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[List[int]]:
+    """
+    Чтение списка рёбер блоками фиксированного размера.
+
+    Каждая строка содержит ребро "u v"; пустые строки и строки, начинающиеся
+    с '#', пропускаются. Неполная последняя строка блока переносится в следующий.
+
+    Args:
+        stream (BinaryIO): Двоичный поток с текстом списка рёбер.
+        chunk_size (int, optional): Размер читаемого блока в байтах. По умолчанию 1 МиБ.
+
+    Yields:
+        list: Вершины рёбер блока подряд: u0, v0, u1, v1, ...
+
+    Raises:
+        ValueError: Если строка не является парой целых чисел.
+    """
+    tail = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        if cut:
+            yield _parse_edge_block(block[:cut])
+    if tail.strip():
+        yield _parse_edge_block(tail + b"\n")
+
+
+def _parse_edge_block(block: bytes) -> List[int]:
+    """
+    Разбор блока целых строк списка рёбер.
+    """
+    # Быстрый путь: строки вида "u v" — после удаления цифр остаётся ровно один пробел
+    # и перевод строки на строку, а полей вдвое больше, чем строк
+    lines = block.count(b"\n")
+    tokens = block.split()
+    if len(tokens) == 2 * lines and block.translate(None, b"-0123456789") in (b" \n" * lines, b" \r\n" * lines):
+        try:
+            return list(map(int, tokens))
+        except ValueError:
+            pass
+
+    flat = []
+    for line in block.splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith(b"#"):
+            continue
+        try:
+            u, v = map(int, fields)
+        except ValueError:
+            raise ValueError(f"Некорректная строка списка рёбер: {line.decode(errors='replace')!r}.") from None
+        flat += (u, v)
+    return flat
+
+
+def load_edge_list(
+    stream: BinaryIO,
+    vertices: Optional[int] = None,
+    directed: bool = False,
+    chunk_size: int = 1 << 20,
+    dedupe: bool = False,
+) -> Graph:
+    """
+    Построение графа из текстового списка рёбер.
+
+    Рёбра каждого блока сразу добавляются в граф через add_edges (массивом NumPy,
+    если он установлен), и в памяти одновременно находится только один разобранный блок.
+    Если число вершин не задано, граф расширяется до наибольшего прочитанного индекса.
+
+    Args:
+        stream (BinaryIO): Двоичный поток со списком рёбер.
+        vertices (int, optional): Количество вершин.
+        directed (bool, optional): Если True, рёбра ориентированные. По умолчанию False.
+        chunk_size (int, optional): Размер читаемого блока в байтах.
+        dedupe (bool, optional): Построить SetGraph, в котором повторяющиеся рёбра хранятся один раз.
+
+    Returns:
+        Graph: Построенный граф.
+
+    Raises:
+        ValueError: Если строка некорректна или индекс вершины вне диапазона.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if dedupe:
+        from set_graph import SetGraph
+
+        graph = SetGraph(vertices or 0)
+    else:
+        graph = Graph(vertices or 0)
+    graph.directed = directed
+    for flat in read_edge_chunks(stream, chunk_size):
+        if vertices is None and flat:
+            graph._grow(max(flat) + 1)
+        if np is not None:
+            graph.add_edges(np.array(flat, dtype=np.int64).reshape(-1, 2), directed=directed)
+        else:
+            pairs = iter(flat)
+            graph.add_edges(zip(pairs, pairs), directed=directed)
+    return graph
+
+
+def write_coloring(coloring: List[int], stream: BinaryIO, output_format: str = "text") -> None:
+    """
+    Запись раскраски в двоичный поток.
+
+    Форматы:
+        text — строки "вершина цвет";
+        json — объект с числом вершин, числом цветов и списком цветов;
+        binary — цвета вершин подряд как int32 little-endian.
+
+    Args:
+        coloring (list): Цвет каждой вершины.
+        stream (BinaryIO): Поток для записи.
+        output_format (str, optional): Один из OUTPUT_FORMATS. По умолчанию text.
+
+    Raises:
+        ValueError: Если формат неизвестен.
+    """
+    if output_format == "text":
+        stream.write("".join(f"{u} {color}\n" for u, color in enumerate(coloring)).encode())
+    elif output_format == "json":
+        document = {"vertices": len(coloring), "colors": max(coloring, default=-1) + 1, "coloring": coloring}
+        stream.write(json.dumps(document).encode() + b"\n")
+    elif output_format == "binary":
+        values = array("i", coloring)
+        if sys.byteorder != "little":
+            values.byteswap()
+        stream.write(values.tobytes())
+    else:
+        raise ValueError(f"Неизвестный формат вывода: {output_format}. Доступны: {', '.join(OUTPUT_FORMATS)}.")
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Пакетный режим: граф читается из файла или stdin, раскраска пишется в файл или stdout.
+
+    Файл в двоичном формате Graph.save распознаётся по сигнатуре и загружается
+    через CSRGraph.load; тогда --vertices и --directed не нужны. С --stream граф
+    не строится: файл рёбер читается несколько раз (модуль streaming.py), а
+    визуализация пропускается.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы командной строки.
+
+    Returns:
+        int: Код завершения (0 — успех, 1 — ошибка).
+    """
+    try:
+        if args.stream:
+            import streaming
+
+            coloring, report = streaming.stream_coloring(
+                streaming.file_source(args.input), args.vertices, args.passes, args.buffer_edges, args.palette, args.seed
+            )
+            if args.stats:
+                print("Статистика потоковой раскраски:", report, file=sys.stderr)
+        else:
+            if args.input == "-":
+                graph = load_edge_list(sys.stdin.buffer, args.vertices, args.directed, dedupe=args.dedupe)
+            else:
+                with open(args.input, "rb") as file:
+                    binary = file.read(len(GRAPH_FILE_MAGIC)) == GRAPH_FILE_MAGIC
+                    if not binary:
+                        file.seek(0)
+                        graph = load_edge_list(file, args.vertices, args.directed, dedupe=args.dedupe)
+                if binary:
+                    from csr import CSRGraph
+
+                    graph = CSRGraph.load(args.input)
+
+            if args.stats:
+                graph.stats = ColoringStats(
+                    callback=lambda stats: print("Статистика раскраски:", stats.as_dict(), file=sys.stderr)
+                )
+            if args.cache_dir:
+                graph.cache = ColoringCache(directory=args.cache_dir)
+            coloring = graph.color(args.algorithm, args.order, args.seed)
+            if args.improve:
+                coloring = graph.reduce_colors(coloring, time_limit=args.improve, seed=args.seed)
+
+        if args.output == "-":
+            write_coloring(coloring, sys.stdout.buffer, args.format)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, "wb") as file:
+                write_coloring(coloring, file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+    if not args.stream and not args.no_visualize:
+        graph.visualize(
+            coloring, args.input, args.render, args.layout, args.sample, args.aggregate, args.seed, args.layout_cache
+        )
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+
+    Args:
+        argv (list, optional): Аргументы командной строки. По умолчанию sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description="Жадная раскраска графа.")
+    parser.add_argument(
+        "--no-visualize",
+        action="store_true",
+        help="не открывать окно с визуализацией (режим без дисплея)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        choices=ALGORITHMS,
+        default="greedy",
+        help="алгоритм раскраски (по умолчанию greedy)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=ORDERS,
+        default="natural",
+        help="порядок обхода вершин при жадной раскраске (по умолчанию natural)",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="зерно для порядка random")
+    parser.add_argument("--stats", action="store_true", help="вывести счётчики и время фаз раскраски")
+    parser.add_argument(
+        "--improve", type=float, metavar="SECONDS", help="уменьшать число цветов локальным поиском заданное время"
+    )
+    parser.add_argument("--cache-dir", metavar="DIR", help="каталог кеша раскрасок (повторный запуск на том же графе не пересчитывает)")
+    drawing = parser.add_argument_group("визуализация")
+    drawing.add_argument("--render", metavar="PATH", help="сохранить рисунок в файл PNG/SVG вместо показа окна")
+    drawing.add_argument("--layout", choices=LAYOUTS, default="auto", help="раскладка вершин (по умолчанию auto)")
+    drawing.add_argument("--sample", type=int, metavar="N", help="рисовать не больше N вершин (выборка обходом в ширину)")
+    drawing.add_argument("--aggregate", action="store_true", help="рисовать одну вершину на цветовой класс")
+    drawing.add_argument("--layout-cache", metavar="DIR", help="каталог для кеша раскладок")
+    batch = parser.add_argument_group("пакетный режим", "включается флагом --input; вопросы не задаются")
+    batch.add_argument("--input", help="файл со списком рёбер 'u v' или графом Graph.save ('-' — stdin)")
+    batch.add_argument("--vertices", type=int, help="количество вершин (по умолчанию наибольший индекс + 1)")
+    batch.add_argument("--directed", action="store_true", help="рёбра ориентированные")
+    batch.add_argument("--dedupe", action="store_true", help="хранить соседей во множествах без повторяющихся рёбер")
+    batch.add_argument("--output", default="-", help="файл для раскраски (по умолчанию stdout)")
+    batch.add_argument("--format", choices=OUTPUT_FORMATS, default="text", help="формат раскраски (по умолчанию text)")
+    batch.add_argument(
+        "--stream", action="store_true", help="раскрашивать, читая файл рёбер несколько раз, без построения графа в памяти"
+    )
+    batch.add_argument("--passes", type=int, default=4, help="проходов исправления конфликтов с --stream (по умолчанию 4)")
+    batch.add_argument(
+        "--buffer-edges", type=int, default=1 << 20, help="размер буфера рёбер с --stream (по умолчанию 1048576)"
+    )
+    batch.add_argument("--palette", type=int, help="начальная палитра с --stream (по умолчанию степень вершины + 1)")
+    args = parser.parse_args(argv)
+    if args.vertices is not None and args.vertices < 0:
+        parser.error("количество вершин не может быть отрицательным")
+    if args.stream and args.input in (None, "-"):
+        parser.error("--stream требует файл --input: поток рёбер читается несколько раз")
+    if args.passes < 1 or args.buffer_edges < 0 or (args.palette is not None and args.palette < 1):
+        parser.error("--passes и --palette должны быть положительными, --buffer-edges — неотрицательным")
+    return args
+
+
 # Пример использования
 if __name__ == "__main__":
+    args = parse_args()
+    if args.input is not None:
+        sys.exit(run_batch(args))
     try:
         user_graph = create_graph_from_user_input()
         print("Список смежности графа:", user_graph.smezh_list)
 
-        # Выполняем жадную раскраску
-        if user_graph.directed:
-            coloring = user_graph.greedy_coloring_directed()
-        else:
-            coloring = user_graph.greedy_coloring()
+        # Выполняем раскраску
+        if args.stats:
+            user_graph.stats = ColoringStats(callback=lambda stats: print("Статистика раскраски:", stats.as_dict()))
+        if args.cache_dir:
+            user_graph.cache = ColoringCache(directory=args.cache_dir)
+        coloring = user_graph.color(args.algorithm, args.order, args.seed)
+        if args.improve:
+            coloring = user_graph.reduce_colors(coloring, time_limit=args.improve, seed=args.seed)
 
-        print("Результат жадной раскраски:", coloring)
+        print("Результат раскраски:", coloring)
+        degeneracy = user_graph.degeneracy(user_graph.directed)
+        print(f"Вырожденность графа: {degeneracy} (порядок smallest_last даёт не больше {degeneracy + 1} цветов)")
 
         # Визуализируем граф
-        name_graph = "Пользовательский граф"
-        user_graph.visualize(coloring, name_graph)
+        if not args.no_visualize:
+            name_graph = "Пользовательский граф"
+            user_graph.visualize(
+                coloring, name_graph, args.render, args.layout, args.sample, args.aggregate, args.seed, args.layout_cache
+            )
     except Exception as e:
         print(f"Произошла ошибка: {e}. Программа завершена.")
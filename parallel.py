@@ -0,0 +1,249 @@
+"""
+Параллельная раскраска графа на пуле процессов.
+
+Для алгоритма Джонса–Плассмана списки смежности в формате CSR, приоритеты вершин
+и текущие цвета хранятся в разделяемой памяти (multiprocessing.shared_memory),
+поэтому рабочие процессы читают граф напрямую, а не получают его копию через pickle.
+Независимые подграфы (например, компоненты связности) раскрашиваются отдельными задачами.
+"""
+import os
+import random
+from array import array
+from multiprocessing import Pool, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Разделяемые массивы, подключённые в рабочем процессе
+_views: Dict[str, memoryview] = {}
+_blocks: List[shared_memory.SharedMemory] = []
+
+
+def share_array(values: Sequence[int]) -> shared_memory.SharedMemory:
+    """
+    Копирование массива в новый блок разделяемой памяти.
+
+    Args:
+        values (Sequence[int]): Массив array или memoryview.
+
+    Returns:
+        SharedMemory: Блок с копией данных. Освобождать его должен вызывающий код.
+    """
+    data = memoryview(values).cast("B")
+    block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    block.buf[:data.nbytes] = data
+    return block
+
+
+def attach_arrays(specs: Dict[str, Tuple[str, str, int]]) -> Dict[str, memoryview]:
+    """
+    Подключение к блокам разделяемой памяти в рабочем процессе.
+
+    Args:
+        specs (dict): Имя массива -> (имя блока, код типа array, длина).
+
+    Returns:
+        dict: Имя массива -> memoryview нужного типа поверх разделяемой памяти.
+    """
+    views = {}
+    for key, (name, typecode, length) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        views[key] = block.buf[:length * array(typecode).itemsize].cast(typecode)
+    return views
+
+
+def _init_worker(specs: Dict[str, Tuple[str, str, int]]) -> None:
+    """
+    Инициализатор пула: подключает разделяемые массивы графа.
+    """
+    _views.update(attach_arrays(specs))
+
+
+def _worker_step(pending: List[int]) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Один раунд Джонса–Плассмана для части вершин в рабочем процессе.
+    """
+    return jones_plassmann_step(_views, pending)
+
+
+def jones_plassmann_step(
+    views: Dict[str, Sequence[int]], pending: List[int]
+) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Выбор и раскраска нераскрашенных вершин, приоритет которых выше,
+    чем у всех нераскрашенных соседей.
+
+    Выбранные вершины образуют независимое множество, поэтому их можно
+    раскрашивать одновременно, учитывая только цвета прошлых раундов.
+    Для каждой вершины хранится позиция cursor, до которой соседи уже проверены:
+    сосед с меньшим приоритетом не раскрасится раньше вершины, а раскрашенный
+    сосед остаётся раскрашенным, поэтому повторно их проверять не нужно.
+
+    Args:
+        views (dict): Массивы offsets, targets (симметричный CSR), priority, cursor и colors.
+        pending (list): Нераскрашенные вершины, которые нужно проверить.
+
+    Returns:
+        tuple: Пары (вершина, цвет) для раскрашенных в этом раунде вершин
+            и список вершин, которые остаются нераскрашенными.
+    """
+    offsets = views["offsets"]
+    targets = views["targets"]
+    colors = views["colors"]
+    priority = views["priority"]
+    cursor = views["cursor"]
+
+    assignments = []
+    blocked = []
+    for u in pending:
+        rank = priority[u]
+        finish = offsets[u + 1]
+        index = cursor[u]
+        for neighbor in targets[index:finish]:
+            if colors[neighbor] == -1 and priority[neighbor] > rank:
+                break
+            index += 1
+        cursor[u] = index
+        if index < finish:
+            blocked.append(u)
+            continue
+
+        used = {colors[neighbor] for neighbor in targets[offsets[u]:finish]}
+        color = 0
+        while color in used:
+            color += 1
+        assignments.append((u, color))
+    return assignments, blocked
+
+
+def jones_plassmann_coloring(
+    vertices: int,
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunks_per_worker: int = 4,
+) -> List[int]:
+    """
+    Раскраска Джонса–Плассмана со случайными приоритетами.
+
+    Результат зависит только от seed и не зависит от числа процессов.
+
+    Args:
+        vertices (int): Количество вершин.
+        offsets (Sequence[int]): Смещения списков соседей (int64, длина vertices + 1).
+        targets (Sequence[int]): Соседи всех вершин (int32); каждое ребро записано в обе стороны.
+        workers (int, optional): Число процессов. По умолчанию os.cpu_count(); 1 — без пула.
+        seed (int, optional): Зерно генератора приоритетов.
+        chunks_per_worker (int, optional): На сколько диапазонов делить вершины на каждый процесс.
+
+    Returns:
+        list: Список цветов для каждой вершины.
+    """
+    order = list(range(vertices))
+    random.Random(seed).shuffle(order)
+    priority = array("q", bytes(8 * vertices))
+    for rank, u in enumerate(order):
+        priority[u] = rank
+
+    arrays = {
+        "offsets": offsets,
+        "targets": targets,
+        "priority": priority,
+        "cursor": array("q", memoryview(offsets)[:vertices]),
+        "colors": array("i", [-1]) * vertices,
+    }
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        views = {key: memoryview(values) for key, values in arrays.items()}
+        _run_rounds([list(range(vertices))], views["colors"], lambda chunks: [jones_plassmann_step(views, chunks[0])])
+        return views["colors"].tolist()
+
+    blocks = {key: share_array(values) for key, values in arrays.items()}
+    specs = {key: (blocks[key].name, memoryview(values).format, len(values)) for key, values in arrays.items()}
+    colors = blocks["colors"].buf[:4 * vertices].cast("i")
+    try:
+        step = max(1, -(-vertices // (workers * chunks_per_worker)))
+        chunks = [list(range(start, min(start + step, vertices))) for start in range(0, vertices, step)]
+        with Pool(workers, initializer=_init_worker, initargs=(specs,)) as pool:
+            _run_rounds(chunks, colors, lambda pending: pool.map(_worker_step, pending))
+        return colors.tolist()
+    finally:
+        colors.release()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _run_rounds(chunks: List[List[int]], colors: memoryview, run_round) -> None:
+    """
+    Повторение раундов, пока не будут раскрашены все вершины.
+
+    Args:
+        chunks (list): Части нераскрашенных вершин, обрабатываемые независимо.
+        colors (memoryview): Текущие цвета, которые видят рабочие процессы.
+        run_round (callable): Обрабатывает части и возвращает для каждой назначения и оставшиеся вершины.
+    """
+    chunks = [chunk for chunk in chunks if chunk]
+    while chunks:
+        results = run_round(chunks)
+        chunks = []
+        for assignments, blocked in results:
+            for u, color in assignments:
+                colors[u] = color
+            if blocked:
+                chunks.append(blocked)
+
+
+def color_subgraph(task: tuple) -> List[int]:
+    """
+    Раскраска подграфа, заданного срезами CSR с локальной нумерацией.
+
+    Args:
+        task (tuple): Число вершин, признак ориентированности, число рёбер, смещения и соседи
+            исходящих рёбер, смещения и источники входящих рёбер (или None), алгоритм, порядок и seed.
+
+    Returns:
+        list: Список цветов вершин подграфа.
+    """
+    from csr import CSRGraph
+
+    *arrays, algorithm, order, seed = task
+    return color_graph(CSRGraph(*arrays), algorithm, order, seed)
+
+
+def color_graph(graph, algorithm: str, order: str, seed: Optional[int]) -> List[int]:
+    """
+    Раскраска графа без запуска дочерних процессов.
+
+    Args:
+        graph (Graph): Граф.
+        algorithm (str): Алгоритм раскраски (см. Graph.color).
+        order (str): Стратегия упорядочивания для жадного алгоритма.
+        seed (int, optional): Зерно генератора.
+
+    Returns:
+        list: Список цветов вершин.
+    """
+    if algorithm == "jones_plassmann":
+        # Рабочие процессы пула не могут запускать собственный пул
+        return graph.parallel_coloring(workers=1, seed=seed)
+    return graph.color(algorithm, order, seed)
+
+
+def color_subgraphs(tasks: List[tuple], workers: Optional[int] = None) -> List[List[int]]:
+    """
+    Раскраска независимых подграфов, по задаче на подграф.
+
+    Args:
+        tasks (list): Описания подграфов для color_subgraph.
+        workers (int, optional): Число процессов. По умолчанию os.cpu_count(); 1 — без пула.
+
+    Returns:
+        list: Раскраски подграфов в порядке задач.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [color_subgraph(task) for task in tasks]
+    with Pool(workers) as pool:
+        return pool.map(color_subgraph, tasks, chunksize=1)
@@ -0,0 +1,320 @@
+"""
+Раскраска графа по частям в нескольких процессах с согласованием границ.
+
+Вершины делятся на P частей обходом в ширину (связные области, меньше
+разрезанных рёбер) или хешем номера вершины. Каждая часть раскрашивается своим
+процессом: сначала жадно, с учётом только соседей из своей части. Затем процессы
+раундами обмениваются цветами граничных вершин по каналам multiprocessing.Pipe
+(только между частями, у которых есть общие рёбра): из концов разрезанного ребра
+одного цвета перекрашивается вершина с большим номером. Координатор только
+считает перекраски за раунд и останавливает обмен, когда их не осталось.
+
+Координатор за один проход по рёбрам нарезает срезы CSR частей и находит
+разрезанные рёбра. Процесс получает только свой срез и владельцев соседних
+вершин из других частей, а общаются процессы только сообщениями, поэтому ту же
+схему можно разнести по разным машинам, заменив каналы сокетами.
+"""
+import time
+from array import array
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Способы разбиения вершин на части
+PARTITION_METHODS = ("bfs", "hash")
+# Наибольшее число раундов обмена; оставшиеся конфликты исправляет координатор
+MAX_ROUNDS = 100
+
+
+def hash_partition(vertices: int, parts: int, seed: Optional[int] = None) -> List[int]:
+    """
+    Разбиение мультипликативным хешем номера вершины.
+    """
+    salt = seed or 0
+    return [((u + salt) * 0x9E3779B1 & 0xFFFFFFFF) % parts for u in range(vertices)]
+
+
+def bfs_partition(vertices: int, offsets: Sequence[int], targets: Sequence[int], parts: int) -> List[int]:
+    """
+    Разбиение обходом в ширину на части по ceil(V / parts) вершин.
+
+    Вершины получают номер части в порядке обхода, поэтому каждая часть — это
+    одна или несколько соседних областей графа.
+    """
+    size = -(-vertices // parts)
+    owner = [-1] * vertices
+    visited = bytearray(vertices)
+    part = filled = 0
+    for start in range(vertices):
+        if visited[start]:
+            continue
+        visited[start] = 1
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            owner[u] = part
+            filled += 1
+            if filled == size and part < parts - 1:
+                part, filled = part + 1, 0
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if not visited[v]:
+                    visited[v] = 1
+                    queue.append(v)
+    return owner
+
+
+def cut_size(offsets: Sequence[int], targets: Sequence[int], owner: Sequence[int]) -> int:
+    """
+    Число разрезанных рёбер (каждое ребро записано в CSR в обе стороны).
+    """
+    cut = 0
+    for u in range(len(owner)):
+        part = owner[u]
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if owner[v] != part:
+                cut += 1
+    return cut // 2
+
+
+def partitioned_coloring(
+    vertices: int,
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    parts: int = 4,
+    method: str = "bfs",
+    seed: Optional[int] = None,
+    max_rounds: int = MAX_ROUNDS,
+) -> Tuple[List[int], dict]:
+    """
+    Раскраска частями в отдельных процессах.
+
+    Каждый процесс получает только свою часть: номера своих вершин, их срез CSR
+    и владельцев соседних вершин из других частей.
+
+    Args:
+        vertices (int): Количество вершин.
+        offsets (Sequence[int]): Смещения списков соседей (длина vertices + 1).
+        targets (Sequence[int]): Соседи всех вершин; каждое ребро записано в обе стороны.
+        parts (int, optional): Количество частей и процессов. По умолчанию 4.
+        method (str, optional): "bfs" или "hash". По умолчанию "bfs".
+        seed (int, optional): Соль хеша для разбиения "hash".
+        max_rounds (int, optional): Наибольшее число раундов обмена.
+
+    Returns:
+        tuple: Раскраска и отчёт: число частей, разрезанных рёбер, раундов обмена, перекрасок
+            граничных вершин, исправлений координатора, время разбиения и общее время.
+
+    Raises:
+        ValueError: Если способ разбиения неизвестен или parts < 1.
+        RuntimeError: Если рабочий процесс завершился с ошибкой.
+    """
+    if method not in PARTITION_METHODS:
+        raise ValueError(f"Неизвестный способ разбиения: {method}. Допустимые значения: {', '.join(PARTITION_METHODS)}.")
+    if parts < 1:
+        raise ValueError("Количество частей должно быть положительным.")
+    start = time.perf_counter()
+    parts = max(1, min(parts, vertices))
+    owner = bfs_partition(vertices, offsets, targets, parts) if method == "bfs" else hash_partition(vertices, parts, seed)
+    slices, cut = _split(vertices, offsets, targets, owner, parts)
+    report = {"parts": parts, "cut_edges": cut, "rounds": 0, "recolored": 0, "fixed": 0,
+              "partition_seconds": time.perf_counter() - start}
+    if not vertices:
+        report["seconds"] = time.perf_counter() - start
+        return [], report
+
+    # Каналы только между частями, у которых есть разрезанные рёбра
+    peers: List[Dict[int, Connection]] = [{} for _ in range(parts)]
+    for a in range(parts):
+        for b in set(slices[a][3].values()):
+            if a < b:
+                peers[a][b], peers[b][a] = Pipe()
+    controls = [Pipe() for _ in range(parts)]
+    # При fork процесс наследует все каналы; чужие концы он закрывает сам, иначе обрыв соседа не виден как EOFError
+    connections = [end for pair in controls for end in pair] + [end for links in peers for end in links.values()]
+    processes = []
+    for part in range(parts):
+        own = {id(controls[part][1])} | {id(connection) for connection in peers[part].values()}
+        foreign = [connection for connection in connections if id(connection) not in own]
+        processes.append(
+            Process(target=_run_part, args=(part, *slices[part], peers[part], controls[part][1], foreign), daemon=True)
+        )
+    for process in processes:
+        process.start()
+    # Концы каналов принадлежат рабочим процессам: без копий в координаторе обрыв виден как EOFError
+    for part in range(parts):
+        controls[part][1].close()
+        for connection in peers[part].values():
+            connection.close()
+
+    coloring = [-1] * vertices
+    try:
+        while True:
+            recolored = sum(_receive(control, process) for (control, _), process in zip(controls, processes))
+            report["rounds"] += 1
+            report["recolored"] += recolored
+            proceed = recolored > 0 and report["rounds"] < max_rounds
+            for control, _ in controls:
+                control.send(proceed)
+            if not proceed:
+                break
+        for part, (control, _) in enumerate(controls):
+            for u, color in zip(slices[part][0], _receive(control, processes[part])):
+                coloring[u] = color
+    except EOFError:
+        for process in processes:
+            process.terminate()
+        raise RuntimeError("Рабочий процесс раскраски части завершился с ошибкой.") from None
+    finally:
+        for control, _ in controls:
+            control.close()
+        for process in processes:
+            process.join()
+
+    if recolored:
+        # Обмен остановлен по max_rounds, и перекраски последнего раунда могли дать новые конфликты
+        report["fixed"] = _fix_conflicts(coloring, offsets, targets)
+    report["seconds"] = time.perf_counter() - start
+    return coloring, report
+
+
+def _receive(control: Connection, process: Process) -> object:
+    """
+    Сообщение рабочего процесса; EOFError, если процесс завершился, ничего не отправив.
+    """
+    # Ожидание и канала, и завершения процесса: копия канала в другом процессе не даст увидеть обрыв
+    if control not in wait([control, process.sentinel]) and not control.poll():
+        raise EOFError
+    return control.recv()
+
+
+def _split(vertices: int, offsets: Sequence[int], targets: Sequence[int], owner: Sequence[int], parts: int) -> tuple:
+    """
+    Данные частей за один проход по рёбрам.
+
+    Returns:
+        tuple: Для каждой части — номера её вершин, смещения и соседи её среза CSR,
+            владельцы соседних вершин из других частей; и число разрезанных рёбер.
+    """
+    if parts == 1:
+        return [(range(vertices), offsets, targets, {})], 0
+    slices = [([], array("q", [0]), array("i"), {}) for _ in range(parts)]
+    cut = 0
+    for u in range(vertices):
+        mine, part_offsets, part_targets, ghosts = slices[owner[u]]
+        mine.append(u)
+        row = targets[offsets[u]:offsets[u + 1]]
+        part_targets.extend(row)
+        part_offsets.append(len(part_targets))
+        part = owner[u]
+        for v in row:
+            if owner[v] != part:
+                ghosts[v] = owner[v]
+                cut += 1
+    return slices, cut // 2
+
+
+def _run_part(
+    part: int,
+    mine: Sequence[int],
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    ghost_owner: Dict[int, int],
+    peers: Dict[int, Connection],
+    control: Connection,
+    foreign: Sequence[Connection] = (),
+) -> None:
+    """
+    Рабочий процесс: раскраска своей части и раунды обмена цветами граничных вершин.
+
+    Вершины нумеруются локально: свои — 0..n-1 в порядке mine, соседние из других
+    частей — n и дальше. Каналы foreign, унаследованные от координатора, сразу закрываются.
+    """
+    for connection in foreign:
+        connection.close()
+    count = len(mine)
+    ids = list(mine) + list(ghost_owner)
+    index = {u: i for i, u in enumerate(ids)}
+    # Единственная часть (range) — весь граф, и нумерация уже локальная
+    local = targets if isinstance(mine, range) else array("i", map(index.__getitem__, targets))
+    # Цвета соседних вершин неизвестны до первого обмена; неокрашенные соседи отмечают mark[-1]
+    colors = [-1] * len(ids)
+    mark = [-1] * (len(ids) + 1)
+    for u in range(count):
+        for v in local[offsets[u]:offsets[u + 1]]:
+            mark[colors[v]] = u
+        color = 0
+        while mark[color] == u:
+            color += 1
+        colors[u] = color
+
+    # Граничная вершина -> соседи из других частей; часть -> наши граничные вершины, соседние с ней
+    boundary: Dict[int, List[int]] = {}
+    shared: Dict[int, List[int]] = {peer: [] for peer in peers}
+    for u in range(count):
+        ghosts = [v for v in local[offsets[u]:offsets[u + 1]] if v >= count]
+        if ghosts:
+            boundary[u] = ghosts
+            for peer in {ghost_owner[ids[v]] for v in ghosts}:
+                shared[peer].append(u)
+    # Соседняя вершина -> наши граничные вершины рядом с ней
+    watchers: Dict[int, List[int]] = {}
+    for u, ghosts in boundary.items():
+        for v in ghosts:
+            watchers.setdefault(v, []).append(u)
+
+    outgoing = {peer: {ids[u]: colors[u] for u in members} for peer, members in shared.items()}
+    losers: List[int] = []
+    while True:
+        # Конфликт возможен только у вершин, перекрашенных в прошлом раунде, и у соседей пришедших цветов
+        candidates = set(losers)
+        # Пары частей обмениваются в порядке возрастания номеров, поэтому каналы не блокируют друг друга
+        for peer in sorted(peers):
+            connection = peers[peer]
+            if part < peer:
+                connection.send(outgoing[peer])
+                received = connection.recv()
+            else:
+                received = connection.recv()
+                connection.send(outgoing[peer])
+            for v, color in received.items():
+                v = index[v]
+                colors[v] = color
+                candidates.update(watchers[v])
+
+        losers = [u for u in sorted(candidates) if any(ids[u] > ids[v] and colors[v] == colors[u] for v in boundary[u])]
+        outgoing = {peer: {} for peer in peers}
+        for u in losers:
+            used = {colors[v] for v in local[offsets[u]:offsets[u + 1]] if v != u}
+            color = 0
+            while color in used:
+                color += 1
+            colors[u] = color
+            for peer in {ghost_owner[ids[v]] for v in boundary[u]}:
+                outgoing[peer][ids[u]] = color
+
+        control.send(len(losers))
+        if not control.recv():
+            break
+    control.send(array("i", colors[:count]))
+    control.close()
+
+
+def _fix_conflicts(coloring: List[int], offsets: Sequence[int], targets: Sequence[int]) -> int:
+    """
+    Последовательное исправление конфликтов, оставшихся после max_rounds раундов.
+
+    Returns:
+        int: Число перекрашенных вершин.
+    """
+    fixed = 0
+    for u in range(len(coloring)):
+        neighbors = targets[offsets[u]:offsets[u + 1]]
+        if any(v > u and coloring[v] == coloring[u] for v in neighbors):
+            used = {coloring[v] for v in neighbors if v != u}
+            color = 0
+            while color in used:
+                color += 1
+            coloring[u] = color
+            fixed += 1
+    return fixed
@@ -0,0 +1,452 @@
+"""
+Локальный сервис раскраски графов на asyncio (HTTP на localhost или Unix-сокет).
+
+Цикл событий принимает соединения, разбирает HTTP и проверяет запрос (в том
+числе ограничения MAX_VERTICES и MAX_EDGES), прежде чем поставить его в очередь;
+построение Graph, раскраска и сериализация ответа выполняются в пуле процессов,
+поэтому main.py импортируется один раз на процесс пула, а не в каждом клиенте.
+
+Одинаковые (байт в байт) одновременные запросы объединяются: граф раскрашивается
+один раз, и все ожидающие получают один ответ. Очередь задач ограничена: если она
+заполнена, запрос сразу получает 503 с заголовком Retry-After. Задержки последних
+LATENCY_WINDOW запросов доступны как процентили на GET /stats.
+
+Запрос POST /color: {"vertices": 3, "edges": [[0, 1], [1, 2]], "directed": false,
+"algorithm": "greedy", "order": "natural", "seed": null}; ответ: {"coloring": [...], "colors": k}.
+
+Пример:
+    python3 service.py --port 8765 --workers 4 --queue-size 64
+    curl -d '{"vertices": 3, "edges": [[0, 1], [1, 2]]}' http://127.0.0.1:8765/color
+    curl http://127.0.0.1:8765/stats
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from main import ORDERS, Graph
+
+# Алгоритмы, доступные через сервис; jones_plassmann создаёт собственный пул процессов
+SERVICE_ALGORITHMS = ("greedy", "dsatur", "speculative")
+# Наибольшее число задач, ожидающих свободного процесса
+QUEUE_SIZE = 64
+# Сколько последних задержек хранится для процентилей
+LATENCY_WINDOW = 10000
+# Наибольший размер тела запроса, байты
+MAX_BODY = 64 << 20
+# Наибольшие число вершин и число рёбер графа в запросе
+MAX_VERTICES = 1 << 22
+MAX_EDGES = 1 << 22
+PERCENTILES = (50, 90, 99)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """
+    Очередь задач заполнена.
+    """
+
+
+class PayloadTooLarge(ValueError):
+    """
+    Тело запроса больше MAX_BODY или граф в нём больше MAX_VERTICES / MAX_EDGES.
+    """
+
+
+def color_body(body: bytes) -> bytes:
+    """
+    Раскраска графа из тела запроса (выполняется в процессе пула).
+
+    Args:
+        body (bytes): JSON с полями vertices, edges и необязательными directed, algorithm, order, seed.
+
+    Returns:
+        bytes: JSON-ответ с раскраской и числом цветов.
+
+    Raises:
+        ValueError: Если запрос некорректен.
+    """
+    vertices, edges, directed, algorithm, order, seed = parse_request(body)
+    graph = Graph(vertices)
+    graph.add_edges(edges, directed=directed)
+    coloring = graph.color(algorithm, order, seed)
+    return json.dumps({"coloring": coloring, "colors": max(coloring, default=-1) + 1}).encode()
+
+
+def parse_request(body: bytes) -> tuple:
+    """
+    Разбор и проверка тела запроса POST /color.
+
+    Args:
+        body (bytes): JSON с полями vertices, edges и необязательными directed, algorithm, order, seed.
+
+    Returns:
+        tuple: vertices, edges, directed, algorithm, order, seed.
+
+    Raises:
+        PayloadTooLarge: Если вершин больше MAX_VERTICES или рёбер больше MAX_EDGES.
+        ValueError: Если запрос некорректен.
+    """
+    try:
+        request = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Некорректный JSON: {e}") from None
+    if not isinstance(request, dict):
+        raise ValueError("Ожидается JSON-объект.")
+    vertices = request.get("vertices")
+    edges = request.get("edges", [])
+    directed = request.get("directed", False)
+    algorithm = request.get("algorithm", "greedy")
+    order = request.get("order", "natural")
+    seed = request.get("seed")
+    if not _is_int(vertices) or vertices < 0:
+        raise ValueError("vertices должно быть неотрицательным целым числом.")
+    if vertices > MAX_VERTICES:
+        raise PayloadTooLarge(f"Число вершин превышает допустимое {MAX_VERTICES}.")
+    if isinstance(edges, list) and len(edges) > MAX_EDGES:
+        raise PayloadTooLarge(f"Число рёбер превышает допустимое {MAX_EDGES}.")
+    if not isinstance(edges, list) or not all(
+        isinstance(edge, list) and len(edge) == 2 and _is_int(edge[0]) and _is_int(edge[1]) for edge in edges
+    ):
+        raise ValueError("edges должно быть списком пар целых чисел.")
+    if not isinstance(directed, bool):
+        raise ValueError("directed должно быть true или false.")
+    if algorithm not in SERVICE_ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}. Допустимые значения: {', '.join(SERVICE_ALGORITHMS)}.")
+    if order not in ORDERS:
+        raise ValueError(f"Неизвестный порядок: {order}. Допустимые значения: {', '.join(ORDERS)}.")
+    if seed is not None and not _is_int(seed):
+        raise ValueError("seed должно быть целым числом.")
+    return vertices, edges, directed, algorithm, order, seed
+
+
+def _is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def percentiles(values: Iterable[float]) -> Dict[str, Optional[float]]:
+    """
+    Процентили PERCENTILES (по ближайшему рангу) в миллисекундах.
+
+    Args:
+        values (Iterable[float]): Задержки в секундах.
+
+    Returns:
+        dict: "p50", "p90", "p99" -> задержка в мс или None, если задержек нет.
+    """
+    ordered = sorted(values)
+    result: Dict[str, Optional[float]] = {}
+    for p in PERCENTILES:
+        if ordered:
+            rank = max(0, -(-p * len(ordered) // 100) - 1)
+            result[f"p{p}"] = round(ordered[rank] * 1000, 3)
+        else:
+            result[f"p{p}"] = None
+    return result
+
+
+class ColoringService:
+    """
+    Очередь задач раскраски, объединение одинаковых запросов и HTTP-обработчик.
+
+    Attributes:
+        workers (int): Количество процессов пула и задач, забирающих работу из очереди.
+        queue (asyncio.Queue): Ограниченная очередь пар (тело запроса, future результата).
+        latencies (deque): Задержки последних LATENCY_WINDOW запросов /color в секундах.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: int = QUEUE_SIZE, executor: Optional[Executor] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.executor = executor
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._consumers: List[asyncio.Task] = []
+        self._own_executor = False
+
+    async def color(self, body: bytes) -> bytes:
+        """
+        Раскраска графа из тела запроса через очередь.
+
+        Если такой же запрос уже выполняется, новый ждёт его результата; иначе
+        запрос проверяется (parse_request) до постановки в очередь.
+
+        Args:
+            body (bytes): Тело запроса POST /color.
+
+        Returns:
+            bytes: JSON-ответ.
+
+        Raises:
+            Overloaded: Если очередь заполнена.
+            PayloadTooLarge: Если граф больше MAX_VERTICES / MAX_EDGES.
+            ValueError: Если запрос некорректен.
+        """
+        self.requests += 1
+        key = hashlib.blake2b(body, digest_size=16).digest()
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            parse_request(body)
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((body, future))
+            except asyncio.QueueFull:
+                self.rejected += 1
+                raise Overloaded from None
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Отмена одного клиента не должна отменять общий результат
+        return await asyncio.shield(future)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None) -> asyncio.AbstractServer:
+        """
+        Запуск пула, обработчиков очереди и сервера.
+
+        Args:
+            host (str, optional): Адрес для HTTP. По умолчанию 127.0.0.1.
+            port (int, optional): Порт; 0 — выбрать свободный. По умолчанию 8765.
+            unix (str, optional): Путь к Unix-сокету; если задан, host и port не используются.
+
+        Returns:
+            asyncio.AbstractServer: Запущенный сервер.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+            self._own_executor = True
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        if unix is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def close(self) -> None:
+        """
+        Остановка обработчиков очереди и собственного пула процессов.
+        """
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self._own_executor:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+            self._own_executor = False
+
+    def stats(self) -> dict:
+        """
+        Счётчики сервиса и процентили задержки.
+        """
+        return {
+            "requests": self.requests,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "workers": self.workers,
+            "latency_ms": percentiles(self.latencies),
+        }
+
+    async def _consume(self) -> None:
+        """
+        Передача задач из очереди в пул процессов по одной.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            body, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.executor, color_body, body)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.computed += 1
+                self.queue.task_done()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обработка соединения: последовательные HTTP-запросы с keep-alive.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_message(reader, request=True)
+                except ValueError as e:
+                    status = 413 if isinstance(e, PayloadTooLarge) else 400
+                    await write_response(writer, status, {"error": str(e)}, close=True)
+                    break
+                if request is None:
+                    break
+                start = time.perf_counter()
+                (method, path), headers, body = request
+                status, payload = await self._route(method, path, body)
+                if path == "/color" and status == 200:
+                    self.latencies.append(time.perf_counter() - start)
+                close = headers.get("connection", "").lower() == "close"
+                await write_response(writer, status, payload, close=close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        if method == "POST" and path == "/color":
+            try:
+                return 200, await self.color(body)
+            except Overloaded:
+                return 503, {"error": "Очередь заполнена, повторите запрос позже."}
+            except PayloadTooLarge as e:
+                return 413, {"error": str(e)}
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            except Exception as e:
+                self.errors += 1
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        return 404, {"error": f"Неизвестный запрос: {method} {path}"}
+
+
+async def read_message(reader: asyncio.StreamReader, request: bool) -> Optional[Tuple[tuple, Dict[str, str], bytes]]:
+    """
+    Чтение HTTP-запроса или ответа с телом фиксированной длины (Content-Length).
+
+    Args:
+        reader (asyncio.StreamReader): Поток соединения.
+        request (bool): True — запрос ("METHOD path"), False — ответ ("HTTP/1.1 status").
+
+    Returns:
+        tuple или None: Стартовая строка ((метод, путь) или (статус,)), заголовки (имена в нижнем регистре)
+            и тело; None, если соединение закрыто до начала сообщения.
+
+    Raises:
+        ValueError: Если сообщение некорректно (PayloadTooLarge — если тело больше MAX_BODY).
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise ValueError("Слишком длинные заголовки.") from None
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) < 2:
+        raise ValueError(f"Некорректная стартовая строка: {lines[0]!r}")
+    start = (parts[0], parts[1]) if request else (int(parts[1]),)
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise PayloadTooLarge(f"Тело запроса превышает допустимый размер {MAX_BODY} байт.")
+    body = await reader.readexactly(length) if length else b""
+    return start, headers, body
+
+
+async def write_response(writer: asyncio.StreamWriter, status: int, payload: object, close: bool = False) -> None:
+    """
+    Отправка HTTP-ответа; payload — готовые байты JSON или объект для json.dumps.
+    """
+    body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode()
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Content-Type: application/json",
+            f"Content-Length: {len(body)}"]
+    if status == 503:
+        head.append("Retry-After: 1")
+    if close:
+        head.append("Connection: close")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+
+async def open_connection(
+    host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Соединение с сервисом по TCP или через Unix-сокет.
+    """
+    if unix is not None:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+async def send_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str, body: bytes = b""
+) -> Tuple[int, bytes]:
+    """
+    HTTP-запрос по открытому соединению (keep-alive).
+
+    Returns:
+        tuple: Код ответа и тело.
+    """
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode() + body)
+    await writer.drain()
+    response = await read_message(reader, request=False)
+    if response is None:
+        raise ConnectionError("Сервис закрыл соединение.")
+    return response[0][0], response[2]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Локальный сервис раскраски графов.")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес (по умолчанию 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="порт (по умолчанию 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="слушать Unix-сокет вместо TCP")
+    parser.add_argument("--workers", type=int, help="количество процессов пула (по умолчанию по числу ядер)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help=f"длина очереди (по умолчанию {QUEUE_SIZE})")
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Работа сервиса до SIGINT или SIGTERM; затем останавливаются сервер и пул процессов.
+    """
+    service = ColoringService(args.workers, args.queue_size)
+    server = await service.start(args.host, args.port, args.unix)
+    address = args.unix or "http://%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"Сервис раскраски слушает {address}", file=sys.stderr, flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        await service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    asyncio.run(serve(parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
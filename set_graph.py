@@ -0,0 +1,206 @@
+"""
+Граф, в котором соседи каждой вершины хранятся во множествах: повторяющиеся
+рёбра хранятся один раз, проверка и удаление ребра выполняются за O(1).
+"""
+from typing import Iterable, List, Tuple
+
+from main import _check_edge_array, Graph
+
+
+class SetGraph(Graph):
+    """
+    Изменяемый граф, в котором соседи каждой вершины хранятся во множестве.
+
+    Повторное добавление ребра ничего не меняет, поэтому алгоритмы раскраски
+    не обходят одного соседа несколько раз. Проверка ребра (has_edge), удаление
+    (remove_edge) и добавление выполняются за O(1), степень (degree) — за O(1).
+    Множества занимают больше памяти, чем списки, зато графы с повторяющимися
+    рёбрами становятся компактнее. Все методы раскраски Graph работают без изменений.
+    """
+
+    def __init__(self, vertices: int) -> None:
+        """
+        Инициализация графа.
+
+        Args:
+            vertices (int): Количество вершин в графе.
+        """
+        super().__init__(vertices)
+        self.smezh_list = {v: set() for v in range(vertices)}
+        self.in_smezh_list = {v: set() for v in range(vertices)}
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "SetGraph":
+        """
+        Копия графа без повторяющихся рёбер.
+
+        Args:
+            graph (Graph): Исходный граф (списки смежности или CSR).
+
+        Returns:
+            SetGraph: Граф на множествах.
+        """
+        result = cls(graph.vertices)
+        for u in range(graph.vertices):
+            result.smezh_list[u].update(graph.smezh_list[u])
+            result.in_smezh_list[u].update(graph.in_smezh_list[u])
+        result.directed = graph.directed
+        if graph.directed:
+            result.edges = sum(len(neighbors) for neighbors in result.smezh_list.values())
+        else:
+            # Каждое ребро записано у обоих концов, петля — один раз
+            loops = sum(u in result.smezh_list[u] for u in range(graph.vertices))
+            result.edges = (sum(len(neighbors) for neighbors in result.smezh_list.values()) + loops) // 2
+        return result
+
+    def _grow(self, vertices: int) -> None:
+        for v in range(self.vertices, vertices):
+            self.smezh_list[v] = set()
+            self.in_smezh_list[v] = set()
+        self.vertices = max(self.vertices, vertices)
+        self._invalidate()
+
+    def add_edge(self, u: int, v: int, directed: bool = False) -> None:
+        """
+        Добавление ребра, если его ещё нет.
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+            directed (bool, optional): Если True, добавляется ориентированное ребро. По умолчанию False.
+        """
+        if directed:
+            if u in self.in_smezh_list[v]:
+                return
+            self.in_smezh_list[v].add(u)
+            self.directed = True
+        elif v in self.smezh_list[u] and u in self.smezh_list[v]:
+            return
+        else:
+            self.smezh_list[v].add(u)
+        self.smezh_list[u].add(v)
+        self.edges += 1
+        self._invalidate()
+
+    def add_edges(self, edges: Iterable[Tuple[int, int]], directed: bool = False) -> None:
+        """
+        Пакетное добавление рёбер; уже существующие рёбра пропускаются.
+
+        Args:
+            edges (Iterable[Tuple[int, int]]): Пары (u, v) или целочисленный массив NumPy формы (E, 2).
+            directed (bool, optional): Если True, рёбра ориентированные. По умолчанию False.
+
+        Raises:
+            ValueError: Если индекс вершины вне диапазона [0, vertices - 1] или массив имеет неверную форму.
+        """
+        super().add_edges(edges, directed)
+
+    def _add_edges_list(self, flat: List[int], directed: bool) -> None:
+        """
+        Пакетное добавление рёбер без NumPy.
+        """
+        if not flat:
+            return
+        if min(flat) < 0 or max(flat) >= self.vertices:
+            raise ValueError("Индексы вершин должны быть в пределах [0, количество вершин - 1].")
+
+        smezh_list = self.smezh_list
+        pairs = iter(flat)
+        added = 0
+        if directed:
+            in_smezh_list = self.in_smezh_list
+            for u, v in zip(pairs, pairs):
+                sources = in_smezh_list[v]
+                if u not in sources:
+                    sources.add(u)
+                    smezh_list[u].add(v)
+                    added += 1
+            self.directed = True
+        else:
+            for u, v in zip(pairs, pairs):
+                neighbors = smezh_list[u]
+                if v not in neighbors or u not in smezh_list[v]:
+                    neighbors.add(v)
+                    smezh_list[v].add(u)
+                    added += 1
+        self.edges += added
+
+    def _add_edges_array(self, edges, directed: bool) -> None:
+        """
+        Пакетное добавление рёбер из массива NumPy формы (E, 2).
+
+        Повторы внутри пакета убираются через np.unique, после чего множество
+        каждой вершины дополняется одним вызовом update. Число новых рёбер
+        определяется по росту множеств затронутых вершин: ребро даёт две записи, петля — одну.
+        """
+        import numpy as np
+
+        edges = _check_edge_array(edges, self.vertices).astype(np.int64, copy=False)
+        if len(edges) == 0:
+            return
+        if not directed:
+            edges = np.sort(edges, axis=1)
+        keys = np.unique(edges[:, 0] * self.vertices + edges[:, 1])
+        sources, targets = keys // self.vertices, keys % self.vertices
+
+        if directed:
+            _update_grouped(self.smezh_list, sources, targets)
+            self.edges += _update_grouped(self.in_smezh_list, targets, sources)
+            self.directed = True
+        else:
+            # Новая петля добавляет одну запись, а считается как ребро из двух
+            new_loops = sum(u not in self.smezh_list[u] for u in sources[sources == targets].tolist())
+            added = _update_grouped(self.smezh_list, sources, targets) + _update_grouped(self.smezh_list, targets, sources)
+            self.edges += (added + new_loops) // 2
+
+    def remove_edge(self, u: int, v: int, directed: bool = False) -> None:
+        """
+        Удаление ребра.
+
+        Args:
+            u (int): Первая вершина.
+            v (int): Вторая вершина.
+            directed (bool, optional): Если True, удаляется ориентированное ребро u -> v. По умолчанию False.
+
+        Raises:
+            ValueError: Если такого ребра нет в графе.
+        """
+        # Обе записи ребра проверяются до изменения, чтобы списки смежности не разошлись
+        reverse = self.in_smezh_list[v] if directed else self.smezh_list[v]
+        if v not in self.smezh_list[u] or u not in reverse:
+            raise ValueError(f"Ребро ({u}, {v}) отсутствует в графе.")
+        self.smezh_list[u].discard(v)
+        if directed:
+            self.in_smezh_list[v].discard(u)
+        else:
+            self.smezh_list[v].discard(u)
+        self.edges -= 1
+        self._invalidate()
+
+
+def _update_grouped(adjacency: dict, keys, values) -> int:
+    """
+    Дополнение множеств смежности значениями, сгруппированными по ключам.
+
+    Args:
+        adjacency (dict): Множества соседей, которые нужно дополнить.
+        keys: Массив NumPy вершин, к множествам которых добавляются соседи.
+        values: Массив NumPy соседей той же длины.
+
+    Returns:
+        int: Сколько значений оказались новыми для своих множеств.
+    """
+    import numpy as np
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    values = values[order].tolist()
+    starts = np.flatnonzero(np.diff(keys)) + 1
+    bounds = [0] + starts.tolist() + [len(values)]
+    added = 0
+    for key, start, end in zip(keys[bounds[:-1]].tolist(), bounds[:-1], bounds[1:]):
+        neighbors = adjacency[key]
+        size = len(neighbors)
+        neighbors.update(values[start:end])
+        added += len(neighbors) - size
+    return added
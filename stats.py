@@ -0,0 +1,113 @@
+"""
+Статистика и профилирование раскраски.
+
+ColoringStats собирает счётчики и времена фаз одного запуска раскраски, когда
+она включена через graph.stats; profile_call выполняет разовый запуск под
+cProfile и tracemalloc.
+"""
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class ColoringStats:
+    """
+    Счётчики и времена фаз последнего запуска раскраски.
+
+    Включается присваиванием graph.stats = ColoringStats(); пока graph.stats равно None,
+    методы раскраски ничего не считают. Проверки цветов и записи кучи считаются
+    в цикле раскраски, а обходы соседей — по длинам списков смежности после него.
+    """
+
+    def __init__(self, callback: Optional[Callable[["ColoringStats"], None]] = None) -> None:
+        """
+        Инициализация статистики.
+
+        Args:
+            callback (callable, optional): Вызывается с этим объектом после каждого запуска раскраски.
+        """
+        self.callback = callback
+        self.start(None)
+
+    def start(self, method: Optional[str]) -> None:
+        """
+        Сброс счётчиков перед новым запуском.
+        """
+        # Название метода раскраски
+        self.method = method
+        # Просмотрено соседей по исходящим (или неориентированным) рёбрам
+        self.neighbors_visited = 0
+        # Просмотрено соседей по входящим рёбрам
+        self.in_neighbors_visited = 0
+        # Проверок цвета при поиске наименьшего свободного
+        self.color_probes = 0
+        # Записей, добавленных в кучу DSatur, и устаревших записей, извлечённых из неё
+        self.heap_pushes = 0
+        self.stale_pops = 0
+        # Время фаз в секундах
+        self.phases: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def phase(self, name: str) -> None:
+        """
+        Завершение фазы name: её время отсчитывается от конца предыдущей фазы.
+        """
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    def finish(self) -> None:
+        if self.callback is not None:
+            self.callback(self)
+
+    def as_dict(self) -> dict:
+        """
+        Статистика в виде словаря.
+        """
+        return {
+            "method": self.method,
+            "neighbors_visited": self.neighbors_visited,
+            "in_neighbors_visited": self.in_neighbors_visited,
+            "color_probes": self.color_probes,
+            "heap_pushes": self.heap_pushes,
+            "stale_pops": self.stale_pops,
+            "phases": dict(self.phases),
+        }
+
+
+def profile_call(action: Callable[[], object], limit: int = 20) -> Tuple[object, str]:
+    """
+    Разовый запуск под cProfile и tracemalloc.
+
+    Args:
+        action (callable): Действие без аргументов, например lambda: g.greedy_coloring().
+        limit (int, optional): Сколько строк выводить в отчётах. По умолчанию 20.
+
+    Returns:
+        tuple: Результат действия и текстовый отчёт (горячие функции, пик памяти, места выделений).
+
+    Example:
+        >>> coloring, report = profile_call(lambda: g.greedy_coloring())
+        >>> print(report)
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        profiler.enable()
+        result = action()
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+    report.write(f"Память: текущая {current} байт, пик {peak} байт\n")
+    for statistic in snapshot.statistics("lineno")[:limit]:
+        report.write(f"{statistic}\n")
+    return result, report.getvalue()
@@ -0,0 +1,174 @@
+"""
+Полупотоковая раскраска графа, рёбра которого читаются потоком несколько раз.
+
+Списки смежности не строятся: в памяти находятся только массивы длины V
+(степени, цвета, пометки) и буфер не больше buffer_edges записей рёбер.
+
+1. Первый проход считает степени.
+2. Каждая вершина получает случайный цвет из [0, min(palette, степень + 1)).
+3. Каждый следующий проход находит конфликтующие рёбра (концы одного цвета)
+   и помечает конец с меньшей степенью. Одновременно в буфер собираются рёбра
+   вершин, помеченных на прошлом проходе (сколько помещается в буфер);
+   после прохода они перекрашиваются первым подходящим цветом с учётом всех
+   своих соседей.
+4. Если проходы закончились, а конфликты остались, оставшиеся помеченные
+   вершины получают новые, ни с чем не совпадающие цвета.
+
+Раскраска всегда корректна. Меньшая палитра даёт меньше цветов, но больше
+конфликтов, которые нужно исправлять буфером и проходами; при нехватке проходов
+цветов становится больше.
+"""
+import random
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from local_search import compact_colors
+
+# Источник рёбер: при каждом вызове заново возвращает блоки вершин рёбер u0, v0, u1, v1, ...
+EdgeSource = Callable[[], Iterable[Sequence[int]]]
+
+
+def file_source(path: str, chunk_size: int = 1 << 20) -> EdgeSource:
+    """
+    Источник рёбер из текстового файла списка рёбер (см. main.read_edge_chunks).
+
+    Args:
+        path (str): Путь к файлу.
+        chunk_size (int, optional): Размер читаемого блока в байтах. По умолчанию 1 МиБ.
+
+    Returns:
+        callable: Функция, которая при каждом вызове заново читает файл блоками.
+    """
+    from main import read_edge_chunks
+
+    def read() -> Iterator[List[int]]:
+        with open(path, "rb") as file:
+            yield from read_edge_chunks(file, chunk_size)
+
+    return read
+
+
+def stream_coloring(
+    source: EdgeSource,
+    vertices: Optional[int] = None,
+    passes: int = 4,
+    buffer_edges: int = 1 << 20,
+    palette: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Tuple[List[int], dict]:
+    """
+    Раскраска графа по потоку рёбер с памятью O(V + buffer_edges).
+
+    Направление рёбер не учитывается, петли пропускаются.
+
+    Args:
+        source (EdgeSource): Источник рёбер, который можно прочитать несколько раз.
+        vertices (int, optional): Количество вершин. По умолчанию наибольший индекс + 1.
+        passes (int, optional): Наибольшее число проходов поиска и исправления конфликтов
+            (не считая прохода подсчёта степеней). По умолчанию 4.
+        buffer_edges (int, optional): Сколько записей рёбер помещается в буфер. По умолчанию 2^20.
+        palette (int, optional): Размер начальной палитры. По умолчанию степень вершины + 1.
+        seed (int, optional): Зерно генератора начальных цветов.
+
+    Returns:
+        tuple: Раскраска (цвета 0..k-1) и отчёт: число прочитанных проходов, число помеченных вершин
+            после каждого прохода, наибольшее заполнение буфера, число вершин с новыми цветами, число цветов.
+
+    Raises:
+        ValueError: Если индекс вершины отрицателен или не меньше vertices, или passes < 1.
+
+    Example:
+        >>> coloring, report = stream_coloring(lambda: [[0, 1, 1, 2, 2, 0]], palette=1, seed=0)
+        >>> coloring, report["colors"]
+        ([0, 1, 2], 3)
+    """
+    if passes < 1:
+        raise ValueError("Нужен хотя бы один проход поиска конфликтов.")
+
+    degrees = _count_degrees(source, vertices)
+    count = len(degrees)
+    rng = random.Random(seed)
+    colors = array("i", (rng.randrange(min(palette or degree + 1, degree + 1)) for degree in degrees))
+
+    pending = bytearray(count)
+    selected = bytearray(count)
+    report = {"passes": 1, "pending": [], "buffered": 0, "fresh": 0, "colors": 0}
+    chosen: List[int] = []
+    for _ in range(passes):
+        neighbors = {u: [] for u in chosen}
+        for flat in source():
+            pairs = iter(flat)
+            for u, v in zip(pairs, pairs):
+                if u == v:
+                    continue
+                if selected[u] or selected[v]:
+                    # Цвета выбранных вершин ещё изменятся: ребро только запоминается
+                    if selected[u]:
+                        neighbors[u].append(v)
+                    if selected[v]:
+                        neighbors[v].append(u)
+                elif colors[u] == colors[v]:
+                    pending[u if (degrees[u], -u) < (degrees[v], -v) else v] = 1
+        report["passes"] += 1
+        report["buffered"] = max(report["buffered"], sum(map(len, neighbors.values())))
+
+        for u in chosen:
+            used = {colors[w] for w in neighbors[u]}
+            color = 0
+            while color in used:
+                color += 1
+            colors[u] = color
+            selected[u] = 0
+
+        # Помеченные вершины с наименьшими степенями, рёбра которых поместятся в буфер
+        marked = [u for u in range(count) if pending[u]]
+        report["pending"].append(len(marked))
+        if not marked:
+            break
+        marked.sort(key=degrees.__getitem__)
+        chosen = []
+        budget = buffer_edges
+        for u in marked:
+            if degrees[u] > budget:
+                break
+            budget -= degrees[u]
+            chosen.append(u)
+            selected[u] = 1
+            pending[u] = 0
+        if not chosen:
+            # Ни одна вершина не помещается в буфер: исправлять конфликты больше нечем
+            break
+
+    if marked:
+        # Помеченные на последнем проходе вершины (в том числе выбранные, но не перекрашенные)
+        # получают новые цвета: они больше всех существующих и различны, поэтому конфликтов не остаётся
+        fresh = max(colors) + 1
+        for u in marked:
+            colors[u] = fresh
+            fresh += 1
+        report["fresh"] = len(marked)
+
+    coloring = compact_colors(colors)
+    report["colors"] = max(coloring, default=-1) + 1
+    return coloring, report
+
+
+def _count_degrees(source: EdgeSource, vertices: Optional[int]) -> array:
+    """
+    Проход подсчёта степеней (без петель); число вершин определяется, если не задано.
+    """
+    degrees = array("q", bytes(8 * (vertices or 0)))
+    for flat in source():
+        if not flat:
+            continue
+        low, high = min(flat), max(flat)
+        if low < 0 or (vertices is not None and high >= vertices):
+            raise ValueError("Индексы вершин должны быть в пределах [0, количество вершин - 1].")
+        if high >= len(degrees):
+            degrees.extend(array("q", bytes(8 * (high + 1 - len(degrees)))))
+        pairs = iter(flat)
+        for u, v in zip(pairs, pairs):
+            if u != v:
+                degrees[u] += 1
+                degrees[v] += 1
+    return degrees
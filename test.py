@@ -1,5 +1,28 @@
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
-from main import Graph
+import local_search
+from cache import ColoringCache
+from csr import CSRGraph
+from dynamic import DynamicColoring
+from main import Graph, load_edge_list
+from set_graph import SetGraph
+from stats import ColoringStats, profile_call
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
 
 
 class TestGraph(unittest.TestCase):
@@ -65,6 +88,887 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(result[:2], [0, 1])
         self.assertEqual(result[2:4], [0, 1])
 
+    def test_directed_in_edges_index(self):
+        """
+        Индекс входящих рёбер
+
+        Тест для ориентированного графа, где у вершины есть только входящие рёбра.
+        Проверяет, что входящие соседи учитываются при выборе цвета.
+        """
+        g = Graph(4)
+        g.add_edge(1, 0, directed=True)
+        g.add_edge(2, 0, directed=True)
+        g.add_edge(3, 1, directed=True)
+        g.add_edge(3, 2, directed=True)
+        self.assertEqual(g.in_smezh_list, {0: [1, 2], 1: [3], 2: [3], 3: []})
+        result = g.greedy_coloring_directed()
+        self.assertEqual(result, [0, 1, 1, 0])
+
+    def test_frozen_graph_coloring(self):
+        """
+        Компактное представление CSR
+
+        Тест для графа, преобразованного в CSR.
+        Проверяет, что раскраска совпадает с раскраской исходного графа.
+        """
+        g = Graph(5)
+        g.add_edge(0, 1)
+        g.add_edge(1, 2)
+        g.add_edge(2, 3)
+        g.add_edge(3, 4)
+        g.add_edge(4, 0)
+        g.add_edge(1, 4)
+        frozen = g.freeze()
+        self.assertEqual(list(frozen.smezh_list[1]), g.smezh_list[1])
+        self.assertEqual(frozen.greedy_coloring(), g.greedy_coloring())
+        with self.assertRaises(TypeError):
+            frozen.add_edge(0, 2)
+
+    def test_frozen_directed_graph_coloring(self):
+        """
+        Компактное представление CSR для ориентированного графа
+
+        Тест для ориентированного графа, преобразованного в CSR.
+        Проверяет входящие рёбра и совпадение раскраски.
+        """
+        g = Graph(4)
+        g.add_edge(1, 0, directed=True)
+        g.add_edge(2, 0, directed=True)
+        g.add_edge(3, 1, directed=True)
+        g.add_edge(3, 2, directed=True)
+        frozen = g.freeze()
+        self.assertEqual(list(frozen.in_smezh_list[0]), [1, 2])
+        self.assertEqual(frozen.greedy_coloring_directed(), g.greedy_coloring_directed())
+        self.assertLess(frozen.bytes_per_edge(), g.bytes_per_edge())
+
+    def test_add_edges_matches_add_edge(self):
+        """
+        Пакетное добавление рёбер
+
+        Тест для add_edges со списком пар.
+        Проверяет, что списки смежности совпадают с поштучным добавлением.
+        """
+        edges = [(0, 1), (1, 2), (2, 0), (3, 3), (1, 3)]
+        for directed in (False, True):
+            single = Graph(4)
+            for u, v in edges:
+                single.add_edge(u, v, directed=directed)
+            bulk = Graph(4)
+            bulk.add_edges(iter(edges), directed=directed)
+            self.assertEqual(bulk.smezh_list, single.smezh_list)
+            self.assertEqual(bulk.in_smezh_list, single.in_smezh_list)
+            self.assertEqual(bulk.directed, single.directed)
+            self.assertEqual(bulk.edges, single.edges)
+        with self.assertRaises(ValueError):
+            Graph(2).add_edges([(0, 2)])
+
+    @unittest.skipIf(np is None, "NumPy не установлен")
+    def test_add_edges_numpy_array(self):
+        """
+        Пакетное добавление рёбер из массива NumPy
+
+        Тест для add_edges с массивом формы (E, 2).
+        Проверяет порядок соседей и проверку границ.
+        """
+        edges = [(0, 1), (1, 2), (2, 0), (3, 3), (1, 3)]
+        for directed in (False, True):
+            single = Graph(4)
+            for u, v in edges:
+                single.add_edge(u, v, directed=directed)
+            bulk = Graph(4)
+            bulk.add_edges(np.array(edges, dtype=np.int32), directed=directed)
+            self.assertEqual(bulk.smezh_list, single.smezh_list)
+            self.assertEqual(bulk.in_smezh_list, single.in_smezh_list)
+        with self.assertRaises(ValueError):
+            Graph(2).add_edges(np.array([[0, -1]]))
+        with self.assertRaises(ValueError):
+            Graph(2).add_edges(np.array([0, 1]))
+
+    def test_import_is_lightweight(self):
+        """
+        Лёгкий импорт модуля
+
+        Тест для импорта main в отдельном процессе.
+        Проверяет, что matplotlib и networkx не загружаются без визуализации.
+        """
+        code = "import sys, main; print(sorted(m for m in ('matplotlib', 'networkx', 'numpy') if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_vertex_orders(self):
+        """
+        Стратегии упорядочивания вершин
+
+        Тест для порядков largest_first, smallest_last и random.
+        Проверяет корректность порядка и раскраски для каждой стратегии.
+        """
+        g = Graph(6)
+        g.add_edges([(0, 1), (0, 2), (0, 3), (1, 2), (2, 3), (4, 5)])
+        self.assertEqual(g.vertex_order("largest_first"), [0, 2, 1, 3, 4, 5])
+        self.assertEqual(sorted(g.vertex_order("smallest_last")), list(range(6)))
+        self.assertEqual(g.vertex_order("random", seed=1), g.vertex_order("random", seed=1))
+        for order in ("natural", "largest_first", "smallest_last", "random"):
+            result = g.greedy_coloring(order, seed=3)
+            for u in g.smezh_list:
+                for v in g.smezh_list[u]:
+                    self.assertNotEqual(result[u], result[v])
+        with self.assertRaises(ValueError):
+            g.greedy_coloring("unknown")
+
+    def test_degeneracy_bound(self):
+        """
+        Вырожденность графа
+
+        Тест для вырожденности полного графа и дерева.
+        Проверяет, что порядок smallest_last не превышает оценку degeneracy + 1.
+        """
+        complete = Graph(5)
+        complete.add_edges([(u, v) for u in range(5) for v in range(u + 1, 5)])
+        self.assertEqual(complete.degeneracy(), 4)
+
+        tree = Graph(7)
+        tree.add_edges([(0, 1), (0, 2), (1, 3), (1, 4), (2, 5), (2, 6)])
+        self.assertEqual(tree.degeneracy(), 1)
+        self.assertEqual(max(tree.greedy_coloring("smallest_last")) + 1, 2)
+
+        directed = Graph(3)
+        directed.add_edges([(0, 1), (1, 2), (2, 0)], directed=True)
+        self.assertEqual(directed.degeneracy(directed=True), 2)
+        self.assertEqual(sorted(directed.greedy_coloring_directed("smallest_last")), [0, 1, 2])
+
+        # Входящие рёбра звезды: без симметричной окрестности степень центра уходила в минус
+        star = Graph(6)
+        star.add_edges([(1, 0), (2, 0), (3, 0), (4, 0), (0, 5)], directed=True)
+        order = star.vertex_order("smallest_last")
+        self.assertEqual(sorted(order), list(range(6)))
+        # Центр удаляется не раньше, чем у него останется один сосед
+        self.assertLess(order.index(0), 2)
+        self.assertEqual(star.degeneracy(), 1)
+
+    def test_dsatur_crown_graph(self):
+        """
+        DSatur на графе-короне
+
+        Тест для двудольного графа K(n,n) без совершенного паросочетания.
+        Проверяет, что DSatur использует 2 цвета там, где жадный алгоритм использует n.
+        """
+        n = 5
+        g = Graph(2 * n)
+        g.add_edges([(2 * i, 2 * j + 1) for i in range(n) for j in range(n) if i != j])
+        self.assertEqual(max(g.greedy_coloring()) + 1, n)
+        result = g.dsatur_coloring()
+        self.assertEqual(max(result) + 1, 2)
+        self.assertEqual(g.color("dsatur"), result)
+
+    def test_dsatur_directed(self):
+        """
+        DSatur для ориентированного графа
+
+        Тест для ориентированного цикла нечётной длины.
+        Проверяет, что входящие рёбра учитываются при раскраске.
+        """
+        g = Graph(5)
+        g.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)], directed=True)
+        result = g.dsatur_coloring_directed()
+        for u in range(5):
+            self.assertNotEqual(result[u], result[(u + 1) % 5])
+        self.assertEqual(max(result) + 1, 3)
+        with self.assertRaises(ValueError):
+            g.color("unknown")
+
+    def test_complete_graph_coloring(self):
+        """
+        Полный граф
+
+        Тест для полного графа, где каждой вершине нужен свой цвет.
+        Проверяет поиск свободного цвета при большом числе занятых цветов.
+        """
+        n = 30
+        for directed in (False, True):
+            g = Graph(n)
+            g.add_edges([(u, v) for u in range(n) for v in range(u + 1, n)], directed=directed)
+            self.assertEqual(g.greedy_coloring_directed(), list(range(n)))
+            self.assertEqual(sorted(g.greedy_coloring_directed("random", seed=1)), list(range(n)))
+
+    def test_parallel_coloring(self):
+        """
+        Параллельная раскраска Джонса–Плассмана
+
+        Тест для раскраски на пуле процессов.
+        Проверяет корректность и независимость результата от числа процессов.
+        """
+        edges = [(u, (u * 7 + 3) % 40) for u in range(40)] + [(u, u + 1) for u in range(39)]
+        for directed in (False, True):
+            g = Graph(40)
+            g.add_edges(edges, directed=directed)
+            sequential = g.parallel_coloring(workers=1, seed=5)
+            self.assertTrue(g.is_proper_coloring(sequential))
+            self.assertEqual(g.parallel_coloring(workers=2, seed=5), sequential)
+        self.assertFalse(g.is_proper_coloring([0] * 40))
+
+    @unittest.skipIf(np is None, "NumPy не установлен")
+    def test_speculative_coloring(self):
+        """
+        Спекулятивная раскраска на NumPy
+
+        Тест для пакетной раскраски с исправлением конфликтов.
+        Проверяет корректность и совпадение с жадным алгоритмом при блоке из одной вершины.
+        """
+        edges = [(u, (u * 7 + 3) % 40) for u in range(40)] + [(u, u + 1) for u in range(39)]
+        for directed in (False, True):
+            g = Graph(40)
+            g.add_edges(edges, directed=directed)
+            for block_size in (1, 5, 40):
+                self.assertTrue(g.is_proper_coloring(g.speculative_coloring(block_size)))
+            self.assertEqual(g.speculative_coloring(block_size=1), g.greedy_coloring_directed())
+
+    def test_remove_edge(self):
+        """
+        Удаление ребра
+
+        Тест для remove_edge в неориентированном и ориентированном графе.
+        Проверяет списки смежности и ошибку при удалении отсутствующего ребра.
+        """
+        g = Graph(3)
+        g.add_edges([(0, 1), (1, 2)])
+        g.add_edge(2, 0, directed=True)
+        g.remove_edge(0, 1)
+        g.remove_edge(2, 0, directed=True)
+        self.assertEqual(g.smezh_list, {0: [], 1: [2], 2: [1]})
+        self.assertEqual(g.in_smezh_list, {0: [], 1: [], 2: []})
+        self.assertEqual(g.edges, 1)
+        with self.assertRaises(ValueError):
+            g.remove_edge(0, 1)
+
+        # Неориентированное удаление ориентированного ребра не должно менять списки смежности
+        for graph in (Graph(2), SetGraph(2)):
+            graph.add_edge(0, 1, directed=True)
+            with self.assertRaises(ValueError):
+                graph.remove_edge(0, 1)
+            self.assertEqual((list(graph.smezh_list[0]), list(graph.in_smezh_list[1])), ([1], [0]))
+            self.assertEqual(graph.edges, 1)
+
+    def test_dynamic_coloring(self):
+        """
+        Динамическая раскраска
+
+        Тест для поддержки раскраски при случайных вставках и удалениях рёбер.
+        Проверяет корректность раскраски после каждого изменения и уплотнение цветов.
+        """
+        rng = random.Random(10)
+        g = Graph(30)
+        dynamic = DynamicColoring(g, compact_every=25)
+        edges = []
+        for _ in range(300):
+            if edges and rng.random() < 0.3:
+                u, v = edges.pop(rng.randrange(len(edges)))
+                dynamic.remove_edge(u, v)
+            else:
+                u, v = rng.randrange(30), rng.randrange(30)
+                dynamic.add_edge(u, v)
+                edges.append((u, v))
+            self.assertTrue(g.is_proper_coloring(dynamic.coloring))
+        before = dynamic.num_colors()
+        self.assertLessEqual(dynamic.compact(), before)
+        self.assertTrue(g.is_proper_coloring(dynamic.coloring))
+
+    def test_connected_components(self):
+        """
+        Компоненты связности
+
+        Тест для несвязного графа, как в test_disconnected_graph.
+        Проверяет номера компонент и совпадение покомпонентной раскраски с обычной.
+        """
+        g = Graph(6)
+        g.add_edge(0, 1)
+        g.add_edge(2, 3)
+        g.add_edge(3, 5)
+        self.assertEqual(g.connected_components(), [0, 0, 1, 1, 2, 1])
+        self.assertEqual(g.component_coloring(workers=1), g.greedy_coloring())
+        self.assertEqual(g.component_coloring(workers=2, batch_size=2), g.greedy_coloring())
+        # Крупная компонента {2, 3, 5} раскрашивается на пуле, мелкие — в текущем процессе
+        self.assertEqual(g.component_coloring(workers=2, batch_size=3), g.greedy_coloring())
+        for algorithm in ("dsatur", "jones_plassmann"):
+            self.assertTrue(g.is_proper_coloring(g.component_coloring(algorithm, seed=1, workers=2, batch_size=3)))
+
+        directed = Graph(6)
+        directed.add_edges([(1, 0), (2, 3), (5, 3)], directed=True)
+        self.assertEqual(directed.connected_components(), [0, 0, 1, 1, 2, 1])
+        self.assertEqual(directed.component_coloring(workers=2, batch_size=1), directed.greedy_coloring_directed())
+
+    def test_coloring_stats(self):
+        """
+        Статистика раскраски
+
+        Тест для счётчиков жадного алгоритма и DSatur.
+        Проверяет число просмотренных соседей, проверок цвета и вызов callback.
+        """
+        g = Graph(5)
+        g.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (1, 4)])
+        reports = []
+        g.stats = ColoringStats(callback=lambda stats: reports.append(stats.as_dict()))
+        result = g.greedy_coloring()
+        self.assertEqual(result, [0, 1, 0, 1, 2])
+        self.assertEqual(reports[-1]["neighbors_visited"], 12)
+        self.assertEqual(reports[-1]["color_probes"], sum(result) + 5)
+        self.assertEqual(set(reports[-1]["phases"]), {"ordering", "coloring"})
+
+        coloring = g.dsatur_coloring()
+        self.assertEqual(reports[-1]["method"], "dsatur")
+        self.assertEqual(reports[-1]["color_probes"], sum(coloring) + 5)
+        self.assertEqual(reports[-1]["heap_pushes"], 5 + reports[-1]["stale_pops"])
+
+        coloring, report = profile_call(lambda: g.greedy_coloring(), limit=5)
+        self.assertEqual(coloring, result)
+        self.assertIn("greedy_coloring", report)
+
+    def test_save_and_load_binary(self):
+        """
+        Двоичный формат графа
+
+        Тест для сохранения графа и загрузки через mmap.
+        Проверяет списки смежности, входящие рёбра и раскраску загруженного графа.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for directed in (False, True):
+                g = Graph(6)
+                g.add_edges([(0, 1), (1, 2), (2, 0), (3, 4), (5, 5)], directed=directed)
+                path = os.path.join(directory, "graph.bin")
+                g.save(path)
+                loaded = CSRGraph.load(path)
+                self.assertEqual(loaded.directed, directed)
+                self.assertEqual(loaded.edges, 5)
+                self.assertEqual({u: list(loaded.smezh_list[u]) for u in loaded.smezh_list}, g.smezh_list)
+                self.assertEqual(list(loaded.in_smezh_list[0]), g.in_smezh_list[0])
+                self.assertEqual(loaded.color(), g.color())
+                del loaded
+
+            with open(path, "wb") as file:
+                file.write(b"not a graph file")
+            with self.assertRaises(ValueError):
+                CSRGraph.load(path)
+
+    def test_load_edge_list_chunks(self):
+        """
+        Чтение списка рёбер блоками
+
+        Тест для разбора списка рёбер с комментариями, пустыми строками и строкой без перевода строки.
+        Проверяет, что результат не зависит от размера блока.
+        """
+        data = b"# comment\n0 1\n1 2\n\n2 0\n  3 4  \n4 5"
+        expected = Graph(6)
+        expected.add_edges([(0, 1), (1, 2), (2, 0), (3, 4), (4, 5)])
+        for chunk_size in (1, 3, 16, 1 << 20):
+            g = load_edge_list(io.BytesIO(data), chunk_size=chunk_size)
+            self.assertEqual(g.smezh_list, expected.smezh_list)
+
+        g = load_edge_list(io.BytesIO(b"0 1\n"), vertices=4, directed=True)
+        self.assertEqual(g.vertices, 4)
+        self.assertEqual(g.in_smezh_list[1], [0])
+        with self.assertRaises(ValueError):
+            load_edge_list(io.BytesIO(b"0 1 2\n"))
+        # Общее число полей чётное, но в строках три и одно поле
+        for data in (b"0 1 2\n3\n", b"3\n0 1 2\n", b"0 1\n2 3 4\n5\n"):
+            with self.assertRaises(ValueError):
+                load_edge_list(io.BytesIO(data))
+        # Без числа вершин граф расширяется по мере чтения блоков
+        g = load_edge_list(io.BytesIO(b"0 1\n7 7\n2 5\n0 1\n"), chunk_size=4, dedupe=True)
+        self.assertEqual((g.vertices, g.edges, g.smezh_list[7], g.smezh_list[0]), (8, 3, {7}, {1}))
+        with self.assertRaises(ValueError):
+            load_edge_list(io.BytesIO(b"0 7\n"), vertices=3)
+
+    def test_batch_cli(self):
+        """
+        Пакетный режим командной строки
+
+        Тест для запуска main.py с файлом рёбер, stdin и двоичным графом.
+        Проверяет форматы вывода text, json и binary без вопросов пользователю.
+        """
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        with tempfile.TemporaryDirectory() as directory:
+            edges_path = os.path.join(directory, "edges.txt")
+            with open(edges_path, "w") as file:
+                file.write("0 1\n1 2\n2 0\n")
+            command = [sys.executable, script, "--no-visualize", "--input"]
+
+            output = subprocess.run(command + [edges_path], capture_output=True, check=True).stdout
+            self.assertEqual(output.decode().split("\n"), ["0 0", "1 1", "2 2", ""])
+
+            output = subprocess.run(
+                command + ["-", "--vertices", "4", "--format", "json"],
+                input=b"0 1\n", capture_output=True, check=True,
+            ).stdout
+            self.assertEqual(json.loads(output), {"vertices": 4, "colors": 2, "coloring": [0, 1, 0, 0]})
+
+            binary_path = os.path.join(directory, "graph.bin")
+            output_path = os.path.join(directory, "colors.bin")
+            g = Graph(3)
+            g.add_edges([(0, 1), (1, 2), (2, 0)])
+            g.save(binary_path)
+            subprocess.run(command + [binary_path, "--format", "binary", "--output", output_path], check=True)
+            with open(output_path, "rb") as file:
+                self.assertEqual(file.read(), bytes([0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0]))
+
+            result = subprocess.run(command + ["-"], input=b"0 x\n", capture_output=True)
+            self.assertEqual(result.returncode, 1)
+
+    def test_fingerprint(self):
+        """
+        Отпечаток графа
+
+        Тест для отпечатка структуры графа.
+        Проверяет независимость от порядка рёбер и чувствительность к рёбрам и ориентированности.
+        """
+        g1 = Graph(4)
+        g1.add_edges([(0, 1), (1, 2), (2, 3)])
+        g2 = Graph(4)
+        g2.add_edges([(3, 2), (2, 1), (1, 0)])
+        self.assertEqual(g1.fingerprint(), g2.fingerprint())
+        self.assertEqual(g1.fingerprint(), g1.freeze().fingerprint())
+
+        g2.add_edge(0, 3)
+        self.assertNotEqual(g1.fingerprint(), g2.fingerprint())
+        directed = Graph(4)
+        directed.add_edges([(0, 1), (1, 2), (2, 3)], directed=True)
+        self.assertNotEqual(g1.fingerprint(), directed.fingerprint())
+
+    @unittest.skipIf(matplotlib is None or np is None, "matplotlib или NumPy не установлены")
+    def test_visualize_to_file(self):
+        """
+        Визуализация в файл
+
+        Тест для сохранения рисунка без дисплея, кеша раскладок, выборки и агрегирования по цветам.
+        Проверяет, что файлы PNG и SVG созданы, а повторная раскладка берётся из кеша.
+        """
+        import visualization
+
+        g = Graph(600)
+        g.add_edges([(u, (u * 7 + 1) % 600) for u in range(600)] + [(u, u + 1) for u in range(599)])
+        coloring = g.color()
+        with tempfile.TemporaryDirectory() as directory:
+            positions = visualization.compute_layout(g, cache_dir=directory)
+            self.assertEqual(positions.shape, (600, 2))
+            self.assertIs(visualization.compute_layout(g, cache_dir=directory), positions)
+            visualization._layout_cache.clear()
+            self.assertTrue((visualization.compute_layout(g, cache_dir=directory) == positions).all())
+
+            for name, options in (("full.png", {}), ("sample.svg", {"sample": 50}), ("classes.png", {"aggregate": True})):
+                path = os.path.join(directory, name)
+                g.visualize(coloring, name, path=path, seed=1, **options)
+                self.assertGreater(os.path.getsize(path), 0)
+
+        sample = visualization.sample_vertices(g, 50, seed=1)
+        self.assertEqual(len(set(sample)), 50)
+        classes, counts, between = visualization.aggregate_by_color(g, coloring)
+        self.assertEqual(classes.vertices, max(coloring) + 1)
+        self.assertEqual(sum(counts), 600)
+        self.assertEqual(sum(between), g.edges)
+
+    def test_coloring_cache(self):
+        """
+        Кеш раскрасок
+
+        Тест для кеша раскрасок по отпечатку графа.
+        Проверяет попадание для графа с другим порядком рёбер, сброс при add_edge,
+        вытеснение из памяти и дисковый уровень.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ColoringCache(max_entries=2, directory=directory)
+            g1 = Graph(5)
+            g1.cache = cache
+            g1.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)])
+            result = g1.greedy_coloring()
+            result[0] = 99
+            self.assertEqual(g1.greedy_coloring(), [0, 1, 0, 1, 2])
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            g2 = Graph(5)
+            g2.cache = cache
+            g2.add_edges([(4, 0), (3, 4), (2, 3), (1, 2), (0, 1)])
+            self.assertEqual(g2.greedy_coloring(), [0, 1, 0, 1, 2])
+            self.assertEqual(cache.hits, 2)
+
+            g1.add_edge(0, 2)
+            self.assertTrue(g1.is_proper_coloring(g1.greedy_coloring()))
+            self.assertEqual(cache.misses, 2)
+            g1.dsatur_coloring()
+            g1.greedy_coloring(order="largest_first")
+            self.assertEqual(len(cache._entries), 2)
+
+            cache.clear()
+            self.assertEqual(g2.greedy_coloring(), [0, 1, 0, 1, 2])
+            self.assertEqual(cache.hits, 3)
+
+    def test_reduce_colors(self):
+        """
+        Уменьшение числа цветов локальным поиском
+
+        Тест для графа-короны, на котором жадный алгоритм использует n цветов, и случайного плотного графа.
+        Проверяет, что результат корректен, не хуже начального и что ограничения соблюдаются.
+        """
+        n = 6
+        crown = Graph(2 * n)
+        crown.add_edges([(2 * i, 2 * j + 1) for i in range(n) for j in range(n) if i != j])
+        greedy = crown.greedy_coloring()
+        self.assertEqual(max(greedy) + 1, n)
+        result = crown.reduce_colors(greedy, time_limit=None, max_iterations=1000, seed=1)
+        self.assertTrue(crown.is_proper_coloring(result))
+        self.assertEqual(sorted(set(result)), [0, 1])
+
+        rng = random.Random(3)
+        dense = Graph(60)
+        dense.add_edges([(u, v) for u in range(60) for v in range(u + 1, 60) if rng.random() < 0.5])
+        greedy = dense.greedy_coloring()
+        result = dense.reduce_colors(greedy, time_limit=None, max_iterations=2000, seed=1)
+        self.assertTrue(dense.is_proper_coloring(result))
+        self.assertLessEqual(max(result), max(greedy))
+        self.assertEqual(sorted(set(result)), list(range(max(result) + 1)))
+
+        with self.assertRaises(ValueError):
+            crown.reduce_colors([0] * (2 * n))
+        with self.assertRaises(ValueError):
+            crown.reduce_colors(time_limit=None)
+
+        # Таблицы Tabucol больше предела: остаётся итеративный жадный алгоритм
+        neighbors = [crown.smezh_list[u] for u in range(2 * n)]
+        limit = local_search.TABU_MAX_CELLS
+        local_search.TABU_MAX_CELLS = 2 * n
+        try:
+            budget = local_search.Budget(None, 100)
+            self.assertIsNone(local_search.tabucol(neighbors, 2, [0] * (2 * n), random.Random(1), budget))
+            self.assertEqual(budget.remaining, 100)
+            result = dense.reduce_colors(greedy, time_limit=None, max_iterations=200, seed=1)
+            self.assertTrue(dense.is_proper_coloring(result))
+            self.assertLessEqual(max(result), max(greedy))
+        finally:
+            local_search.TABU_MAX_CELLS = limit
+
+    def test_exact_coloring(self):
+        """
+        Точная раскраска
+
+        Тест для графов с известным хроматическим числом: цикл C5, граф Грёча (Мыцельского M4),
+        граф ферзей 5 x 5, полный граф K6 и граф-корона.
+        Проверяет оптимальность, корректность и возврат раскраски при ограничении по времени.
+        """
+        import benchmark
+
+        cases = [
+            (5, [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)], 3),
+            benchmark.mycielski(20, 0)[:2] + (4,),
+            benchmark.queen(160, 0)[:2] + (5,),
+            (6, [(u, v) for u in range(6) for v in range(u + 1, 6)], 6),
+            (10, [(2 * i, 2 * j + 1) for i in range(5) for j in range(5) if i != j], 2),
+        ]
+        for vertices, pairs, chromatic in cases:
+            g = Graph(vertices)
+            g.add_edges(pairs)
+            coloring, lower = g.exact_coloring()
+            self.assertTrue(g.is_proper_coloring(coloring))
+            self.assertEqual(max(coloring) + 1, chromatic)
+            self.assertEqual(lower, chromatic)
+
+        g = Graph(47)
+        g.add_edges(benchmark.mycielski(236, 0)[1])
+        coloring, lower = g.exact_coloring(time_limit=0.05)
+        self.assertTrue(g.is_proper_coloring(coloring))
+        self.assertLessEqual(lower, 6)
+        self.assertGreaterEqual(max(coloring) + 1, 6)
+
+    def test_set_graph(self):
+        """
+        Граф на множествах
+
+        Тест для SetGraph: повторные рёбра, проверка и удаление рёбер, степени.
+        Проверяет, что раскраска корректна и совпадает по числу цветов с графом без повторов.
+        """
+        for directed in (False, True):
+            g = SetGraph(5)
+            g.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (1, 0), (0, 1), (2, 2)], directed=directed)
+            g.add_edge(3, 4, directed=directed)
+            self.assertEqual(g.edges, 7 if directed else 6)
+            self.assertTrue(g.has_edge(0, 1))
+            self.assertEqual(g.has_edge(2, 1), not directed)
+            self.assertEqual(g.degree(0, directed=directed), 3 if directed else 2)
+            self.assertTrue(g.is_proper_coloring(g.color()))
+
+            g.remove_edge(0, 1, directed=directed)
+            self.assertFalse(g.has_edge(0, 1))
+            g.remove_edge(2, 2, directed=directed)
+            with self.assertRaises(ValueError):
+                g.remove_edge(0, 1, directed=directed)
+            self.assertEqual(g.edges, 5 if directed else 4)
+
+        lists = Graph(4)
+        lists.add_edges([(0, 1), (0, 1), (1, 2), (2, 3), (3, 3)])
+        sets = SetGraph.from_graph(lists)
+        self.assertEqual(sets.edges, 4)
+        self.assertEqual(sets.degree(1), 2)
+        self.assertEqual(lists.degree(1), 3)
+        self.assertEqual(sets.fingerprint(), SetGraph.from_graph(sets).fingerprint())
+        self.assertEqual(sets.freeze().edges, 4)
+
+        # Пакеты без NumPy и массивом дают одинаковые множества и счётчик рёбер
+        pairs = [(0, 1), (1, 0), (2, 2), (1, 3), (3, 1), (2, 2)]
+        for directed in (False, True):
+            by_list = SetGraph(4)
+            by_list._add_edges_list([x for pair in pairs for x in pair], directed)
+            by_list._add_edges_list([0, 1, 3, 3], directed)
+            self.assertEqual(by_list.edges, (5 if directed else 3) + 1)
+            if np is not None:
+                by_array = SetGraph(4)
+                by_array.add_edges(np.array(pairs, dtype=np.int32), directed=directed)
+                by_array.add_edges([(0, 1), (3, 3)], directed=directed)
+                self.assertEqual((by_array.smezh_list, by_array.edges), (by_list.smezh_list, by_list.edges))
+        if np is not None:
+            with self.assertRaises(ValueError):
+                SetGraph(4).add_edges(np.array([[0.0, 1.5]]))
+
+        dynamic = DynamicColoring(SetGraph(3))
+        dynamic.add_edge(0, 1)
+        dynamic.add_edge(0, 1)
+        self.assertEqual(dynamic.graph.edges, 1)
+        self.assertTrue(dynamic.graph.is_proper_coloring(dynamic.coloring))
+
+    @unittest.skipIf(np is None, "NumPy не установлен")
+    def test_validate_coloring(self):
+        """
+        Векторная проверка раскраски
+
+        Тест для validate_coloring на ориентированном, неориентированном и CSR-графе.
+        Проверяет конфликты, петли, нераскрашенные вершины и гистограмму классов.
+        """
+        edges = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 3)]
+        for directed in (False, True):
+            g = Graph(5)
+            g.add_edges(edges, directed=directed)
+            for graph in (g, g.freeze()):
+                report = graph.validate_coloring([0, 1, 2, 0, 0])
+                self.assertEqual(report, {"proper": True, "colors": 3, "histogram": [3, 1, 1],
+                                          "uncolored": 0, "conflicts": []})
+                report = graph.validate_coloring([0, 0, 1, 1, -1])
+                self.assertFalse(report["proper"])
+                self.assertEqual(report["conflicts"], [[0, 1], [2, 3]])
+                self.assertEqual(report["histogram"], [2, 2])
+                self.assertEqual(report["uncolored"], 1)
+                self.assertFalse(graph.is_proper_coloring([0, 0, 1, 2, 0]))
+                self.assertTrue(graph.is_proper_coloring(graph.color()))
+
+        reverse = Graph(2)
+        reverse.add_edge(1, 0, directed=True)
+        self.assertEqual(reverse.validate_coloring([0, 0])["conflicts"], [[1, 0]])
+        g = Graph(2)
+        self.assertEqual(g.validate_coloring([0, 0])["proper"], True)
+        g.add_edge(0, 1)
+        self.assertEqual(g.validate_coloring([0, 0])["conflicts"], [[0, 1]])
+        self.assertEqual(Graph(0).validate_coloring([])["colors"], 0)
+        with self.assertRaises(ValueError):
+            g.validate_coloring([0])
+
+    @unittest.skipIf(np is None, "NumPy не установлен")
+    def test_color_packed(self):
+        """
+        Пакетная раскраска упакованных графов
+
+        Тест для batch.color_packed на графах разного размера, с петлями, без рёбер
+        и с числом цветов больше 64, в одном процессе и на пуле.
+        Проверяет совпадение с Graph.color() и проверку входных данных.
+        """
+        from batch import color_packed, pack_graphs, unpack_colors
+
+        rng = random.Random(5)
+        graphs = [(0, []), (1, [(0, 0)]), (70, [(u, v) for u in range(70) for v in range(u)])]
+        for _ in range(50):
+            n = rng.randint(2, 30)
+            graphs.append((n, [(rng.randrange(n), rng.randrange(n)) for _ in range(rng.randint(0, 3 * n))]))
+        expected = []
+        for directed in (False, True):
+            for n, edges in graphs:
+                g = Graph(n)
+                g.add_edges(edges, directed=directed)
+                expected.append(g.color())
+        self.assertEqual(expected[:len(graphs)], expected[len(graphs):])
+
+        vertex_offsets, edge_offsets, edges = pack_graphs(graphs)
+        colors = color_packed(vertex_offsets, edge_offsets, edges)
+        self.assertEqual(unpack_colors(colors, vertex_offsets), expected[:len(graphs)])
+        self.assertEqual(max(colors), 69)
+        self.assertEqual(color_packed(vertex_offsets, edge_offsets, edges.ravel(), workers=2).tolist(), colors.tolist())
+        self.assertEqual(len(color_packed([0], [0], [])), 0)
+
+        with self.assertRaises(ValueError):
+            color_packed([0, 2], [0, 1], [[0, 2]])
+        with self.assertRaises(ValueError):
+            color_packed([0, 2], [0, 2], [[0, 1]])
+        with self.assertRaises(ValueError):
+            color_packed([0, 2, 4], [0, 1], [[0, 1]])
+
+    def test_coloring_service(self):
+        """
+        Сервис раскраски
+
+        Тест для service.ColoringService по HTTP через TCP и Unix-сокет.
+        Проверяет раскраску, ошибки запроса, ограничения размера графа, объединение
+        одинаковых запросов, отказ при заполненной очереди и процентили задержки.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        import service
+
+        body = json.dumps({"vertices": 5, "edges": [[0, 1], [1, 2], [2, 3], [3, 4], [4, 0]]}).encode()
+
+        async def scenario(directory):
+            executor = ThreadPoolExecutor(2)
+            colorer = service.ColoringService(workers=2, queue_size=8, executor=executor)
+            tcp = await colorer.start(port=0)
+            unix = await asyncio.start_unix_server(colorer.handle, path=os.path.join(directory, "service.sock"))
+            try:
+                for connect in ({"port": tcp.sockets[0].getsockname()[1]}, {"unix": os.path.join(directory, "service.sock")}):
+                    reader, writer = await service.open_connection(**connect)
+                    status, answer = await service.send_request(reader, writer, "POST", "/color", body)
+                    self.assertEqual((status, json.loads(answer)), (200, {"coloring": [0, 1, 0, 1, 2], "colors": 3}))
+                    status, _ = await service.send_request(reader, writer, "POST", "/color", b'{"vertices": 2, "edges": [[0, 2]]}')
+                    self.assertEqual(status, 400)
+                    status, _ = await service.send_request(reader, writer, "GET", "/missing")
+                    self.assertEqual(status, 404)
+                    writer.close()
+
+                answers = await asyncio.gather(*(colorer.color(body) for _ in range(5)))
+                self.assertEqual(len(set(answers)), 1)
+                self.assertEqual(colorer.coalesced, 4)
+
+                # Слишком большие графы отклоняются до постановки в очередь
+                reader, writer = await service.open_connection(port=tcp.sockets[0].getsockname()[1])
+                status, _ = await service.send_request(reader, writer, "POST", "/color", b'{"vertices": 10000000000, "edges": []}')
+                self.assertEqual(status, 413)
+                limit = service.MAX_EDGES
+                service.MAX_EDGES = 2
+                try:
+                    status, _ = await service.send_request(reader, writer, "POST", "/color", body)
+                    self.assertEqual(status, 413)
+                finally:
+                    service.MAX_EDGES = limit
+                status, stats = await service.send_request(reader, writer, "GET", "/stats")
+                writer.close()
+                stats = json.loads(stats)
+                self.assertEqual((stats["requests"], stats["computed"], stats["coalesced"]), (11, 5, 4))
+                self.assertIsNotNone(stats["latency_ms"]["p99"])
+            finally:
+                tcp.close()
+                unix.close()
+                await colorer.close()
+                executor.shutdown()
+
+            # Без обработчиков очереди первая задача занимает единственное место
+            idle = service.ColoringService(workers=1, queue_size=1)
+            first = asyncio.ensure_future(idle.color(body))
+            await asyncio.sleep(0)
+            with self.assertRaises(service.Overloaded):
+                await idle.color(b'{"vertices": 1}')
+            first.cancel()
+            self.assertEqual(idle.rejected, 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(scenario(directory))
+
+    def test_stream_coloring(self):
+        """
+        Полупотоковая раскраска
+
+        Тест для streaming.stream_coloring на случайном графе с петлями при разных палитрах,
+        числе проходов и размере буфера, а также для чтения из файла.
+        Проверяет корректность раскраски, число проходов и ошибки в индексах.
+        """
+        from streaming import file_source, stream_coloring
+
+        rng = random.Random(6)
+        pairs = [(rng.randrange(300), rng.randrange(300)) for _ in range(1500)] + [(7, 7)]
+        flat = [x for pair in pairs for x in pair]
+        chunks = [flat[i:i + 500] for i in range(0, len(flat), 500)]
+        g = Graph(300)
+        g.add_edges(pairs)
+
+        for palette, passes, buffer_edges in ((None, 4, 1 << 20), (3, 4, 1 << 20), (3, 1, 1 << 20), (3, 3, 50), (3, 3, 0)):
+            coloring, report = stream_coloring(lambda: chunks, None, passes, buffer_edges, palette, seed=1)
+            self.assertTrue(g.is_proper_coloring(coloring))
+            self.assertEqual(report["colors"], max(coloring) + 1)
+            self.assertLessEqual(report["passes"], passes + 1)
+            self.assertLessEqual(report["buffered"], buffer_edges)
+        coloring, report = stream_coloring(lambda: chunks, 300, 4, 1 << 20, 3, seed=1)
+        self.assertEqual(report["fresh"], 0)
+        self.assertLess(report["colors"], 10)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "edges.txt")
+            with open(path, "w") as file:
+                file.write("# ребра\n" + "".join(f"{u} {v}\n" for u, v in pairs))
+            self.assertEqual(stream_coloring(file_source(path, chunk_size=64), 300, palette=3, seed=1)[0], coloring)
+
+        with self.assertRaises(ValueError):
+            stream_coloring(lambda: [[0, 5]], vertices=3)
+        with self.assertRaises(ValueError):
+            stream_coloring(lambda: [[0, -1]])
+
+    def test_partitioned_coloring(self):
+        """
+        Раскраска по частям
+
+        Тест для Graph.partitioned_coloring с разбиением обходом в ширину и хешем на случайном графе,
+        ориентированном графе и крайних случаях (частей больше, чем вершин, пустой граф).
+        Проверяет корректность раскраски, число разрезанных рёбер в отчёте, ошибки в параметрах
+        и сбой рабочего процесса.
+        """
+        from partition import bfs_partition, cut_size, hash_partition
+
+        rng = random.Random(7)
+        g = Graph(400)
+        g.add_edges([(rng.randrange(400), rng.randrange(400)) for _ in range(2000)] + [(5, 5)])
+        offsets, targets = g._neighbor_csr()
+        for method in ("bfs", "hash"):
+            coloring, report = g.partitioned_coloring(parts=3, method=method, seed=2)
+            self.assertTrue(g.is_proper_coloring(coloring))
+            self.assertEqual(report["parts"], 3)
+            self.assertGreater(report["cut_edges"], 0)
+            self.assertGreaterEqual(report["rounds"], 1)
+        self.assertEqual(report["cut_edges"], cut_size(offsets, targets, hash_partition(400, 3, 2)))
+        self.assertLess(cut_size(offsets, targets, bfs_partition(400, offsets, targets, 3)), 2000)
+        self.assertEqual(g.partitioned_coloring(parts=1)[1]["cut_edges"], 0)
+        self.assertTrue(g.is_proper_coloring(g.partitioned_coloring(parts=3, max_rounds=1)[0]))
+
+        d = Graph(6)
+        d.add_edges([(0, 1), (2, 1), (3, 4), (5, 0)], directed=True)
+        coloring, report = d.partitioned_coloring(parts=10, method="hash")
+        self.assertTrue(d.is_proper_coloring(coloring))
+        self.assertEqual(report["parts"], 6)
+        self.assertTrue(d.is_proper_coloring(d.color("partitioned")))
+
+        self.assertEqual(Graph(0).partitioned_coloring(parts=2)[0], [])
+        with self.assertRaises(ValueError):
+            g.component_coloring("partitioned", workers=2)
+        with self.assertRaises(ValueError):
+            g.partitioned_coloring(method="metis")
+        with self.assertRaises(ValueError):
+            g.partitioned_coloring(parts=0)
+        with self.assertRaises(ValueError):
+            g.partitioned_coloring(parts=-1)
+
+        # Сбой рабочего процесса: координатор не зависает, а сообщает об ошибке
+        import partition
+
+        run_part = partition._run_part
+
+        def failing(part, *args):
+            if part == 1:
+                os._exit(1)
+            run_part(part, *args)
+
+        partition._run_part = failing
+        try:
+            with self.assertRaises(RuntimeError):
+                g.partitioned_coloring(parts=4)
+        finally:
+            partition._run_part = run_part
+
     def test_cycle_graph(self):
         """
         Циклический граф
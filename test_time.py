@@ -1,8 +1,18 @@
+import copy
+import subprocess
+import sys
 import time
+from dynamic import DynamicColoring
 from main import Graph
+import benchmark
 import unittest
 import random
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class MeasureGraphTime(unittest.TestCase):
 
@@ -368,6 +378,269 @@ class MeasureGraphTime(unittest.TestCase):
         # then
         print("---Program execution time: %s seconds ---" % execution_time)
 
+    def test_measure_directed_graph_with_random_data_big(self):
+        """
+            Тест измерения времени для большого ориентированного графа со случайными значениями.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 200000
+        g = Graph(all_v)
+        for _ in range(400000):
+            g.add_edge(rng.randrange(all_v), rng.randrange(all_v), directed=True)
+
+        # when
+        start_time = time.perf_counter()
+        result = g.greedy_coloring_directed()
+        end_time = time.perf_counter()
+        execution_time = end_time - start_time
+
+        # then
+        print("---Program execution time: %s seconds ---" % execution_time)
+
+    def test_measure_frozen_graph_memory(self):
+        """
+            Тест сравнения памяти на ребро для списков смежности и CSR.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 100000
+        g = Graph(all_v)
+        for _ in range(500000):
+            g.add_edge(rng.randrange(all_v), rng.randrange(all_v), directed=True)
+
+        # when
+        start_time = time.perf_counter()
+        frozen = g.freeze()
+        end_time = time.perf_counter()
+        execution_time = end_time - start_time
+
+        # then
+        print("---Freeze time: %s seconds ---" % execution_time)
+        print("---Bytes per edge: lists %.1f, CSR %.1f ---" % (g.bytes_per_edge(), frozen.bytes_per_edge()))
+
+        start_time = time.perf_counter()
+        result = frozen.greedy_coloring_directed()
+        end_time = time.perf_counter()
+        execution_time = end_time - start_time
+        print("---Program execution time: %s seconds ---" % execution_time)
+
+    def test_measure_bulk_edge_loading(self):
+        """
+            Тест сравнения времени загрузки рёбер через add_edge и add_edges.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 100000
+        edges = [(rng.randrange(all_v), rng.randrange(all_v)) for _ in range(500000)]
+
+        # when
+        g = Graph(all_v)
+        start_time = time.perf_counter()
+        for u, v in edges:
+            g.add_edge(u, v)
+        single_time = time.perf_counter() - start_time
+
+        g = Graph(all_v)
+        start_time = time.perf_counter()
+        g.add_edges(edges)
+        bulk_time = time.perf_counter() - start_time
+
+        # then
+        print("---Loading time: add_edge %s seconds, add_edges %s seconds ---" % (single_time, bulk_time))
+
+    def test_measure_import_time(self):
+        """
+            Тест измерения времени импорта модуля main в новом процессе.
+        """
+        # given
+        baseline = [sys.executable, "-c", "pass"]
+        command = [sys.executable, "-c", "from main import Graph"]
+
+        # when
+        start_time = time.perf_counter()
+        subprocess.run(baseline, check=True)
+        interpreter_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        subprocess.run(command, check=True)
+        execution_time = time.perf_counter() - start_time - interpreter_time
+
+        # then
+        print("---Import time: %s seconds ---" % execution_time)
+
+    def test_measure_vertex_orders_power_law_graph(self):
+        """
+            Тест сравнения стратегий упорядочивания на графе со степенным распределением.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 20000
+        g = Graph(all_v)
+        # Предпочтительное присоединение: новая вершина соединяется с уже популярными
+        targets = [0, 1]
+        g.add_edge(0, 1)
+        for u in range(2, all_v):
+            for v in {rng.choice(targets) for _ in range(3)}:
+                g.add_edge(u, v)
+                targets.extend((u, v))
+
+        # when / then
+        for order in ("natural", "largest_first", "smallest_last", "random"):
+            start_time = time.perf_counter()
+            result = g.greedy_coloring(order, seed=6)
+            execution_time = time.perf_counter() - start_time
+            print("---%s: %d colors, %s seconds ---" % (order, max(result) + 1, execution_time))
+        print("---Degeneracy bound: %d colors ---" % (g.degeneracy() + 1))
+
+    def test_measure_dsatur_random_graph(self):
+        """
+            Тест сравнения жадного алгоритма и DSatur на большом случайном графе.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 100000
+        g = Graph(all_v)
+        g.add_edges([(rng.randrange(all_v), rng.randrange(all_v)) for _ in range(500000)])
+
+        # when / then
+        for algorithm in ("greedy", "dsatur"):
+            start_time = time.perf_counter()
+            result = g.color(algorithm)
+            execution_time = time.perf_counter() - start_time
+            print("---%s: %d colors, %s seconds ---" % (algorithm, max(result) + 1, execution_time))
+
+    def test_measure_dense_graph_high_degree(self):
+        """
+            Тест измерения времени для плотного графа с вершинами большой степени.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 2000
+        g = Graph(all_v)
+        g.add_edges([(u, v) for u in range(all_v) for v in range(u + 1, all_v) if rng.random() < 0.5])
+
+        # when
+        start_time = time.perf_counter()
+        result = g.greedy_coloring()
+        end_time = time.perf_counter()
+        execution_time = end_time - start_time
+
+        # then
+        print("---%d colors ---" % (max(result) + 1))
+        print("---Program execution time: %s seconds ---" % execution_time)
+
+    def test_measure_parallel_coloring(self):
+        """
+            Тест сравнения жадного алгоритма и параллельной раскраски Джонса–Плассмана.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 100000
+        g = Graph(all_v)
+        g.add_edges([(rng.randrange(all_v), rng.randrange(all_v)) for _ in range(500000)])
+
+        # when
+        start_time = time.perf_counter()
+        result = g.greedy_coloring()
+        greedy_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = g.parallel_coloring(seed=6)
+        parallel_time = time.perf_counter() - start_time
+
+        # then
+        print("---greedy %s seconds, jones_plassmann %s seconds ---" % (greedy_time, parallel_time))
+
+    @unittest.skipIf(np is None, "NumPy не установлен")
+    def test_measure_speculative_coloring_big_sparse_graph(self):
+        """
+            Тест сравнения жадного алгоритма и спекулятивной раскраски на NumPy для разреженного графа.
+        """
+        # given
+        all_v = 1000000
+        g = Graph(all_v)
+        g.add_edges(np.random.default_rng(6).integers(0, all_v, (3000000, 2)))
+        frozen = g.freeze()
+
+        # when
+        start_time = time.perf_counter()
+        result = frozen.greedy_coloring()
+        greedy_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = frozen.speculative_coloring()
+        speculative_time = time.perf_counter() - start_time
+
+        # then
+        print("---greedy %s seconds, speculative %s seconds ---" % (greedy_time, speculative_time))
+
+    def test_measure_dynamic_coloring_updates(self):
+        """
+            Тест сравнения динамической раскраски и полной перекраски после каждого изменения.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 100000
+        g = Graph(all_v)
+        g.add_edges([(rng.randrange(all_v), rng.randrange(all_v)) for _ in range(300000)])
+        dynamic = DynamicColoring(g)
+        updates = [(rng.randrange(all_v), rng.randrange(all_v)) for _ in range(10000)]
+
+        # when
+        start_time = time.perf_counter()
+        for u, v in updates:
+            dynamic.add_edge(u, v)
+        for u, v in updates:
+            dynamic.remove_edge(u, v)
+        dynamic_time = (time.perf_counter() - start_time) / (2 * len(updates))
+
+        start_time = time.perf_counter()
+        result = g.greedy_coloring()
+        full_time = time.perf_counter() - start_time
+
+        # then
+        print("---Per update: dynamic %s seconds, full recoloring %s seconds ---" % (dynamic_time, full_time))
+
+    def test_measure_component_coloring_forest(self):
+        """
+            Тест сравнения обычной и покомпонентной раскраски для леса из тысяч компонент.
+        """
+        # given
+        rng = random.Random(6)
+        all_v = 200000
+        g = Graph(all_v)
+        # Случайные деревья по 20 вершин
+        g.add_edges([(u, u - 1 - rng.randrange(u % 20)) for u in range(all_v) if u % 20])
+
+        # when
+        start_time = time.perf_counter()
+        result = g.greedy_coloring()
+        greedy_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = g.component_coloring()
+        component_time = time.perf_counter() - start_time
+
+        # then
+        print("---greedy %s seconds, by components %s seconds ---" % (greedy_time, component_time))
+
+    def test_benchmark_harness(self):
+        """
+            Тест бенчмарка: отчёт для всех генераторов и поиск регрессий относительно базового отчёта.
+        """
+        # given
+        report = benchmark.run_benchmarks(list(benchmark.GENERATORS), [1000], ["greedy", "dsatur"], warmup=0, repeats=1)
+
+        # when
+        slower = copy.deepcopy(report)
+        for item in slower["results"]:
+            item["median"] *= 2
+
+        # then
+        self.assertEqual(len(report["results"]), 3 * len(benchmark.GENERATORS))
+        self.assertEqual(benchmark.compare_with_baseline(report, report), [])
+        self.assertEqual(len(benchmark.compare_with_baseline(slower, report)), len(report["results"]))
+
 
 if __name__ == "__main__":
     unittest.main()
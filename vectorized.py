@@ -0,0 +1,138 @@
+"""
+Спекулятивная раскраска графа в стиле Гебремедхина–Манне на массивах NumPy.
+
+Вершины раскрашиваются крупными блоками: каждая вершина блока получает
+наименьший цвет, свободный среди уже раскрашенных соседей, без учёта соседей
+из того же блока. Затем векторно находятся конфликтующие рёбра, и перекрашиваются
+только их концы с большим номером, пока конфликтов не останется.
+
+Здесь же находится векторная проверка готовой раскраски по массиву рёбер.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Наибольший размер булевой матрицы занятых цветов для одного блока
+MATRIX_LIMIT = 1 << 24
+
+
+def gather_neighbors(offsets: np.ndarray, targets: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Соседи набора вершин из CSR одним векторным обращением.
+
+    Args:
+        offsets (np.ndarray): Смещения списков соседей (длина V + 1).
+        targets (np.ndarray): Соседи всех вершин.
+        vertices (np.ndarray): Вершины, соседей которых нужно получить.
+
+    Returns:
+        tuple: Номер вершины внутри vertices для каждой записи и сами соседи.
+    """
+    if len(vertices) and vertices[-1] - vertices[0] + 1 == len(vertices):
+        # Подряд идущие вершины: соседи лежат в targets одним отрезком
+        first, last = int(vertices[0]), int(vertices[-1]) + 1
+        degrees = np.diff(offsets[first:last + 1])
+        return np.repeat(np.arange(len(vertices)), degrees), targets[offsets[first]:offsets[last]]
+
+    starts = offsets[vertices]
+    degrees = offsets[vertices + 1] - starts
+    owners = np.repeat(np.arange(len(vertices)), degrees)
+    # Позиция записи в targets: начало списка владельца плюс номер внутри списка
+    shift = np.repeat(starts - (np.cumsum(degrees) - degrees), degrees)
+    return owners, targets[shift + np.arange(len(owners))]
+
+
+def first_free_colors(owners: np.ndarray, neighbor_colors: np.ndarray, count: int) -> np.ndarray:
+    """
+    Наименьший цвет, не занятый соседями, для каждой из count вершин.
+
+    Занятые цвета отмечаются в булевой матрице count x (max_color + 2), после чего
+    первый свободный цвет каждой строки находится через argmin.
+
+    Args:
+        owners (np.ndarray): Номер вершины (0..count-1) для каждой записи.
+        neighbor_colors (np.ndarray): Цвет соседа для каждой записи (-1 — не раскрашен).
+        count (int): Количество вершин.
+
+    Returns:
+        np.ndarray: Наименьший свободный цвет для каждой вершины.
+    """
+    colored = neighbor_colors >= 0
+    width = int(neighbor_colors.max(initial=-1)) + 2
+    used = np.zeros((count, width), dtype=bool)
+    used[owners[colored], neighbor_colors[colored]] = True
+    return used.argmin(axis=1)
+
+
+def speculative_coloring(
+    vertices: int, offsets: Sequence[int], targets: Sequence[int], block_size: int = 65536
+) -> List[int]:
+    """
+    Раскраска с пакетной спекуляцией и исправлением конфликтов.
+
+    Args:
+        vertices (int): Количество вершин.
+        offsets (Sequence[int]): Смещения списков соседей (int64, длина vertices + 1).
+        targets (Sequence[int]): Соседи всех вершин (int32); каждое ребро записано в обе стороны.
+        block_size (int, optional): Сколько вершин раскрашивается одновременно.
+
+    Returns:
+        list: Список цветов для каждой вершины.
+    """
+    offsets = np.frombuffer(offsets, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int32)
+    colors = np.full(vertices, -1, dtype=np.int32)
+
+    pending = np.arange(vertices)
+    while len(pending):
+        start = 0
+        while start < len(pending):
+            # Матрица занятых цветов блока не должна превышать MATRIX_LIMIT элементов
+            width = int(colors.max(initial=-1)) + 2
+            block = pending[start:start + max(1, min(block_size, MATRIX_LIMIT // width))]
+            owners, neighbors = gather_neighbors(offsets, targets, block)
+            colors[block] = first_free_colors(owners, colors[neighbors], len(block))
+            start += len(block)
+
+        # Конфликты возможны только между вершинами одного блока; перекрашивается конец с большим номером
+        owners, neighbors = gather_neighbors(offsets, targets, pending)
+        sources = pending[owners]
+        conflicts = (colors[sources] == colors[neighbors]) & (sources < neighbors)
+        pending = np.unique(neighbors[conflicts])
+        colors[pending] = -1
+
+    return colors.tolist()
+
+
+def coloring_report(sources: np.ndarray, targets: np.ndarray, coloring: Sequence[int], directed: bool) -> dict:
+    """
+    Проверка раскраски и гистограмма цветовых классов за одну векторную операцию.
+
+    Args:
+        sources (np.ndarray): Начала записей списков смежности.
+        targets (np.ndarray): Концы записей; для неориентированного графа каждое ребро записано дважды.
+        coloring (Sequence[int]): Цвета вершин (-1 — вершина не раскрашена).
+        directed (bool): Записаны ли рёбра по одному разу (ориентированный граф).
+
+    Returns:
+        dict: proper, colors, histogram, uncolored и conflicts (см. Graph.validate_coloring).
+    """
+    colors = np.asarray(coloring, dtype=np.int64)
+    colored = colors >= 0
+    uncolored = len(colors) - int(colored.sum())
+
+    source_colors = colors[sources]
+    conflicting = (source_colors == colors[targets]) & (source_colors >= 0) & (sources != targets)
+    if not directed:
+        # Неориентированное ребро записано в обе стороны; оставляется запись с меньшим началом
+        conflicting &= sources < targets
+    conflicts = np.column_stack((sources[conflicting], targets[conflicting]))
+
+    histogram = np.bincount(colors[colored]) if uncolored < len(colors) else np.zeros(0, dtype=np.int64)
+    return {
+        "proper": not uncolored and not len(conflicts),
+        "colors": len(histogram),
+        "histogram": histogram.tolist(),
+        "uncolored": uncolored,
+        "conflicts": conflicts.tolist(),
+    }
@@ -0,0 +1,371 @@
+"""
+Визуализация раскраски графов любого размера.
+
+Граф рисуется целиком, по выборке вершин (обход в ширину от случайных вершин)
+или в агрегированном виде: одна вершина на цветовой класс с числом вершин класса.
+Раскладка небольших графов строится nx.spring_layout, больших — спектральной
+раскладкой степенным методом за O(E) на итерацию. Готовые раскладки кешируются
+по отпечатку графа в памяти и, по желанию, в каталоге на диске. Рисунок выводится
+в окно или сохраняется в PNG/SVG без дисплея.
+"""
+import math
+import os
+import random
+from collections import Counter, OrderedDict, deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Начиная с этого числа вершин раскладка auto выбирает spectral вместо spring
+# (для больших графов networkx переходит на разреженную версию, которой нужен SciPy)
+SPRING_LIMIT = 500
+# Наибольший граф, который рисуется networkx с подписями и стрелками
+DETAILED_LIMIT = 200
+# Сколько раскладок хранится в памяти
+LAYOUT_CACHE_SIZE = 16
+
+# (отпечаток графа, раскладка, seed) -> координаты вершин формы (V, 2)
+_layout_cache: "OrderedDict[Tuple[str, str, Optional[int]], np.ndarray]" = OrderedDict()
+
+
+def edge_array(graph) -> np.ndarray:
+    """
+    Рёбра графа массивом формы (E, 2); неориентированное ребро входит один раз.
+    """
+    frozen = graph.freeze()
+    offsets = np.frombuffer(frozen.out_offsets, dtype=np.int64)
+    targets = np.frombuffer(frozen.out_targets, dtype=np.int32)
+    sources = np.repeat(np.arange(graph.vertices), np.diff(offsets))
+    edges = np.column_stack((sources, targets))
+    if not graph.directed:
+        edges = edges[sources <= targets]
+    return edges
+
+
+def spring_layout(graph, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Силовая раскладка Фрюхтермана–Рейнгольда из networkx.
+    """
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_nodes_from(range(graph.vertices))
+    G.add_edges_from(edge_array(graph).tolist())
+    positions = nx.spring_layout(G, seed=seed)
+    return np.array([positions[u] for u in range(graph.vertices)], dtype=float).reshape(-1, 2)
+
+
+def spectral_layout(graph, seed: Optional[int] = None, iterations: int = 50) -> np.ndarray:
+    """
+    Спектральная раскладка степенным методом.
+
+    Координаты приближают собственные векторы ленивого случайного блуждания
+    (I + D^-1 A) / 2, следующие за постоянным: на каждой итерации вершина сдвигается
+    к среднему своих соседей, после чего координаты ортогонализуются к постоянному
+    вектору и друг к другу. Итерация стоит O(V + E) и не требует SciPy.
+    Степени увеличиваются на среднюю степень (регуляризация), иначе у графа из
+    многих компонент связности все вершины, кроме маленьких компонент, сжимаются в точку.
+
+    Args:
+        graph (Graph): Граф.
+        seed (int, optional): Зерно начальных координат.
+        iterations (int, optional): Число итераций степенного метода.
+
+    Returns:
+        np.ndarray: Координаты вершин формы (V, 2) в квадрате [-1, 1].
+    """
+    offsets, targets = graph._neighbor_csr()
+    offsets = np.frombuffer(offsets, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int32)
+    vertices = graph.vertices
+    degrees = np.diff(offsets)
+    sources = np.repeat(np.arange(vertices), degrees)
+    weights = degrees + max(len(targets) / max(vertices, 1), 1.0)
+
+    positions = np.random.default_rng(seed).random((vertices, 2)) - 0.5
+    for _ in range(iterations):
+        summed = np.column_stack(
+            [np.bincount(sources, weights=positions[targets, axis], minlength=vertices) for axis in (0, 1)]
+        )
+        positions = 0.5 * (positions + summed / weights[:, None])
+        # Ортогонализация Грама–Шмидта в скалярном произведении с весами-степенями
+        positions -= weights @ positions / weights.sum()
+        x, y = positions[:, 0], positions[:, 1]
+        y -= (weights * x) @ y / max((weights * x) @ x, 1e-300) * x
+        positions /= np.maximum(np.sqrt(weights @ positions ** 2), 1e-300)
+
+    extent = np.abs(positions).max(axis=0)
+    return positions / np.where(extent > 0, extent, 1)
+
+
+def random_layout(graph, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Случайные координаты в квадрате [-1, 1].
+    """
+    return np.random.default_rng(seed).random((graph.vertices, 2)) * 2 - 1
+
+
+_LAYOUT_FUNCTIONS = {"spring": spring_layout, "spectral": spectral_layout, "random": random_layout}
+
+
+def compute_layout(graph, layout: str = "auto", seed: Optional[int] = None, cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Раскладка вершин с кешированием по отпечатку графа.
+
+    Args:
+        graph (Graph): Граф.
+        layout (str, optional): auto, spring, spectral или random. auto выбирает spring
+            для графов меньше SPRING_LIMIT вершин и spectral для остальных.
+        seed (int, optional): Зерно раскладки.
+        cache_dir (str, optional): Каталог для хранения раскладок между запусками.
+
+    Returns:
+        np.ndarray: Координаты вершин формы (V, 2).
+
+    Raises:
+        ValueError: Если раскладка неизвестна.
+    """
+    if layout == "auto":
+        layout = "spring" if graph.vertices < SPRING_LIMIT else "spectral"
+    if layout not in _LAYOUT_FUNCTIONS:
+        raise ValueError(f"Неизвестная раскладка: {layout}. Доступны: auto, {', '.join(_LAYOUT_FUNCTIONS)}.")
+
+    key = (graph.fingerprint(), layout, seed)
+    if key in _layout_cache:
+        _layout_cache.move_to_end(key)
+        return _layout_cache[key]
+
+    path = os.path.join(cache_dir, f"{key[0]}-{layout}-{seed}.npy") if cache_dir else None
+    if path and os.path.exists(path):
+        positions = np.load(path)
+    else:
+        positions = _LAYOUT_FUNCTIONS[layout](graph, seed)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(path, positions)
+
+    _layout_cache[key] = positions
+    if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+    return positions
+
+
+def sample_vertices(graph, limit: int, seed: Optional[int] = None) -> List[int]:
+    """
+    Выборка вершин обходом в ширину от случайных стартовых вершин.
+
+    В отличие от равномерной выборки, соседние вершины попадают в неё вместе,
+    поэтому на рисунке видны рёбра и локальная структура раскраски.
+
+    Args:
+        graph (Graph): Граф.
+        limit (int): Наибольшее число вершин выборки.
+        seed (int, optional): Зерно выбора стартовых вершин.
+
+    Returns:
+        list: Выбранные вершины в порядке обхода.
+    """
+    starts = list(range(graph.vertices))
+    random.Random(seed).shuffle(starts)
+    chosen: Dict[int, None] = {}
+    for start in starts:
+        if len(chosen) >= limit:
+            break
+        if start in chosen:
+            continue
+        chosen[start] = None
+        queue = deque([start])
+        while queue and len(chosen) < limit:
+            u = queue.popleft()
+            neighbors = graph.smezh_list[u]
+            if graph.directed:
+                neighbors = list(neighbors) + list(graph.in_smezh_list[u])
+            for v in neighbors:
+                if v not in chosen:
+                    chosen[v] = None
+                    queue.append(v)
+                    if len(chosen) >= limit:
+                        break
+    return list(chosen)
+
+
+def induced_subgraph(graph, vertices: Sequence[int]):
+    """
+    Подграф, порождённый вершинами; вершина vertices[i] получает номер i.
+    """
+    from main import Graph
+
+    index = {v: i for i, v in enumerate(vertices)}
+    pairs = []
+    for u in vertices:
+        for v in graph.smezh_list[u]:
+            if v in index and (graph.directed or u <= v):
+                pairs.append((index[u], index[v]))
+    subgraph = Graph(len(vertices))
+    subgraph.add_edges(pairs, directed=graph.directed)
+    subgraph.directed = graph.directed
+    return subgraph
+
+
+def aggregate_by_color(graph, coloring: Sequence[int]) -> Tuple[object, List[int], List[int]]:
+    """
+    Граф цветовых классов: одна вершина на цвет, ребро — если между классами есть рёбра.
+
+    Args:
+        graph (Graph): Граф.
+        coloring (Sequence[int]): Цвет каждой вершины.
+
+    Returns:
+        tuple: Граф классов, размеры классов и число рёбер исходного графа для каждого ребра
+            в порядке edge_array(граф классов).
+    """
+    from main import Graph
+
+    classes = max(coloring, default=-1) + 1
+    counts = [0] * classes
+    for color in coloring:
+        counts[color] += 1
+    between = Counter()
+    for u in range(graph.vertices):
+        for v in graph.smezh_list[u]:
+            cu, cv = coloring[u], coloring[v]
+            # Конфликтные рёбра внутри класса не рисуются
+            if cu != cv and (graph.directed or u <= v):
+                between[(cu, cv) if graph.directed else (min(cu, cv), max(cu, cv))] += 1
+
+    pairs = sorted(between)
+    aggregated = Graph(classes)
+    aggregated.add_edges(pairs, directed=graph.directed)
+    aggregated.directed = graph.directed
+    # edge_array перечисляет рёбра по возрастанию (u, v), как и sorted
+    return aggregated, counts, [between[pair] for pair in pairs]
+
+
+def draw(
+    graph,
+    coloring: Sequence[int],
+    positions: np.ndarray,
+    title: str,
+    path: Optional[str] = None,
+    labels: Optional[Dict[int, str]] = None,
+    sizes: Optional[List[float]] = None,
+    widths: Optional[List[float]] = None,
+) -> None:
+    """
+    Отрисовка графа по готовой раскладке.
+
+    Графы до DETAILED_LIMIT вершин рисуются networkx с подписями и стрелками,
+    большие — одной коллекцией отрезков и одним scatter, что на порядки быстрее.
+    Если задан path, рисунок сохраняется в файл (формат по расширению, например
+    PNG или SVG) через Figure без pyplot, поэтому дисплей не нужен.
+
+    Args:
+        graph (Graph): Граф.
+        coloring (Sequence[int]): Цвет каждой вершины.
+        positions (np.ndarray): Координаты вершин формы (V, 2).
+        title (str): Заголовок окна или рисунка.
+        path (str, optional): Файл для сохранения рисунка; None — показать окно.
+        labels (dict, optional): Подписи вершин; по умолчанию номера вершин.
+        sizes (list, optional): Размеры вершин.
+        widths (list, optional): Толщина каждого ребра в порядке edge_array(graph).
+    """
+    edges = edge_array(graph)
+    if path:
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=(10, 10))
+        figure.suptitle(title)
+    else:
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure(figsize=(10, 10))
+        figure.canvas.manager.set_window_title(title)
+    ax = figure.add_subplot()
+    ax.set_axis_off()
+
+    if graph.vertices <= DETAILED_LIMIT:
+        import networkx as nx
+
+        G = nx.DiGraph() if graph.directed else nx.Graph()
+        G.add_nodes_from(range(graph.vertices))
+        G.add_edges_from(edges.tolist())
+        nx.draw(
+            G,
+            dict(enumerate(positions)),
+            ax=ax,
+            edgelist=[tuple(edge) for edge in edges.tolist()],
+            width=widths if widths is not None else 1.0,
+            with_labels=True,
+            labels=labels,
+            node_color=list(coloring),
+            cmap="rainbow",
+            node_size=sizes if sizes is not None else 500,
+            font_color="white",
+        )
+    else:
+        from matplotlib.collections import LineCollection
+
+        ax.add_collection(
+            LineCollection(
+                positions[edges], colors="gray", alpha=0.4, linewidths=widths if widths is not None else 0.3
+            )
+        )
+        ax.scatter(
+            positions[:, 0],
+            positions[:, 1],
+            c=list(coloring),
+            cmap="rainbow",
+            s=sizes if sizes is not None else max(1.0, 2000 / math.sqrt(graph.vertices)),
+            linewidths=0,
+            zorder=2,
+        )
+        ax.autoscale_view()
+
+    if path:
+        figure.savefig(path)
+    else:
+        plt.show()
+
+
+def render(
+    graph,
+    coloring: Sequence[int],
+    title: str,
+    path: Optional[str] = None,
+    layout: str = "auto",
+    sample: Optional[int] = None,
+    aggregate: bool = False,
+    seed: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """
+    Визуализация раскраски: выбор рисуемого графа, раскладка и отрисовка.
+
+    Args:
+        graph (Graph): Граф.
+        coloring (Sequence[int]): Цвет каждой вершины.
+        title (str): Заголовок окна или рисунка.
+        path (str, optional): Файл PNG/SVG; None — показать окно.
+        layout (str, optional): Раскладка для compute_layout.
+        sample (int, optional): Рисовать не больше sample вершин (выборка sample_vertices).
+        aggregate (bool, optional): Рисовать граф цветовых классов.
+        seed (int, optional): Зерно выборки и раскладки.
+        cache_dir (str, optional): Каталог кеша раскладок.
+    """
+    labels = sizes = widths = None
+    if aggregate:
+        graph, counts, between = aggregate_by_color(graph, coloring)
+        coloring = list(range(graph.vertices))
+        labels = {color: f"{color}: {count}" for color, count in enumerate(counts)}
+        largest = max(counts, default=1)
+        sizes = [300 + 2700 * math.sqrt(count / largest) for count in counts]
+        heaviest = math.log1p(max(between, default=1))
+        widths = [0.5 + 4.5 * math.log1p(count) / heaviest for count in between]
+    elif sample is not None and graph.vertices > sample:
+        vertices = sample_vertices(graph, sample, seed)
+        graph = induced_subgraph(graph, vertices)
+        coloring = [coloring[v] for v in vertices]
+        labels = dict(enumerate(map(str, vertices)))
+
+    positions = compute_layout(graph, layout, seed, cache_dir)
+    draw(graph, coloring, positions, title, path, labels, sizes, widths)